@@ -0,0 +1,119 @@
+"""
+Archival of finished events into cold-storage tables.
+
+Events that ended long enough ago are copied, with their tickets and
+listings, into ArchivedEvent/ArchivedTicket and deleted from the live
+tables in chunked transactions, keeping the hot indexes small. Each batch
+invalidates the cached and CDN responses its events appeared in.
+"""
+import logging
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .cache import bump_event_versions, bump_seller_versions
+from .cdn import EVENTS_KEY
+from .models import ArchivedEvent, ArchivedTicket, Event, Ticket, TicketListing
+
+logger = logging.getLogger(__name__)
+
+# Event statuses that never change again and can leave the live tables
+ARCHIVABLE_STATUSES = ('completed', 'cancelled')
+
+EVENT_FIELDS = [
+    'id', 'name', 'description', 'category', 'status',
+    'venue_name', 'venue_address', 'city', 'state', 'country',
+    'event_date', 'doors_open', 'event_end',
+    'image_url', 'artist_lineup',
+    'view_count', 'search_count', 'ticket_sales_count',
+    'created_at', 'updated_at', 'created_by_id',
+]
+
+TICKET_FIELDS = [
+    'id', 'event_id', 'seller_id',
+    'section', 'row', 'seat_number', 'quantity',
+    'original_price', 'listing_price',
+    'condition', 'status', 'notes', 'transfer_method',
+    'listed_at', 'updated_at', 'expires_at',
+]
+
+# TicketListing lookups from Ticket mapped to ArchivedTicket fields
+LISTING_FIELDS = {
+    'listing__id': 'listing_id',
+    'listing__status': 'listing_status',
+    'listing__views': 'listing_views',
+    'listing__saves': 'listing_saves',
+    'listing__platform_fee_percentage': 'platform_fee_percentage',
+    'listing__payment_processing_fee': 'payment_processing_fee',
+}
+
+
+def archivable_events(older_than_days):
+    """
+    Events in a final status that ended more than ``older_than_days`` ago.
+    Events without an end time are taken to end when they start.
+    """
+    cutoff = timezone.now() - timedelta(days=older_than_days)
+    return Event.objects.alias(
+        ended_at=Coalesce('event_end', 'event_date')
+    ).filter(status__in=ARCHIVABLE_STATUSES, ended_at__lt=cutoff)
+
+
+def archive_batch(event_ids):
+    """Move the given events with their tickets and listings into the archive tables."""
+    with transaction.atomic():
+        events = [
+            ArchivedEvent(**row)
+            for row in Event.objects.filter(id__in=event_ids).values(*EVENT_FIELDS)
+        ]
+
+        tickets = []
+        ticket_rows = Ticket.objects.filter(event_id__in=event_ids).values(
+            *TICKET_FIELDS, *LISTING_FIELDS
+        )
+        for row in ticket_rows:
+            for lookup, field in LISTING_FIELDS.items():
+                row[field] = row.pop(lookup)
+            row['listing_status'] = row['listing_status'] or ''
+            row['listing_views'] = row['listing_views'] or 0
+            row['listing_saves'] = row['listing_saves'] or 0
+            tickets.append(ArchivedTicket(**row))
+
+        ArchivedEvent.objects.bulk_create(events)
+        ArchivedTicket.objects.bulk_create(tickets, batch_size=1000)
+
+        TicketListing.objects.filter(ticket__event_id__in=event_ids).delete()
+        Ticket.objects.filter(event_id__in=event_ids).delete()
+        Event.objects.filter(id__in=event_ids).delete()
+
+        # Event pages, lists and seller dashboards must stop showing them
+        bump_event_versions(event_ids, purge_keys=[EVENTS_KEY])
+        bump_seller_versions({ticket.seller_id for ticket in tickets})
+
+    return len(events), len(tickets)
+
+
+def archive_events(older_than_days=30, batch_size=200):
+    """
+    Archive all eligible events, ``batch_size`` events per transaction.
+
+    Returns the number of events and tickets archived.
+    """
+    total_events = total_tickets = 0
+    while True:
+        event_ids = list(
+            archivable_events(older_than_days)
+            .order_by('event_date')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if not event_ids:
+            break
+
+        archived_events, archived_tickets = archive_batch(event_ids)
+        total_events += archived_events
+        total_tickets += archived_tickets
+        logger.info(f'Archived {archived_events} events with {archived_tickets} tickets')
+
+    return total_events, total_tickets
@@ -0,0 +1,90 @@
+"""
+Per-event cache versions.
+
+Anything cached per event (serialized documents, aggregates, page payloads)
+should include the event's version in its cache key. Write paths, including
+bulk UPDATEs that bypass model signals, call bump_event_versions() so
+entries built from the old data are never read again. It also purges the
+events from the CDN (see products.cdn).
+
+Versions are bumped again once the transaction commits: a reader between
+the first bump and the commit still sees the old rows, and would otherwise
+cache them under the new version.
+
+Sellers have versions too, for their dashboard summary: ticket write paths
+call bump_seller_versions() with the sellers whose tickets they change.
+
+Versions are only seen by other processes through a cache they all share
+(CACHES in settings: Redis, or a file-based cache on one host). The web
+workers and the scheduled commands that bump versions, such as
+expire_tickets, must use the same one.
+"""
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .cdn import event_key, purge
+
+
+def _version_key(event_id):
+    return f'event-version:{event_id}'
+
+
+def _initial_version():
+    # Time-based, so a version evicted from the cache never restarts at a
+    # value older entries were cached under
+    return time.time_ns()
+
+
+def get_event_version(event_id):
+    """Return the current cache version of an event."""
+    return cache.get_or_set(_version_key(event_id), _initial_version, timeout=None)
+
+
+def get_event_versions(event_ids):
+    """Return {event_id: version} for several events in one cache round trip."""
+    keys = {_version_key(event_id): event_id for event_id in event_ids}
+    found = cache.get_many(keys)
+    missing = {key: _initial_version() for key in keys if key not in found}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        found.update(missing)
+    return {keys[key]: version for key, version in found.items()}
+
+
+def _incr_versions(keys):
+    for key in keys:
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _initial_version(), timeout=None)
+
+
+def _bump(keys):
+    _incr_versions(keys)
+    transaction.on_commit(lambda: _incr_versions(keys))
+
+
+def bump_event_versions(event_ids, purge_keys=()):
+    """
+    Invalidate everything cached for the given events. ``purge_keys`` are
+    purged from the CDN along with the events' keys.
+    """
+    event_ids = set(event_ids)
+    _bump([_version_key(event_id) for event_id in event_ids])
+    purge([*(event_key(event_id) for event_id in event_ids), *purge_keys])
+
+
+def _seller_version_key(seller_id):
+    return f'seller-version:{seller_id}'
+
+
+def get_seller_version(seller_id):
+    """Return the current cache version of a seller's listings."""
+    return cache.get_or_set(_seller_version_key(seller_id), _initial_version, timeout=None)
+
+
+def bump_seller_versions(seller_ids):
+    """Invalidate everything cached about the given sellers' listings."""
+    _bump([_seller_version_key(seller_id) for seller_id in set(seller_ids)])
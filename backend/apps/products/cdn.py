@@ -0,0 +1,124 @@
+"""
+Shared-cache (CDN) policies for the public read endpoints, with purges on writes.
+
+cdn_cache() gives successful GET responses a Cache-Control header:
+
+- Browsers revalidate on every request (max-age=0).
+- Shared caches keep the response for s-maxage seconds, and may serve it
+  stale for stale-while-revalidate more seconds while they refetch it.
+
+Each response also carries a Surrogate-Key header naming what it was built
+from: 'event:<id>' for each event, 'listing:<id>' for each ticket listing,
+and collection keys such as 'events'.
+
+Write paths purge those keys:
+- bump_event_versions() purges the keys of the events it is given
+  (see products.cache).
+- Ticket and Event signals purge listing keys and the 'events' collection.
+
+When CDN_PURGE_URL is set, purges are recorded in the outbox (see
+products.outbox) as part of the current transaction, and the dispatcher
+POSTs them to that URL as JSON. Failed purges are retried like any outbox
+message, and the s-maxage TTL bounds how stale the CDN can get meanwhile.
+Without CDN_PURGE_URL, purges are written to this module's logger once the
+transaction commits; the logger is the local stand-in.
+"""
+import json
+import logging
+import urllib.request
+from functools import wraps
+
+from django.conf import settings
+from django.db import transaction
+
+from .outbox import emit, register
+
+logger = logging.getLogger(__name__)
+
+PURGE_TOPIC = 'cdn.purge'
+
+# Fastly and most CDNs cap the Surrogate-Key header at 16 KB
+SURROGATE_KEY_MAX_BYTES = 16 * 1024
+
+EVENTS_KEY = 'events'
+TRENDING_KEY = 'trending'
+MARKET_STATS_KEY = 'market-stats'
+
+
+def event_key(event_id):
+    return f'event:{event_id}'
+
+
+def listing_key(ticket_id):
+    return f'listing:{ticket_id}'
+
+
+def surrogate_keys(keys, optional_keys=()):
+    """
+    Join keys for a Surrogate-Key header. ``optional_keys`` (finer-grained
+    keys already covered by ``keys``) are only added if all of them fit.
+    """
+    header = ' '.join(dict.fromkeys(keys))
+    with_optional = ' '.join(dict.fromkeys([*keys, *optional_keys]))
+    return with_optional if len(with_optional) <= SURROGATE_KEY_MAX_BYTES else header
+
+
+def cdn_cache(max_age, stale_while_revalidate=0, keys=None):
+    """
+    View decorator applying a shared-cache policy to successful GET responses.
+
+    ``keys(request, response, **kwargs)`` returns the Surrogate-Key header
+    value, or None when the response cannot be tagged reliably; such
+    responses are not cached. Responses that already have a Cache-Control
+    header (a view opting out, for instance) are left alone.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            response = view(request, *args, **kwargs)
+            if (
+                settings.CDN_CACHE_ENABLED
+                and request.method in ('GET', 'HEAD')
+                and response.status_code == 200
+                and not response.has_header('Cache-Control')
+            ):
+                header = keys(request, response, **kwargs) if keys else ''
+                if header is not None:
+                    response['Cache-Control'] = (
+                        f'public, max-age=0, s-maxage={max_age}, '
+                        f'stale-while-revalidate={stale_while_revalidate}'
+                    )
+                    if header:
+                        response['Surrogate-Key'] = header
+            return response
+        return wrapped
+    return decorator
+
+
+def send_purge(keys):
+    """POST a purge of ``keys`` to CDN_PURGE_URL; raises on failure."""
+    request = urllib.request.Request(
+        settings.CDN_PURGE_URL,
+        data=json.dumps({'surrogate_keys': keys}).encode(),
+        headers={'Content-Type': 'application/json'},
+        method='POST',
+    )
+    with urllib.request.urlopen(request, timeout=settings.CDN_PURGE_TIMEOUT) as response:
+        if response.status >= 300:
+            raise RuntimeError(f'Purge endpoint returned {response.status}')
+
+
+@register(PURGE_TOPIC, private=True)
+def deliver_purge(message):
+    send_purge(message.payload['keys'])
+
+
+def purge(keys):
+    """Purge ``keys`` from the CDN once the current transaction commits."""
+    keys = sorted(set(keys))
+    if not keys or not settings.CDN_CACHE_ENABLED:
+        return
+    if settings.CDN_PURGE_URL:
+        emit(PURGE_TOPIC, None, keys=keys)
+    else:
+        transaction.on_commit(lambda: logger.info(f'CDN purge: {" ".join(keys)}'))
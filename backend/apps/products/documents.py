@@ -0,0 +1,240 @@
+"""
+Two-tier cache of serialized events.
+
+Event documents (the EventSerializer output the event detail and batch
+endpoints return) change rarely and are read far more often. They are kept
+in two tiers:
+
+1. a per-worker LRU (DocumentCache) of already-serialized documents;
+2. the EVENT_DOCUMENT_CACHE cache alias, shared between workers so a
+   document is built once, not once per worker. It defaults to the
+   dedicated 'event_documents' alias (Redis, or files on one host).
+
+Both tiers store ``(version, built_at, document)`` per event, where
+version is the event's cache version (see products.cache). A lookup reads
+the current versions in one round trip and takes an entry only if its
+version matches, so any write to an event or its tickets invalidates its
+document everywhere. Entries are also only current for
+EVENT_DOCUMENT_FRESH_SECONDS, which bounds how long a ticket that has
+passed its expires_at still counts in the ticket stats. Misses are loaded
+from the primary database with one query, so a lagging replica cannot
+cache an old document under a new version.
+
+When that query fails (the database is down or, on PostgreSQL, slower than
+EVENT_DOCUMENT_DB_TIMEOUT_MS), the last document either tier holds is
+served instead, however old, and the lookup is reported as stale.
+
+Each worker counts hits per tier, database loads and stale serves, with
+their latency; see DocumentCache.stats().
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict, defaultdict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DatabaseError, connections, transaction
+
+from config.db_router import PRIMARY_DB
+
+from .cache import get_event_versions
+from .models import Event
+from .serializers import FastEventSerializer
+
+logger = logging.getLogger(__name__)
+
+OUTCOMES = ('local', 'shared', 'database', 'stale')
+
+
+class DocumentCache:
+    """
+    Thread-safe LRU of ``(version, built_at, document)`` entries, with lookup metrics.
+
+    Entries are kept whatever their version, so an outdated one can still be
+    served when the database is unavailable.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._counts = defaultdict(int)
+        self._seconds = defaultdict(float)
+
+    def get(self, key):
+        """Return the entry for ``key``, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def record(self, outcome, count, seconds):
+        """Count ``count`` documents served from ``outcome`` in ``seconds``."""
+        with self._lock:
+            self._counts[outcome] += count
+            self._seconds[outcome] += seconds
+
+    def stats(self):
+        """Hit rates and mean latency per document, by outcome, for this worker."""
+        with self._lock:
+            total = sum(self._counts.values())
+            hits = self._counts['local'] + self._counts['shared']
+            return {
+                'size': len(self._entries),
+                'lookups': total,
+                'hit_rate': round(hits / total, 4) if total else None,
+                'local_hit_rate': round(self._counts['local'] / total, 4) if total else None,
+                'outcomes': {
+                    outcome: {
+                        'count': self._counts[outcome],
+                        'avg_ms': (
+                            round(self._seconds[outcome] / self._counts[outcome] * 1000, 3)
+                            if self._counts[outcome] else None
+                        ),
+                    }
+                    for outcome in OUTCOMES
+                },
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._counts.clear()
+            self._seconds.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+local_documents = DocumentCache(max_size=settings.EVENT_DOCUMENT_LOCAL_SIZE)
+
+
+def _shared_cache():
+    return caches[settings.EVENT_DOCUMENT_CACHE]
+
+
+def _shared_key(event_id):
+    return f'event-document:{event_id}'
+
+
+def _serialize(rows):
+    return {document['id']: document for document in FastEventSerializer(rows, many=True).data}
+
+
+def load_documents(event_ids):
+    """Serialize the given events from the primary database. Returns {id: document}."""
+    rows = FastEventSerializer.prepare_queryset(Event.objects.using(PRIMARY_DB).filter(id__in=event_ids))
+    connection = connections[PRIMARY_DB]
+    if connection.vendor != 'postgresql' or not settings.EVENT_DOCUMENT_DB_TIMEOUT_MS:
+        return _serialize(rows)
+    # SET LOCAL only lasts until the end of the transaction
+    with transaction.atomic(using=PRIMARY_DB):
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL statement_timeout = %s', [settings.EVENT_DOCUMENT_DB_TIMEOUT_MS])
+        return _serialize(rows)
+
+
+def _is_current(entry, version, now):
+    return entry[0] == version and now - entry[1] < settings.EVENT_DOCUMENT_FRESH_SECONDS
+
+
+def get_event_documents(event_ids):
+    """
+    Return ``(documents, stale)`` for the given events.
+
+    ``documents`` maps each event id (as a string) that exists to its
+    document; ``stale`` is True when some came from an outdated entry
+    because the database could not be read. Raises the database error if
+    an event has neither a current nor a stale document. Documents are
+    shared with the cache and must not be modified.
+    """
+    event_ids = list(dict.fromkeys(str(event_id) for event_id in event_ids))
+    versions = get_event_versions(event_ids)
+    now = time.time()
+    documents = {}
+    outdated = {}
+
+    start = time.perf_counter()
+    missing = []
+    for event_id in event_ids:
+        entry = local_documents.get(event_id)
+        if entry is not None and _is_current(entry, versions[event_id], now):
+            documents[event_id] = entry[2]
+        else:
+            missing.append(event_id)
+            if entry is not None:
+                outdated[event_id] = entry
+    _record('local', len(event_ids) - len(missing), start)
+    if not missing:
+        return documents, False
+
+    start = time.perf_counter()
+    shared = _shared_cache().get_many([_shared_key(event_id) for event_id in missing])
+    to_load = []
+    for event_id in missing:
+        entry = shared.get(_shared_key(event_id))
+        if entry is not None and _is_current(entry, versions[event_id], now):
+            documents[event_id] = entry[2]
+            local_documents.set(event_id, entry)
+        else:
+            to_load.append(event_id)
+            if entry is not None:
+                outdated.setdefault(event_id, entry)
+    _record('shared', len(missing) - len(to_load), start)
+    if not to_load:
+        return documents, False
+
+    start = time.perf_counter()
+    try:
+        loaded = load_documents(to_load)
+    except DatabaseError as e:
+        unavailable = [event_id for event_id in to_load if event_id not in outdated]
+        if unavailable:
+            raise
+        logger.warning(f'Serving {len(to_load)} stale event documents: {e!r}')
+        documents.update((event_id, outdated[event_id][2]) for event_id in to_load)
+        _record('stale', len(to_load), start)
+        return documents, True
+
+    entries = {event_id: (versions[event_id], now, document) for event_id, document in loaded.items()}
+    # Kept well past EVENT_DOCUMENT_FRESH_SECONDS, as the stale fallback
+    _shared_cache().set_many(
+        {_shared_key(event_id): entry for event_id, entry in entries.items()},
+        timeout=settings.EVENT_DOCUMENT_TTL,
+    )
+    for event_id in to_load:
+        if event_id in entries:
+            documents[event_id] = loaded[event_id]
+            local_documents.set(event_id, entries[event_id])
+        else:
+            # Deleted: never serve its old document as a stale fallback
+            local_documents.delete(event_id)
+            _shared_cache().delete(_shared_key(event_id))
+    _record('database', len(to_load), start)
+    return documents, False
+
+
+def get_event_document(event_id):
+    """Return ``(document, stale)`` for one event; document is None if it does not exist."""
+    documents, stale = get_event_documents([event_id])
+    return documents.get(str(event_id)), stale
+
+
+def _record(outcome, count, start):
+    if count:
+        local_documents.record(outcome, count, time.perf_counter() - start)
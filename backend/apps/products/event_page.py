@@ -0,0 +1,84 @@
+"""
+Everything the event page shows, in one payload.
+
+The page used to load the event detail, its tickets and its stats in three
+requests. Each of them reloaded the event and aggregated the same tickets.
+build_event_page() makes three queries instead:
+
+- the event row, with its last sale price;
+- one aggregate pass over the event's available tickets, which feeds both
+  the event's ticket stats and the page stats;
+- the first page of those tickets.
+
+The payload is cached under the event's cache version (see products.cache),
+so a write to the event or its tickets is visible on the next request.
+EVENT_PAGE_CACHE_SECONDS bounds how long a ticket that has passed its
+expires_at can still be listed.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Avg, Count, Max, Min, OuterRef, Subquery
+
+from .cache import get_event_version
+from .models import Event, Sale, Ticket
+from .serializers import FastEventSerializer, FastTicketListSerializer
+
+# Event fields filled from the page's own ticket aggregate
+TICKET_STATS = ('ticket_count', 'lowest_price', 'highest_price')
+
+
+def _page_key(event_id):
+    return f'event-page:{event_id}:{get_event_version(event_id)}'
+
+
+def build_event_page(event_id):
+    """Return the page payload of an event, or None if there is no such event."""
+    last_sale = Sale.objects.filter(event=OuterRef('pk')).order_by('-created_at').values('unit_price')[:1]
+    fields = [name for name in FastEventSerializer.field_names() if name not in TICKET_STATS]
+    event = FastEventSerializer.prepare_queryset(Event.objects.filter(id=event_id), fields).annotate(
+        last_sale_price=Subquery(last_sale)
+    ).first()
+    if event is None:
+        return None
+
+    tickets = Ticket.objects.available().filter(event_id=event_id)
+    stats = tickets.aggregate(
+        count=Count('id'),
+        min_price=Min('listing_price'),
+        max_price=Max('listing_price'),
+        avg_price=Avg('listing_price'),
+    )
+    event.update(
+        available_ticket_count=stats['count'],
+        available_lowest_price=stats['min_price'],
+        available_highest_price=stats['max_price'],
+    )
+    first_page = FastTicketListSerializer.prepare_queryset(
+        tickets.order_by('listing_price')
+    )[:settings.REST_FRAMEWORK['PAGE_SIZE']]
+
+    return {
+        'event': FastEventSerializer([event]).data[0],
+        'tickets': {
+            'count': stats['count'],
+            'results': FastTicketListSerializer(first_page).data,
+        },
+        'stats': {
+            'total_available': stats['count'],
+            'min_price': stats['min_price'],
+            'max_price': stats['max_price'],
+            'avg_price': round(float(stats['avg_price']) if stats['avg_price'] else 0, 2),
+            'last_sale_price': event['last_sale_price'],
+        },
+    }
+
+
+def get_event_page(event_id):
+    """build_event_page(), cached until the event's version moves."""
+    key = _page_key(event_id)
+    page = cache.get(key)
+    if page is None:
+        page = build_event_page(event_id)
+        if page is not None:
+            cache.set(key, page, timeout=settings.EVENT_PAGE_CACHE_SECONDS)
+    return page
@@ -0,0 +1,63 @@
+"""
+Bulk expiry of ticket listings past their expires_at.
+"""
+import logging
+import time
+
+from django.db import transaction
+from django.utils import timezone
+
+from .cache import bump_event_versions, bump_seller_versions
+from .models import Ticket, TicketListing
+
+logger = logging.getLogger(__name__)
+
+
+def expire_tickets(batch_size=5000, pause=0):
+    """
+    Flip available tickets past expires_at, and their active listings, to expired.
+
+    Work is done in set-based UPDATE batches of ``batch_size`` rows, each in
+    its own short transaction and driven by the (status, expires_at) index,
+    so row locks are only held briefly even for millions of expirations.
+    Cache versions of the affected events and sellers are bumped after each
+    batch.
+
+    Returns the number of tickets expired and of events affected.
+    """
+    now = timezone.now()
+    total_tickets = 0
+    affected_events = set()
+
+    while True:
+        rows = list(
+            Ticket.objects.filter(status='available', expires_at__lte=now)
+            .order_by('expires_at')
+            .values_list('id', 'event_id', 'seller_id')[:batch_size]
+        )
+        if not rows:
+            break
+
+        ticket_ids = [ticket_id for ticket_id, _, _ in rows]
+        event_ids = {event_id for _, event_id, _ in rows}
+
+        with transaction.atomic():
+            expired = Ticket.objects.filter(
+                id__in=ticket_ids, status='available'
+            ).update(status='expired', updated_at=now)
+            TicketListing.objects.filter(
+                ticket_id__in=ticket_ids, status='active'
+            ).update(status='expired', updated_at=now)
+
+        bump_event_versions(event_ids)
+        bump_seller_versions(seller_id for _, _, seller_id in rows)
+        total_tickets += expired
+        affected_events |= event_ids
+        logger.info(f'Expired {expired} tickets across {len(event_ids)} events')
+
+        if len(rows) < batch_size:
+            break
+        if pause:
+            time.sleep(pause)
+
+    return total_tickets, len(affected_events)
@@ -0,0 +1,81 @@
+"""
+Scheduled event status transitions: upcoming -> live -> completed.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .cache import bump_event_versions, bump_seller_versions
+from .models import Event, Ticket, TicketListing
+from .outbox import emit_many
+
+logger = logging.getLogger(__name__)
+
+# Ticket and listing statuses that stop making sense once an event is over
+OPEN_TICKET_STATUSES = ('available', 'pending')
+OPEN_LISTING_STATUSES = ('active', 'paused')
+
+
+def _events_to_complete(now):
+    # Events without an explicit end are assumed to last EVENT_DEFAULT_DURATION_HOURS
+    default_end = now - timedelta(hours=settings.EVENT_DEFAULT_DURATION_HOURS)
+    return Event.objects.filter(status__in=('upcoming', 'live')).filter(
+        Q(event_end__lte=now) | Q(event_end__isnull=True, event_date__lte=default_end)
+    )
+
+
+def _events_to_start(now):
+    return Event.objects.filter(status='upcoming', event_date__lte=now)
+
+
+def _transition(queryset, new_status, now, batch_size, close_tickets=False):
+    """Move events matched by ``queryset`` to ``new_status`` in id batches."""
+    total = 0
+    while True:
+        event_ids = list(queryset.values_list('id', flat=True)[:batch_size])
+        if not event_ids:
+            break
+
+        seller_ids = set()
+        with transaction.atomic():
+            Event.objects.filter(id__in=event_ids).update(status=new_status, updated_at=now)
+            emit_many(('event.status_changed', event_id, {'status': new_status}) for event_id in event_ids)
+            if close_tickets:
+                open_tickets = Ticket.objects.filter(event_id__in=event_ids, status__in=OPEN_TICKET_STATUSES)
+                seller_ids.update(open_tickets.order_by().values_list('seller_id', flat=True).distinct())
+                TicketListing.objects.filter(
+                    ticket__event_id__in=event_ids, status__in=OPEN_LISTING_STATUSES
+                ).update(status='expired', updated_at=now)
+                # Holds die with the ticket; leave no stale holder behind
+                open_tickets.update(status='expired', held_by=None, held_until=None, updated_at=now)
+
+        bump_event_versions(event_ids)
+        bump_seller_versions(seller_ids)
+        total += len(event_ids)
+        if len(event_ids) < batch_size:
+            break
+    return total
+
+
+def transition_events(batch_size=1000):
+    """
+    Advance event statuses based on event_date and event_end.
+
+    Finished events become completed and their open tickets and listings
+    expire; events that have started become live. Everything is done with
+    set-based UPDATEs in batches of ``batch_size`` events.
+
+    Returns the number of events moved to live and to completed.
+    """
+    now = timezone.now()
+    # Complete first so events whose whole window was missed skip 'live'
+    completed = _transition(_events_to_complete(now), 'completed', now, batch_size, close_tickets=True)
+    started = _transition(_events_to_start(now), 'live', now, batch_size)
+
+    if started or completed:
+        logger.info(f'Event lifecycle: {started} live, {completed} completed')
+    return started, completed
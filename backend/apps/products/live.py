@@ -0,0 +1,208 @@
+"""
+Live market data for event pages, pushed over Server-Sent Events.
+
+Each ASGI process runs one PriceHub. The hub keeps one channel per event
+that has subscribers. Each channel has a single watcher task. The watcher
+polls the event's cache version (see products.cache) every
+LIVE_PRICES_POLL_SECONDS. When the version moves, it recomputes the
+snapshot (best ask, tickets available, last sale) with one query set and
+wakes every subscriber at once. The database and cache load therefore
+depends on the number of watched events, not the number of clients.
+
+Some changes do not move the version: tickets and holds lapsing with time,
+or rows written by another service. Every LIVE_PRICES_REBUILD_POLLS polls
+the watcher therefore rebuilds the snapshot regardless. A failed poll is
+logged and retried on the next one, so the feed survives database or cache
+outages.
+
+Idle subscribers are parked on a shared asyncio.Event and keep no queue of
+their own. A slow client skips intermediate snapshots and gets a single
+delta against the last thing it was sent.
+"""
+import asyncio
+import json
+import logging
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import Count, Min
+
+from .cache import get_event_version
+from .models import Sale, Ticket
+
+logger = logging.getLogger(__name__)
+
+
+def build_snapshot(event_id):
+    """Current best ask, available ticket count and last sale price of an event."""
+    stats = Ticket.objects.available().filter(event_id=event_id).aggregate(
+        best_ask=Min('listing_price'),
+        count=Count('id'),
+    )
+    last_sale = Sale.objects.filter(event_id=event_id).order_by('-created_at').values_list(
+        'unit_price', flat=True
+    ).first()
+    return {
+        'best_ask': _price(stats['best_ask']),
+        'count': stats['count'],
+        'last_sale': _price(last_sale),
+    }
+
+
+def _price(value):
+    # Aggregates lose the field's scale on some backends
+    return f'{value:.2f}' if value is not None else None
+
+
+def snapshot_delta(old, new):
+    """Fields of ``new`` that differ from ``old``."""
+    return {key: value for key, value in new.items() if old.get(key) != value}
+
+
+def _poll(event_id, known_version, force):
+    """
+    The event's cache version and, if it moved from ``known_version`` or
+    ``force`` is set, a fresh snapshot (None otherwise).
+
+    Runs outside any request, so connections that broke or outlived
+    CONN_MAX_AGE are dropped around it as the request cycle would.
+    """
+    close_old_connections()
+    try:
+        version = get_event_version(event_id)
+        if version == known_version and not force:
+            return version, None
+        return version, build_snapshot(event_id)
+    finally:
+        close_old_connections()
+
+
+class EventChannel:
+    """Fan-out point for one event: latest snapshot plus a wake-up signal."""
+
+    def __init__(self, event_id):
+        self.event_id = event_id
+        self.snapshot = None
+        self.version = None
+        self.subscribers = 0
+        # Bumped on every publish, so a subscriber that was busy writing
+        # when a change landed notices it without waiting for the next one
+        self.generation = 0
+        self.changed = asyncio.Event()
+        self.lock = asyncio.Lock()
+        self.watcher = None
+
+    async def load(self):
+        """Build the first snapshot, once however many subscribers arrive together."""
+        async with self.lock:
+            if self.snapshot is None:
+                await self._rebuild()
+
+    async def refresh(self, force=False):
+        """
+        Rebuild the snapshot if the event's cache version moved, or always
+        when ``force`` is set. Returns whether it changed.
+        """
+        async with self.lock:
+            return await self._rebuild(force)
+
+    async def _rebuild(self, force=False):
+        version, snapshot = await sync_to_async(_poll)(self.event_id, self.version, force)
+        if snapshot is None:
+            return False
+        self.version = version
+        if snapshot == self.snapshot:
+            return False
+        self.snapshot = snapshot
+        return True
+
+    def publish(self):
+        # Wakes every waiting subscriber; they read self.snapshot when resumed
+        self.generation += 1
+        self.changed.set()
+        self.changed.clear()
+
+    async def watch(self, interval, rebuild_every):
+        polls = 0
+        while self.subscribers:
+            await asyncio.sleep(interval)
+            polls += 1
+            try:
+                changed = await self.refresh(force=polls % rebuild_every == 0)
+            except Exception:
+                logger.exception(f'Live price poll failed for event {self.event_id}')
+                continue
+            if changed:
+                self.publish()
+
+
+class PriceHub:
+    """Per-process registry of event channels."""
+
+    def __init__(self):
+        self.channels = {}
+
+    async def _join(self, event_id):
+        channel = self.channels.get(event_id)
+        if channel is None:
+            channel = self.channels[event_id] = EventChannel(event_id)
+        channel.subscribers += 1
+        if channel.snapshot is None:
+            try:
+                await channel.load()
+            except BaseException:
+                self._leave(channel)
+                raise
+        if channel.watcher is None or channel.watcher.done():
+            channel.watcher = asyncio.create_task(
+                channel.watch(settings.LIVE_PRICES_POLL_SECONDS, settings.LIVE_PRICES_REBUILD_POLLS)
+            )
+        return channel
+
+    def _leave(self, channel):
+        channel.subscribers -= 1
+        if not channel.subscribers:
+            if channel.watcher is not None:
+                channel.watcher.cancel()
+            self.channels.pop(channel.event_id, None)
+
+    async def subscribe(self, event_id, heartbeat=None):
+        """
+        Yield ``('snapshot', data)`` once, then ``('update', delta)`` for each
+        change, or ``('heartbeat', None)`` after ``heartbeat`` idle seconds.
+        """
+        channel = await self._join(event_id)
+        try:
+            sent = channel.snapshot
+            seen = channel.generation
+            yield 'snapshot', sent
+            while True:
+                if channel.generation == seen:
+                    try:
+                        await asyncio.wait_for(channel.changed.wait(), timeout=heartbeat)
+                    except asyncio.TimeoutError:
+                        yield 'heartbeat', None
+                        continue
+                seen = channel.generation
+                delta = snapshot_delta(sent, channel.snapshot)
+                if delta:
+                    sent = channel.snapshot
+                    yield 'update', delta
+        finally:
+            self._leave(channel)
+
+
+price_hub = PriceHub()
+
+
+def format_sse(kind, data):
+    if kind == 'heartbeat':
+        return ': keepalive\n\n'
+    return f'event: {kind}\ndata: {json.dumps(data)}\n\n'
+
+
+async def event_stream(event_id):
+    """SSE-encoded live updates for an event, for a StreamingHttpResponse."""
+    async for kind, data in price_hub.subscribe(event_id, heartbeat=settings.LIVE_PRICES_HEARTBEAT_SECONDS):
+        yield format_sse(kind, data)
@@ -0,0 +1,111 @@
+"""
+Shared helpers for the bench_* management commands.
+
+Each benchmark builds a synthetic dataset inside a transaction and rolls it
+back when done, so it can be pointed at a development database safely.
+"""
+import random
+import statistics
+import time
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory
+
+from products.models import Event, Ticket, TicketListing
+
+User = get_user_model()
+
+SECTIONS = ['GA', 'VIP', 'Section A', 'Section B', 'Floor', 'Balcony']
+
+
+def request_factory():
+    """APIRequestFactory whose requests pass the ALLOWED_HOSTS check."""
+    return APIRequestFactory(SERVER_NAME='localhost')
+
+
+def make_seller(email='bench-seller@crowdbolt.com'):
+    return User.objects.create_user(email=email, password='BenchPass123!', role='seller')
+
+
+def make_events(count, start, spacing, status='upcoming', batch_size=5000):
+    """Bulk-create ``count`` events dated ``start + i * spacing``."""
+    categories = [choice for choice, _ in Event.CATEGORY_CHOICES]
+    events = []
+    for offset in range(0, count, batch_size):
+        events.extend(Event.objects.bulk_create([
+            Event(
+                name=f'Bench Event {i}',
+                description='Synthetic benchmark event ' * 10,
+                category=categories[i % len(categories)],
+                status=status,
+                venue_name='Bench Venue',
+                venue_address='1 Benchmark Ave',
+                city=random.choice(['Brooklyn', 'Los Angeles', 'Chicago', 'Austin']),
+                state='NY',
+                event_date=start + i * spacing,
+            )
+            for i in range(offset, min(offset + batch_size, count))
+        ]))
+    return events
+
+
+def make_tickets(events, seller, per_event, status='available', with_listings=True,
+                 batch_size=5000, **extra):
+    """
+    Bulk-create ``per_event`` tickets (and listings) for each event.
+
+    Keyword arguments in ``extra`` override the randomised ticket fields.
+    """
+    tickets = []
+    pending = []
+
+    def flush():
+        created = Ticket.objects.bulk_create(pending)
+        if with_listings:
+            TicketListing.objects.bulk_create([TicketListing(ticket=t) for t in created])
+        tickets.extend(created)
+        pending.clear()
+
+    for event in events:
+        for _ in range(per_event):
+            original_price = Decimal(random.randint(80, 300))
+            fields = {
+                'id': uuid.uuid4(),
+                'event': event,
+                'seller': seller,
+                'section': random.choice(SECTIONS),
+                'row': random.choice(['A', 'B', 'C', '']),
+                'quantity': random.choice([1, 1, 2, 4]),
+                'original_price': original_price,
+                'listing_price': (original_price * Decimal(random.uniform(0.8, 2.5))).quantize(Decimal('0.01')),
+                'status': status,
+                'notes': 'Synthetic benchmark ticket',
+            }
+            pending.append(Ticket(**{**fields, **extra}))
+            if len(pending) >= batch_size:
+                flush()
+    if pending:
+        flush()
+    return tickets
+
+
+def time_calls(func, repeat):
+    """Call ``func`` ``repeat`` times and return (p50, p99) latency in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return (
+        statistics.median(timings) * 1000,
+        timings[max(int(len(timings) * 0.99) - 1, 0)] * 1000,
+    )
+
+
+def days_ago(days):
+    return timezone.now() - timedelta(days=days)
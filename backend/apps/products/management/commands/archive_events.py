@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from products.archive import archive_events
+
+
+class Command(BaseCommand):
+    help = 'Move finished events and their tickets and listings into the archive tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=30,
+            help='Only archive events that took place more than this many days ago (default: 30)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=200,
+            help='Events moved per transaction (default: 200)'
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+
+        events, tickets = archive_events(
+            older_than_days=options['days'],
+            batch_size=options['batch_size'],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f'Archived {events} events with {tickets} tickets')
+        )
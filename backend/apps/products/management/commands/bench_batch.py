@@ -0,0 +1,52 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, reset_queries, transaction
+from django.test.utils import CaptureQueriesContext
+
+from products.views import EventDetailView, TicketDetailView, event_batch, ticket_batch
+
+from ._bench import days_ago, make_events, make_seller, make_tickets, request_factory, time_calls
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the batch endpoints against one detail request per id'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ids', type=int, default=100, help='Ids looked up per batch (default: 100)')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs per case (default: 20)')
+
+    def handle(self, *args, **options):
+        factory = request_factory()
+        count = options['ids']
+
+        # Everything runs in a transaction that is rolled back at the end
+        with transaction.atomic():
+            seller = make_seller()
+            events = make_events(count, start=days_ago(-30), spacing=timedelta(hours=1))
+            tickets = make_tickets(events, seller, 5)[::5]
+
+            cases = (
+                ('events', EventDetailView.as_view(), '/api/events/', event_batch, [e.id for e in events]),
+                ('tickets', TicketDetailView.as_view(), '/api/tickets/', ticket_batch, [t.id for t in tickets]),
+            )
+            for label, detail_view, prefix, batch_view, ids in cases:
+                def singles():
+                    for pk in ids:
+                        detail_view(factory.get(f'{prefix}{pk}/'), pk=pk).render()
+
+                def batch():
+                    request = factory.get(f'{prefix}batch/', {'ids': ','.join(map(str, ids))})
+                    batch_view(request).render()
+
+                for kind, func in ((f'{len(ids)} x detail', singles), ('1 x batch', batch)):
+                    # The query log is capped; start from empty so the count is right
+                    reset_queries()
+                    with CaptureQueriesContext(connection) as queries:
+                        func()
+                    p50, p99 = time_calls(func, options['repeat'])
+                    self.stdout.write(
+                        f'{label:<8} {kind:<14} queries={len(queries):>4}  p50 {p50:8.2f} ms  p99 {p99:8.2f} ms'
+                    )
+
+            transaction.set_rollback(True)
@@ -0,0 +1,95 @@
+import statistics
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection, connections
+
+from products.models import Event, Ticket
+
+
+class Command(BaseCommand):
+    help = (
+        'Load test the database layer with concurrent clients running the hot '
+        'list queries, reporting latency and server connections in use. Run it '
+        'once with DB_POOL unset and once with DB_POOL=True to compare.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--clients',
+            type=int,
+            default=200,
+            help='Concurrent client threads (default: 200)'
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=50,
+            help='Requests issued by each client (default: 50)'
+        )
+
+    def handle(self, *args, **options):
+        timings = []
+        timings_lock = threading.Lock()
+        start_barrier = threading.Barrier(options['clients'])
+        done = threading.Event()
+        peak_connections = [self.count_connections()]
+
+        def client():
+            start_barrier.wait()
+            local_timings = []
+            for _ in range(options['requests']):
+                start = time.perf_counter()
+                self.simulate_request()
+                local_timings.append(time.perf_counter() - start)
+                # What Django does on request_finished: persistent connections
+                # stay open, pooled ones go back to the pool
+                close_old_connections()
+            connections.close_all()
+            with timings_lock:
+                timings.extend(local_timings)
+
+        def monitor():
+            while not done.wait(0.1):
+                peak_connections.append(self.count_connections())
+            connections.close_all()
+
+        monitor_thread = threading.Thread(target=monitor)
+        monitor_thread.start()
+
+        threads = [threading.Thread(target=client) for _ in range(options['clients'])]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        done.set()
+        monitor_thread.join()
+
+        timings.sort()
+        pool_options = connection.settings_dict['OPTIONS'].get('pool')
+        peak = max((count for count in peak_connections if count is not None), default=None)
+        self.stdout.write(f'Pooling:           {"on " + str(pool_options) if pool_options else "off"}')
+        self.stdout.write(f'Clients:           {options["clients"]}')
+        self.stdout.write(f'Throughput:        {len(timings) / elapsed:.0f} req/s')
+        self.stdout.write(f'Latency p50/p99:   {statistics.median(timings) * 1000:.2f} / '
+                          f'{timings[int(len(timings) * 0.99) - 1] * 1000:.2f} ms')
+        self.stdout.write(f'Peak connections:  {peak if peak is not None else "n/a (PostgreSQL only)"}')
+
+    def simulate_request(self):
+        """Run the queries behind /api/events/ and /api/tickets/."""
+        list(Event.objects.filter(status='upcoming').order_by('event_date')[:20])
+        list(Ticket.objects.filter(status='available').order_by('listing_price')[:20])
+
+    def count_connections(self):
+        """Server-side connection count for this database, PostgreSQL only."""
+        if connection.vendor != 'postgresql':
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT count(*) FROM pg_stat_activity WHERE datname = current_database()'
+            )
+            return cursor.fetchone()[0]
@@ -0,0 +1,89 @@
+import itertools
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, transaction
+from django.test.utils import override_settings
+
+from products import documents
+from products.cache import bump_event_versions
+from products.models import Event
+from products.serializers import EventSerializer
+
+from ._bench import days_ago, make_events, make_seller, make_tickets, time_calls
+
+
+class Command(BaseCommand):
+    help = 'Benchmark event lookups through the two-tier serialized event cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--events', type=int, default=200, help='Events looked up (default: 200)')
+        parser.add_argument('--repeat', type=int, default=1000, help='Timed lookups per case (default: 1000)')
+        parser.add_argument(
+            '--shared', choices=['configured', 'file'], default='file',
+            help='Shared tier: the EVENT_DOCUMENT_CACHE alias, or a file-based cache (default: file)',
+        )
+
+    def handle(self, *args, **options):
+        overrides = {}
+        if options['shared'] == 'file':
+            location = tempfile.mkdtemp(prefix='bench-event-cache-')
+            overrides = {
+                'CACHES': {
+                    **settings.CACHES,
+                    'bench-shared': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': location},
+                },
+                'EVENT_DOCUMENT_CACHE': 'bench-shared',
+            }
+        try:
+            self.run_cases(options, overrides)
+        finally:
+            if overrides:
+                shutil.rmtree(overrides['CACHES']['bench-shared']['LOCATION'], ignore_errors=True)
+
+    def run_cases(self, options, overrides):
+        # Everything runs in a transaction that is rolled back at the end
+        with override_settings(**overrides), transaction.atomic():
+            seller = make_seller()
+            events = make_events(options['events'], start=days_ago(-30), spacing=timedelta(hours=1))
+            make_tickets(events, seller, 5)
+            ids = [str(event.id) for event in events]
+            documents.local_documents.clear()
+
+            def lookups(lookup):
+                pending = itertools.cycle(ids)
+                return lambda: lookup(next(pending))
+
+            def shared_hit(pk):
+                documents.local_documents.delete(pk)
+                documents.get_event_document(pk)
+
+            # Warm both tiers before the cached cases
+            documents.get_event_documents(ids)
+            cases = [
+                ('EventSerializer', lookups(lambda pk: EventSerializer(Event.objects.get(pk=pk)).data)),
+                ('cold load', lookups(lambda pk: documents.load_documents([pk]))),
+                ('shared hit', lookups(shared_hit)),
+                ('local hit', lookups(documents.get_event_document)),
+            ]
+            for label, func in cases:
+                p50, p99 = time_calls(func, options['repeat'])
+                self.stdout.write(f'{label:<16} p50 {p50:8.3f} ms  p99 {p99:8.3f} ms')
+
+            # Database down: every version moved, so only stale entries are left
+            bump_event_versions(ids)
+            with mock.patch.object(documents, 'load_documents', side_effect=OperationalError('down')), \
+                    mock.patch.object(documents, 'logger'):
+                p50, p99 = time_calls(lookups(documents.get_event_document), options['repeat'])
+            self.stdout.write(f'{"stale (db down)":<16} p50 {p50:8.3f} ms  p99 {p99:8.3f} ms')
+
+            stats = documents.local_documents.stats()
+            self.stdout.write(f'hit rate {stats["hit_rate"]}, local hit rate {stats["local_hit_rate"]}')
+            for outcome, values in stats['outcomes'].items():
+                self.stdout.write(f'  {outcome:<9} count={values["count"]:>6}  avg {values["avg_ms"]} ms')
+
+            transaction.set_rollback(True)
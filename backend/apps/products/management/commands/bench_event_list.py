@@ -0,0 +1,62 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from products.archive import archive_events
+from products.models import Event, Ticket
+from products.views import EventListView
+
+from ._bench import days_ago, make_events, make_seller, make_tickets, request_factory, time_calls
+
+
+class Command(BaseCommand):
+    help = 'Benchmark EventListView before and after archiving years of event history'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--years', type=int, default=5, help='Years of completed history (default: 5)')
+        parser.add_argument('--events-per-day', type=int, default=10, help='Past events per day (default: 10)')
+        parser.add_argument('--tickets-per-event', type=int, default=5, help='Tickets per event (default: 5)')
+        parser.add_argument('--upcoming', type=int, default=200, help='Upcoming events (default: 200)')
+        parser.add_argument('--repeat', type=int, default=50, help='Timed requests per phase (default: 50)')
+
+    def handle(self, *args, **options):
+        view = EventListView.as_view()
+        factory = request_factory()
+
+        def list_events():
+            response = view(factory.get('/api/events/', {'category': 'rave'}))
+            response.render()
+
+        # Everything runs in a transaction that is rolled back at the end
+        with transaction.atomic():
+            seller = make_seller()
+            days = options['years'] * 365
+            past_events = make_events(
+                days * options['events_per_day'],
+                start=days_ago(days),
+                spacing=timedelta(days=1) / options['events_per_day'],
+                status='completed',
+            )
+            upcoming_events = make_events(
+                options['upcoming'],
+                start=timezone.now() + timedelta(days=1),
+                spacing=timedelta(hours=6),
+            )
+            make_tickets(past_events, seller, options['tickets_per_event'], status='sold')
+            make_tickets(upcoming_events, seller, options['tickets_per_event'])
+
+            self.report('before archive', list_events, options['repeat'])
+            archived_events, archived_tickets = archive_events(older_than_days=0, batch_size=500)
+            self.stdout.write(f'Archived {archived_events} events and {archived_tickets} tickets')
+            self.report('after archive', list_events, options['repeat'])
+
+            transaction.set_rollback(True)
+
+    def report(self, label, func, repeat):
+        p50, p99 = time_calls(func, repeat)
+        self.stdout.write(
+            f'{label:<15} events={Event.objects.count():>7} tickets={Ticket.objects.count():>8}  '
+            f'p50 {p50:7.2f} ms  p99 {p99:7.2f} ms'
+        )
@@ -0,0 +1,76 @@
+import asyncio
+import time
+import tracemalloc
+from datetime import timedelta
+from decimal import Decimal
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from products.live import event_stream, price_hub
+
+from ._bench import days_ago, make_events, make_seller, make_tickets
+
+
+class Command(BaseCommand):
+    help = (
+        'Open many idle Server-Sent Events subscribers on one event in this '
+        'process, reporting memory per subscriber and the time to fan a price '
+        'change out to all of them. The hub queries from worker threads, so the '
+        'dataset is committed and deleted afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--subscribers', type=int, default=10000, help='Idle subscribers (default: 10000)')
+        parser.add_argument('--poll-interval', type=float, default=0.2, help='Hub poll interval in seconds (default: 0.2)')
+
+    def handle(self, *args, **options):
+        seller = make_seller()
+        event = make_events(1, start=days_ago(-7), spacing=timedelta(0))[0]
+        tickets = make_tickets([event], seller, 20)
+
+        try:
+            with override_settings(LIVE_PRICES_POLL_SECONDS=options['poll_interval']):
+                asyncio.run(self.run(event.id, tickets[0], options['subscribers']))
+        finally:
+            event.delete()
+            seller.delete()
+
+    async def run(self, event_id, ticket, count):
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+
+        start = time.perf_counter()
+        streams = [event_stream(event_id) for _ in range(count)]
+        await asyncio.gather(*(anext(stream) for stream in streams))
+        connect_time = time.perf_counter() - start
+        held = tracemalloc.get_traced_memory()[0] - baseline
+
+        self.stdout.write(f'Subscribers:       {count} on {len(price_hub.channels)} hub channel(s)')
+        self.stdout.write(f'Connect:           {connect_time:.2f}s')
+        self.stdout.write(f'Memory held:       {held / 2 ** 20:.1f} MiB ({held / count:.0f} B per subscriber)')
+
+        received = []
+
+        async def wait_for_update(stream):
+            await anext(stream)
+            received.append(time.perf_counter())
+
+        waiters = [asyncio.create_task(wait_for_update(stream)) for stream in streams]
+        await asyncio.sleep(0.1)
+
+        ticket.listing_price = Decimal('1.00')
+        changed_at = time.perf_counter()
+        await sync_to_async(ticket.save)()
+        await asyncio.gather(*waiters)
+        tracemalloc.stop()
+
+        self.stdout.write(
+            f'Fan-out:           {len(received)} updates, first after {(min(received) - changed_at) * 1000:.1f} ms, '
+            f'last after {(max(received) - changed_at) * 1000:.1f} ms '
+            f'(includes up to {settings.LIVE_PRICES_POLL_SECONDS * 1000:.0f} ms poll delay)'
+        )
+        for stream in streams:
+            await stream.aclose()
@@ -0,0 +1,60 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, reset_queries, transaction
+from django.db.models import Avg, Count
+from django.test.utils import CaptureQueriesContext
+
+from products.models import Event, Ticket
+from products.rollups import refresh_market_stats
+from products.views import market_stats
+
+from ._bench import days_ago, make_events, make_seller, make_tickets, request_factory, time_calls
+
+
+def live_stats():
+    # The aggregation market_stats ran on every request before the rollup
+    Event.objects.filter(status='upcoming').count()
+    Ticket.objects.available().count()
+    Ticket.objects.available().aggregate(avg_price=Avg('listing_price'))
+    list(Event.objects.filter(status='upcoming').values('category').annotate(
+        count=Count('category')
+    ).order_by('-count')[:5])
+
+
+class Command(BaseCommand):
+    help = 'Benchmark market_stats reading the rollup against aggregating live tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--events', type=int, default=20000, help='Upcoming events (default: 20000)')
+        parser.add_argument('--tickets', type=int, default=5, help='Available tickets per event (default: 5)')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs per case (default: 20)')
+
+    def handle(self, *args, **options):
+        factory = request_factory()
+
+        # Everything runs in a transaction that is rolled back at the end
+        with transaction.atomic():
+            seller = make_seller()
+            self.stdout.write(f'Creating {options["events"]} events...')
+            events = make_events(options['events'], start=days_ago(-30), spacing=timedelta(minutes=10))
+            make_tickets(events, seller, options['tickets'])
+
+            def endpoint():
+                market_stats(factory.get('/api/stats/')).render()
+
+            for label, func in (
+                ('live aggregation', live_stats),
+                ('rollup refresh', refresh_market_stats),
+                ('market_stats (rollup)', endpoint),
+            ):
+                # The query log is capped; start from empty so the count is right
+                reset_queries()
+                with CaptureQueriesContext(connection) as queries:
+                    func()
+                p50, p99 = time_calls(func, options['repeat'])
+                self.stdout.write(
+                    f'{label:<22} queries={len(queries):>3}  p50 {p50:8.2f} ms  p99 {p99:8.2f} ms'
+                )
+
+            transaction.set_rollback(True)
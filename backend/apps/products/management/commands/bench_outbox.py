@@ -0,0 +1,76 @@
+import http.server
+import threading
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import override_settings
+
+from products import outbox
+from products.models import OutboxMessage
+
+from ._bench import days_ago, make_events
+
+
+class _Sink(http.server.BaseHTTPRequestHandler):
+    """Local webhook sink that accepts every batch."""
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class Command(BaseCommand):
+    help = 'Benchmark outbox dispatcher throughput to in-process handlers and a local webhook sink'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--messages', type=int, default=50000, help='Pending messages (default: 50000)')
+        parser.add_argument('--events', type=int, default=500, help='Events the messages belong to (default: 500)')
+        parser.add_argument('--batch-sizes', default='100,500,2000', help='Comma-separated batch sizes (default: 100,500,2000)')
+
+    def handle(self, *args, **options):
+        delivered = []
+
+        def handler(message):
+            delivered.append(message.id)
+
+        server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _Sink)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        webhook_url = f'http://127.0.0.1:{server.server_port}/outbox/'
+
+        outbox.register('*')(handler)
+        try:
+            # Everything runs in a transaction that is rolled back at the end
+            with transaction.atomic():
+                events = make_events(options['events'], start=days_ago(-30), spacing=timedelta(hours=1))
+                for batch_size in [int(size) for size in options['batch_sizes'].split(',')]:
+                    for sink, url in (('handler', ''), ('webhook', webhook_url)):
+                        self.run(events, options['messages'], batch_size, sink, url, delivered)
+                transaction.set_rollback(True)
+        finally:
+            outbox.unregister(handler)
+            server.shutdown()
+
+    def run(self, events, count, batch_size, sink, url, delivered):
+        OutboxMessage.objects.all().delete()
+        outbox.emit_many(
+            ('ticket.listed', events[i % len(events)].id, {'n': i})
+            for i in range(count)
+        )
+        delivered.clear()
+
+        with override_settings(OUTBOX_WEBHOOK_URL=url):
+            start = time.perf_counter()
+            total, _ = outbox.dispatch_pending(batch_size)
+            elapsed = time.perf_counter() - start
+
+        in_order = delivered == sorted(delivered)
+        self.stdout.write(
+            f'{sink:<8} batch={batch_size:>5}  {total} messages in {elapsed:6.2f}s  '
+            f'{total / elapsed:8.0f} msg/s  ordered={in_order}'
+        )
@@ -0,0 +1,104 @@
+import threading
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections
+from django.db.models import Sum
+
+from products.models import Event, Sale, Ticket
+from products.purchases import PurchaseError, purchase_ticket
+
+from ._bench import days_ago, make_events, make_seller, make_tickets
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark purchases per second against a single hot event with many '
+        'concurrent buyers, and verify that no listing is oversold. Buyer threads '
+        'need their own connections, so the dataset is committed and deleted '
+        'afterwards instead of being rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--buyers', type=int, default=200, help='Concurrent buyer threads (default: 200)')
+        parser.add_argument('--listings', type=int, default=50, help='Listings on the hot event (default: 50)')
+        parser.add_argument('--quantity', type=int, default=10, help='Tickets per listing (default: 10)')
+
+    def handle(self, *args, **options):
+        seller = make_seller()
+        event = make_events(1, start=days_ago(-7), spacing=timedelta(0))[0]
+        tickets = make_tickets([event], seller, options['listings'], quantity=options['quantity'])
+        buyers = User.objects.bulk_create([
+            User(email=f'bench-buyer{i}@crowdbolt.com', username=f'bench-buyer{i}')
+            for i in range(options['buyers'])
+        ])
+        stock = options['listings'] * options['quantity']
+
+        try:
+            sold, conflicts, retries, elapsed = self.run_buyers(buyers, [t.id for t in tickets])
+            sales = Sale.objects.filter(event=event).aggregate(total=Sum('quantity'))['total'] or 0
+            remaining = Ticket.objects.filter(event=event).aggregate(total=Sum('quantity'))['total']
+            oversold = Ticket.objects.filter(event=event, quantity__lt=0).count()
+
+            self.stdout.write(f'Buyers:            {options["buyers"]}')
+            self.stdout.write(f'Stock:             {stock} tickets in {options["listings"]} listings')
+            self.stdout.write(f'Throughput:        {sold / elapsed:.0f} purchases/s ({sold} in {elapsed:.2f}s)')
+            self.stdout.write(f'Conflicts:         {conflicts} rejected, {retries} lock retries')
+            self.stdout.write(
+                f'Event sales count: {Event.objects.get(id=event.id).ticket_sales_count}'
+            )
+            if sales + remaining != stock or oversold or sales != sold:
+                self.stdout.write(self.style.ERROR(
+                    f'Inventory mismatch: {sales} sold + {remaining} remaining != {stock}'
+                ))
+            else:
+                self.stdout.write(self.style.SUCCESS('No oversell: sold + remaining == stock'))
+        finally:
+            Sale.objects.filter(event=event).delete()
+            event.delete()
+            User.objects.filter(id__in=[b.id for b in buyers]).delete()
+            seller.delete()
+
+    def run_buyers(self, buyers, ticket_ids):
+        """Have every buyer purchase one ticket at a time until stock runs out."""
+        counts = {'sold': 0, 'conflicts': 0, 'retries': 0}
+        counts_lock = threading.Lock()
+        barrier = threading.Barrier(len(buyers))
+
+        def buyer_loop(index, buyer):
+            sold = conflicts = retries = 0
+            # Buyers start on different listings but all hit the same event
+            candidates = ticket_ids[index % len(ticket_ids):] + ticket_ids[:index % len(ticket_ids)]
+            barrier.wait()
+            for ticket_id in candidates:
+                while True:
+                    try:
+                        purchase_ticket(ticket_id, buyer)
+                        sold += 1
+                    except PurchaseError:
+                        conflicts += 1
+                        break
+                    except OperationalError:
+                        # SQLite reports lock contention instead of waiting
+                        retries += 1
+            connections.close_all()
+            with counts_lock:
+                counts['sold'] += sold
+                counts['conflicts'] += conflicts
+                counts['retries'] += retries
+
+        threads = [
+            threading.Thread(target=buyer_loop, args=(i, buyer))
+            for i, buyer in enumerate(buyers)
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        return counts['sold'], counts['conflicts'], counts['retries'], elapsed
@@ -0,0 +1,64 @@
+import gzip
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import force_authenticate
+
+from config import compression
+from config.renderers import FastJSONRenderer
+from products.views import EventListView, SellerDashboardView, event_tickets
+
+from ._bench import days_ago, make_events, make_seller, make_tickets, request_factory, time_calls
+
+
+class Command(BaseCommand):
+    help = 'Benchmark JSON encode time and compressed size of the largest API responses'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tickets', type=int, default=2000, help='Tickets listed for the event (default: 2000)')
+        parser.add_argument('--repeat', type=int, default=30, help='Timed encodes per case (default: 30)')
+
+    def handle(self, *args, **options):
+        factory = request_factory()
+        repeat = options['repeat']
+
+        # Everything runs in a transaction that is rolled back at the end
+        with transaction.atomic():
+            seller = make_seller()
+            events = make_events(100, start=days_ago(-30), spacing=timedelta(hours=1))
+            make_tickets(events[:1], seller, options['tickets'])
+            make_tickets(events[1:], seller, 1)
+
+            def get(view, path, **kwargs):
+                request = factory.get(path)
+                force_authenticate(request, user=seller)
+                return view(request, **kwargs).data
+
+            payloads = (
+                (f'event tickets ({options["tickets"]})', get(
+                    event_tickets, f'/api/events/{events[0].id}/tickets/', event_id=events[0].id
+                )),
+                ('event list page', get(EventListView.as_view(), '/api/events/')),
+                ('seller dashboard', get(SellerDashboardView.as_view(), '/api/seller/dashboard/')),
+            )
+
+            self.stdout.write(
+                f'{"":<22}{"stdlib ms":>10}{"orjson ms":>10}{"raw KiB":>10}{"gzip KiB":>10}{"br KiB":>10}'
+            )
+            for label, data in payloads:
+                stdlib, _ = time_calls(lambda: JSONRenderer().render(data), repeat)
+                fast, _ = time_calls(lambda: FastJSONRenderer().render(data), repeat)
+                body = FastJSONRenderer().render(data)
+                gzipped = len(gzip.compress(body, compresslevel=6))
+                if compression.brotli is not None:
+                    brotli_size = f'{len(compression.compress(body, "br")) / 1024:10.1f}'
+                else:
+                    brotli_size = f'{"n/a":>10}'
+                self.stdout.write(
+                    f'{label:<22}{stdlib:10.2f}{fast:10.2f}'
+                    f'{len(body) / 1024:10.1f}{gzipped / 1024:10.1f}{brotli_size}'
+                )
+
+            transaction.set_rollback(True)
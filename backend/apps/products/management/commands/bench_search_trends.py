@@ -0,0 +1,66 @@
+import random
+import time
+from collections import Counter
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from products.searches import SearchCounter, merge_searches, trending_searches
+
+from ._bench import time_calls
+
+
+class Command(BaseCommand):
+    help = 'Benchmark trending-search counting: throughput, merge cost and top-k accuracy against exact counts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--searches', type=int, default=300000, help='Searches counted (default: 300000)')
+        parser.add_argument('--terms', type=int, default=1000000, help='Distinct terms searches draw from (default: 1000000)')
+        parser.add_argument('--batch', type=int, default=500, help='Searches per merge (default: 500)')
+
+    def handle(self, *args, **options):
+        # Zipf-like popularity, as search terms usually have
+        weights = [1 / (rank + 1) ** 1.05 for rank in range(options['terms'])]
+        stream = [f'term {rank}' for rank in random.choices(range(options['terms']), weights, k=options['searches'])]
+        exact = Counter(stream)
+
+        # Everything runs in a transaction that is rolled back at the end
+        with transaction.atomic():
+            counter = SearchCounter()
+            counting = merging = 0.0
+            for offset in range(0, len(stream), options['batch']):
+                start = time.perf_counter()
+                for term in stream[offset:offset + options['batch']]:
+                    counter.add(term, ())
+                counting += time.perf_counter() - start
+                start = time.perf_counter()
+                merge_searches(*counter.take())
+                merging += time.perf_counter() - start
+
+            merges = -(-len(stream) // options['batch'])
+            self.stdout.write(
+                f'{len(stream)} searches over {len(exact)} distinct terms: '
+                f'{len(stream) / counting:,.0f} searches/s counted in-process, '
+                f'{merging / merges * 1000:.2f} ms per merge ({merges} merges)'
+            )
+
+            def read():
+                cache.delete('trending-searches')
+                return trending_searches()
+
+            p50, p99 = time_calls(read, 20)
+            self.stdout.write(f'trending read (uncached): p50 {p50:.2f} ms  p99 {p99:.2f} ms')
+
+            trending = read()
+            true_top = [term for term, _ in exact.most_common(len(trending))]
+            found = len({entry['term'] for entry in trending} & set(true_top))
+            self.stdout.write(f'top-{len(trending)} recall against exact counts: {found / len(trending):.0%}')
+            for entry in trending[:10]:
+                true_count = exact[entry['term']]
+                self.stdout.write(
+                    f'  {entry["term"]:<12} exact {true_count:>6}  estimate {entry["count"]:>6}  '
+                    f'(+{entry["count"] - true_count})'
+                )
+
+            transaction.set_rollback(True)
@@ -0,0 +1,51 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import force_authenticate
+
+from products.views import MyTicketsView, SellerDashboardView
+
+from ._bench import days_ago, make_events, make_seller, make_tickets, request_factory, time_calls
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the seller dashboard and my-tickets for a seller with many listings'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--listings', type=int, default=50000, help='Listings owned by the seller (default: 50000)')
+        parser.add_argument('--events', type=int, default=500, help='Events the listings belong to (default: 500)')
+        parser.add_argument('--repeat', type=int, default=50, help='Timed requests per endpoint (default: 50)')
+
+    def handle(self, *args, **options):
+        factory = request_factory()
+
+        # Everything runs in a transaction that is rolled back at the end
+        with transaction.atomic():
+            seller = make_seller()
+            events = make_events(options['events'], start=days_ago(-30), spacing=timedelta(hours=1))
+            self.stdout.write(f'Creating {options["listings"]} listings...')
+            make_tickets(events, seller, max(options['listings'] // options['events'], 1))
+
+            for label, view, path, cold in (
+                ('my-tickets', MyTicketsView.as_view(), '/api/my-tickets/', False),
+                ('dashboard (cold summary)', SellerDashboardView.as_view(), '/api/seller/dashboard/', True),
+                ('dashboard (cached summary)', SellerDashboardView.as_view(), '/api/seller/dashboard/', False),
+            ):
+                def call():
+                    if cold:
+                        cache.delete(f'seller-dashboard-summary:{seller.pk}')
+                    request = factory.get(path)
+                    force_authenticate(request, user=seller)
+                    view(request).render()
+
+                with CaptureQueriesContext(connection) as queries:
+                    call()
+                p50, p99 = time_calls(call, options['repeat'])
+                self.stdout.write(
+                    f'{label:<27} queries={len(queries):>3}  p50 {p50:7.2f} ms  p99 {p99:7.2f} ms'
+                )
+
+            transaction.set_rollback(True)
@@ -0,0 +1,68 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from products.models import Event, Ticket
+from products.serializers import (
+    EventListSerializer,
+    FastEventListSerializer,
+    FastTicketListSerializer,
+    TicketListSerializer,
+)
+
+from ._bench import days_ago, make_events, make_seller, make_tickets, time_calls
+
+
+class Command(BaseCommand):
+    help = 'Microbenchmark the DRF and fast list serializers, per 1,000 rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000, help='Rows serialized per call (default: 1000)')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed calls per case (default: 20)')
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        repeat = options['repeat']
+        per_1000 = 1000 / rows
+
+        # Everything runs in a transaction that is rolled back at the end
+        with transaction.atomic():
+            seller = make_seller()
+            events = make_events(rows, start=days_ago(-30), spacing=timedelta(minutes=10))
+            make_tickets(events, seller, 2)
+
+            event_queryset = Event.objects.filter(status='upcoming').order_by('event_date')[:rows]
+            ticket_queryset = Ticket.objects.available().order_by('listing_price')[:rows]
+            cases = (
+                ('events', 'drf', EventListSerializer, lambda: list(event_queryset)),
+                ('events', 'fast', FastEventListSerializer,
+                 lambda: list(FastEventListSerializer.prepare_queryset(event_queryset))),
+                ('tickets', 'drf', TicketListSerializer,
+                 lambda: list(ticket_queryset.select_related('event'))),
+                ('tickets', 'fast', FastTicketListSerializer,
+                 lambda: list(FastTicketListSerializer.prepare_queryset(ticket_queryset))),
+            )
+
+            self.stdout.write(f'{"":<16}{"fetch":>12}{"serialize":>12}{"render":>12}   (ms per 1,000 rows, p50)')
+            outputs = {}
+            for endpoint, kind, serializer_class, fetch in cases:
+                fetched = fetch()
+                data = serializer_class(fetched, many=True).data
+                outputs[endpoint, kind] = JSONRenderer().render(data)
+
+                fetch_ms, _ = time_calls(fetch, repeat)
+                # DRF's EventListSerializer runs its ticket queries while serializing
+                serialize_ms, _ = time_calls(lambda: serializer_class(fetched, many=True).data, repeat)
+                render_ms, _ = time_calls(lambda: JSONRenderer().render(data), repeat)
+                self.stdout.write(
+                    f'{endpoint + " " + kind:<16}{fetch_ms * per_1000:12.2f}'
+                    f'{serialize_ms * per_1000:12.2f}{render_ms * per_1000:12.2f}'
+                )
+
+            for endpoint in ('events', 'tickets'):
+                identical = outputs[endpoint, 'drf'] == outputs[endpoint, 'fast']
+                self.stdout.write(f'{endpoint} output byte-identical: {identical}')
+
+            transaction.set_rollback(True)
@@ -0,0 +1,47 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from products.expiry import expire_tickets
+from products.models import Ticket, TicketListing
+
+from ._bench import days_ago, make_events, make_seller, make_tickets
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the ticket expiry sweeper on a large number of expired listings'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tickets', type=int, default=1000000, help='Expired tickets to sweep (default: 1000000)')
+        parser.add_argument('--events', type=int, default=1000, help='Events the tickets belong to (default: 1000)')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Sweeper batch size (default: 5000)')
+
+    def handle(self, *args, **options):
+        # Everything runs in a transaction that is rolled back at the end
+        with transaction.atomic():
+            seller = make_seller()
+            events = make_events(options['events'], start=days_ago(-30), spacing=timedelta(hours=1))
+            self.stdout.write(f'Creating {options["tickets"]} expired tickets...')
+            make_tickets(
+                events, seller, max(options['tickets'] // options['events'], 1),
+                expires_at=days_ago(1),
+            )
+
+            start = time.perf_counter()
+            tickets, affected_events = expire_tickets(batch_size=options['batch_size'])
+            elapsed = time.perf_counter() - start
+            batches = max(-(-tickets // options['batch_size']), 1)
+
+            self.stdout.write(
+                f'Expired {tickets} tickets across {affected_events} events in {elapsed:.2f}s '
+                f'({tickets / elapsed:.0f} tickets/s, {elapsed / batches * 1000:.1f} ms per '
+                f'{options["batch_size"]}-row batch)'
+            )
+            self.stdout.write(
+                f'Remaining available: {Ticket.objects.filter(status="available").count()}, '
+                f'expired listings: {TicketListing.objects.filter(status="expired").count()}'
+            )
+
+            transaction.set_rollback(True)
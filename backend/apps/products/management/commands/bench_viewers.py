@@ -0,0 +1,64 @@
+import random
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from products.models import EventViewers
+from products.sketches import hash64
+from products.viewers import ViewerBuffer, merge_viewers
+
+from ._bench import days_ago, make_events
+
+
+class Command(BaseCommand):
+    help = 'Benchmark unique-viewer ingest throughput and HyperLogLog accuracy against exact counts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--events', type=int, default=20, help='Events viewed (default: 20)')
+        parser.add_argument('--views', type=int, default=500000, help='Total views ingested (default: 500000)')
+        parser.add_argument('--batch', type=int, default=1000, help='Views per merge (default: 1000)')
+
+    def handle(self, *args, **options):
+        # Everything runs in a transaction that is rolled back at the end
+        with transaction.atomic():
+            events = make_events(options['events'], start=days_ago(-30), spacing=timedelta(hours=1))
+            # Skewed popularity and audience sizes: event i draws from 10 * 3**i viewers
+            audiences = [min(10 * 3 ** i, 10 ** 7) for i in range(len(events))]
+            weights = [1 / (i + 1) for i in range(len(events))]
+            buffer = ViewerBuffer()
+            exact = {str(event.id): set() for event in events}
+
+            hashing = merging = 0.0
+            views = options['views']
+            for offset in range(0, views, options['batch']):
+                batch = random.choices(range(len(events)), weights, k=min(options['batch'], views - offset))
+                start = time.perf_counter()
+                for i in batch:
+                    viewer = f'user:{random.randrange(audiences[i])}'
+                    event_id = str(events[i].id)
+                    buffer.add(event_id, hash64(viewer))
+                    exact[event_id].add(viewer)
+                hashing += time.perf_counter() - start
+                start = time.perf_counter()
+                merge_viewers(buffer.take())
+                merging += time.perf_counter() - start
+
+            self.stdout.write(
+                f'ingest: {views} views, {views / (hashing + merging):,.0f} views/s '
+                f'(hash+buffer {hashing * 1000:.0f} ms, {views // options["batch"]} merges {merging * 1000:.0f} ms)'
+            )
+
+            errors = []
+            for row in EventViewers.objects.order_by('unique_viewers'):
+                true_count = len(exact[str(row.event_id)])
+                error = (row.unique_viewers - true_count) / true_count * 100
+                errors.append(abs(error))
+                self.stdout.write(
+                    f'  exact {true_count:>9}  estimate {row.unique_viewers:>9}  '
+                    f'error {error:+6.2f}%  sketch {len(row.sketch):>5} bytes'
+                )
+            self.stdout.write(f'mean abs error {sum(errors) / len(errors):.2f}%, max {max(errors):.2f}%')
+
+            transaction.set_rollback(True)
@@ -0,0 +1,116 @@
+import statistics
+import threading
+import time
+from datetime import timedelta
+
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test import override_settings
+
+from products.models import Event
+from products.views import event_tickets, waiting_room
+
+from ._bench import days_ago, make_events, make_seller, make_tickets, request_factory
+
+
+class Command(BaseCommand):
+    help = (
+        'Load test the waiting room: waves of concurrent clients open a hot '
+        'event, with and without the waiting room, reporting event_tickets '
+        'latency against queue depth. Client threads need their own '
+        'connections, so the dataset is committed and deleted afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', default='20,60,120', help='Comma-separated wave sizes (default: 20,60,120)')
+        parser.add_argument('--tickets', type=int, default=50, help='Tickets listed on the hot event (default: 50)')
+        parser.add_argument('--rate', type=float, default=10.0,
+                            help='Admissions per second; keep it below what the backend sustains (default: 10)')
+        parser.add_argument('--burst', type=int, default=5, help='Token bucket size (default: 5)')
+        parser.add_argument('--poll-interval', type=float, default=0.1, help='Seconds between polls (default: 0.1)')
+
+    def handle(self, *args, **options):
+        waves = [int(size) for size in options['clients'].split(',')]
+        seller = make_seller()
+        event = make_events(1, start=days_ago(-7), spacing=timedelta(0))[0]
+        # Top of the trending list, so it is the event behind the waiting room
+        Event.objects.filter(id=event.id).update(trending_score=10 ** 6)
+        make_tickets([event], seller, options['tickets'])
+
+        try:
+            self.stdout.write(f'{"mode":<14}{"clients":>8}{"max depth":>11}{"backend p50":>14}{"backend p99":>14}{"poll p50":>11}')
+            for clients in waves:
+                self.report('direct', clients, *self.run_wave(event.id, clients, options, use_room=False))
+                settings = {
+                    'WAITING_ROOM_ENABLED': True,
+                    'WAITING_ROOM_TRENDING_LIMIT': 1,
+                    'WAITING_ROOM_RATE': options['rate'],
+                    'WAITING_ROOM_BURST': options['burst'],
+                }
+                with override_settings(**settings):
+                    cache = caches['default']
+                    cache.delete_many([
+                        'waiting-room:active',
+                        f'waiting-room:{event.id}:tail',
+                        f'waiting-room:{event.id}:bucket',
+                    ])
+                    self.report('waiting room', clients, *self.run_wave(event.id, clients, options, use_room=True))
+                    cache.delete('waiting-room:active')
+        finally:
+            event.delete()
+            seller.delete()
+
+    def run_wave(self, event_id, clients, options, use_room):
+        """Release ``clients`` threads at once; return backend timings, poll timings and peak depth."""
+        factory = request_factory()
+        backend_timings = []
+        poll_timings = []
+        depth = [0]
+        lock = threading.Lock()
+        barrier = threading.Barrier(clients)
+
+        def timed(func):
+            start = time.perf_counter()
+            response = func()
+            return response, time.perf_counter() - start
+
+        def client():
+            barrier.wait()
+            headers = {}
+            if use_room:
+                result = waiting_room(factory.post(f'/api/events/{event_id}/waiting-room/'), event_id=event_id).data
+                while not result['admitted']:
+                    with lock:
+                        depth[0] = max(depth[0], result['position'])
+                    time.sleep(options['poll_interval'])
+                    request = factory.get(f'/api/events/{event_id}/waiting-room/', {'token': result['queue_token']})
+                    response, elapsed = timed(lambda: waiting_room(request, event_id=event_id))
+                    result = response.data
+                    with lock:
+                        poll_timings.append(elapsed)
+                headers['HTTP_X_ADMISSION_TOKEN'] = result['admission_token']
+
+            request = factory.get(f'/api/events/{event_id}/tickets/', **headers)
+            response, elapsed = timed(lambda: event_tickets(request, event_id=event_id))
+            assert response.status_code == 200, response.status_code
+            with lock:
+                backend_timings.append(elapsed)
+            connections.close_all()
+
+        threads = [threading.Thread(target=client) for _ in range(clients)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return backend_timings, poll_timings, depth[0]
+
+    def report(self, mode, clients, backend_timings, poll_timings, depth):
+        backend_timings.sort()
+        poll = f'{statistics.median(poll_timings) * 1000:8.2f} ms' if poll_timings else f'{"-":>11}'
+        self.stdout.write(
+            f'{mode:<14}{clients:>8}{depth:>11}'
+            f'{statistics.median(backend_timings) * 1000:11.2f} ms'
+            f'{backend_timings[max(int(len(backend_timings) * 0.99) - 1, 0)] * 1000:11.2f} ms'
+            f'{poll}'
+        )
@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from products.outbox import dispatch_pending, purge_dispatched
+
+
+class Command(BaseCommand):
+    help = 'Deliver pending outbox messages to registered handlers and the webhook sink'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Messages claimed per transaction (default: 500)'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running, dispatching every --interval seconds'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=1,
+            help='Seconds between runs with --loop (default: 1)'
+        )
+        parser.add_argument(
+            '--purge-days',
+            type=int,
+            default=None,
+            help='Also delete messages dispatched more than this many days ago'
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+
+        while True:
+            delivered, claimed = dispatch_pending(options['batch_size'])
+            self.stdout.write(f'Dispatched {delivered} of {claimed} claimed outbox messages')
+            if options['purge_days'] is not None:
+                purged = purge_dispatched(options['purge_days'])
+                self.stdout.write(f'Purged {purged} dispatched messages')
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from products.expiry import expire_tickets
+
+
+class Command(BaseCommand):
+    help = 'Mark available tickets past their expires_at, and their listings, as expired'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Tickets updated per transaction (default: 5000)'
+        )
+        parser.add_argument(
+            '--pause',
+            type=float,
+            default=0,
+            help='Seconds to sleep between batches (default: 0)'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running, sweeping every --interval seconds'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=60,
+            help='Seconds between sweeps with --loop (default: 60)'
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+
+        while True:
+            tickets, events = expire_tickets(options['batch_size'], options['pause'])
+            self.stdout.write(f'Expired {tickets} tickets across {events} events')
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
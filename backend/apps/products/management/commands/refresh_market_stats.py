@@ -0,0 +1,31 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from products.rollups import refresh_market_stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute the market stats rollup read by the market_stats endpoint'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running, refreshing every --interval seconds'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=settings.MARKET_STATS_REFRESH_SECONDS,
+            help='Seconds between refreshes with --loop (default: MARKET_STATS_REFRESH_SECONDS)'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            rows = refresh_market_stats()
+            self.stdout.write(f'Refreshed market stats: {len(rows)} rows')
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
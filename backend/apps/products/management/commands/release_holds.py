@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from products.reservations import release_expired_holds
+
+
+class Command(BaseCommand):
+    help = 'Return tickets whose checkout hold has run out to available'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Holds released per UPDATE (default: 5000)'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running, releasing every --interval seconds'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=15,
+            help='Seconds between runs with --loop (default: 15)'
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+
+        while True:
+            released = release_expired_holds(options['batch_size'])
+            self.stdout.write(f'Released {released} expired holds')
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
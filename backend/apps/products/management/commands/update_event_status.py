@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from products.lifecycle import transition_events
+
+
+class Command(BaseCommand):
+    help = 'Move events from upcoming to live to completed and expire tickets of finished events'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Events updated per transaction (default: 1000)'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running, checking every --interval seconds'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=60,
+            help='Seconds between runs with --loop (default: 60)'
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+
+        while True:
+            started, completed = transition_events(options['batch_size'])
+            self.stdout.write(f'{started} events now live, {completed} completed')
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
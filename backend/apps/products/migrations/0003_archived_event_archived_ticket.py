@@ -0,0 +1,186 @@
+# Generated by Django 5.2.6 on 2026-10-19 00:01
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0002_event_is_trending_event_search_count_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedEvent",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(editable=False, primary_key=True, serialize=False),
+                ),
+                ("name", models.CharField(max_length=200)),
+                ("description", models.TextField()),
+                (
+                    "category",
+                    models.CharField(
+                        choices=[
+                            ("concert", "Concert"),
+                            ("festival", "Festival"),
+                            ("rave", "Rave/Club"),
+                            ("theater", "Theater"),
+                            ("sports", "Sports"),
+                            ("comedy", "Comedy"),
+                            ("other", "Other"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("upcoming", "Upcoming"),
+                            ("live", "Live/Happening"),
+                            ("completed", "Completed"),
+                            ("cancelled", "Cancelled"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("venue_name", models.CharField(max_length=200)),
+                ("venue_address", models.TextField()),
+                ("city", models.CharField(max_length=100)),
+                ("state", models.CharField(max_length=50)),
+                ("country", models.CharField(max_length=50)),
+                ("event_date", models.DateTimeField()),
+                ("doors_open", models.DateTimeField(blank=True, null=True)),
+                ("event_end", models.DateTimeField(blank=True, null=True)),
+                ("image_url", models.URLField(blank=True)),
+                ("artist_lineup", models.JSONField(blank=True, default=list)),
+                ("view_count", models.PositiveIntegerField(default=0)),
+                ("search_count", models.PositiveIntegerField(default=0)),
+                ("ticket_sales_count", models.PositiveIntegerField(default=0)),
+                ("created_at", models.DateTimeField()),
+                ("updated_at", models.DateTimeField()),
+                ("archived_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "archived_events",
+                "ordering": ["-event_date"],
+            },
+        ),
+        migrations.CreateModel(
+            name="ArchivedTicket",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(editable=False, primary_key=True, serialize=False),
+                ),
+                ("section", models.CharField(blank=True, max_length=100)),
+                ("row", models.CharField(blank=True, max_length=20)),
+                ("seat_number", models.CharField(blank=True, max_length=20)),
+                ("quantity", models.PositiveIntegerField()),
+                (
+                    "original_price",
+                    models.DecimalField(decimal_places=2, max_digits=10),
+                ),
+                ("listing_price", models.DecimalField(decimal_places=2, max_digits=10)),
+                (
+                    "condition",
+                    models.CharField(
+                        choices=[
+                            ("digital", "Digital/Mobile"),
+                            ("physical", "Physical Ticket"),
+                            ("pdf", "PDF Ticket"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("available", "Available"),
+                            ("pending", "Pending Sale"),
+                            ("sold", "Sold"),
+                            ("transferred", "Transferred"),
+                            ("cancelled", "Cancelled"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("notes", models.TextField(blank=True)),
+                ("transfer_method", models.CharField(blank=True, max_length=200)),
+                ("listed_at", models.DateTimeField()),
+                ("updated_at", models.DateTimeField()),
+                ("expires_at", models.DateTimeField(blank=True, null=True)),
+                ("listing_id", models.UUIDField(blank=True, null=True)),
+                (
+                    "listing_status",
+                    models.CharField(
+                        blank=True,
+                        choices=[
+                            ("active", "Active"),
+                            ("paused", "Paused"),
+                            ("sold", "Sold"),
+                            ("expired", "Expired"),
+                            ("cancelled", "Cancelled"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("listing_views", models.PositiveIntegerField(default=0)),
+                ("listing_saves", models.PositiveIntegerField(default=0)),
+                (
+                    "platform_fee_percentage",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=5, null=True
+                    ),
+                ),
+                (
+                    "payment_processing_fee",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=5, null=True
+                    ),
+                ),
+                ("archived_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "event",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="tickets",
+                        to="products.archivedevent",
+                    ),
+                ),
+                (
+                    "seller",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_tickets",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "archived_tickets",
+                "ordering": ["-listed_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["seller", "listed_at"],
+                        name="archived_ti_seller__54aea3_idx",
+                    )
+                ],
+            },
+        ),
+    ]
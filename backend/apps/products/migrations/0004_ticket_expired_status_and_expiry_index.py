@@ -0,0 +1,52 @@
+# Generated by Django 5.2.6 on 2026-10-19 00:04
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0003_archived_event_archived_ticket"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="archivedticket",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("available", "Available"),
+                    ("pending", "Pending Sale"),
+                    ("sold", "Sold"),
+                    ("transferred", "Transferred"),
+                    ("cancelled", "Cancelled"),
+                    ("expired", "Expired"),
+                ],
+                max_length=20,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="ticket",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("available", "Available"),
+                    ("pending", "Pending Sale"),
+                    ("sold", "Sold"),
+                    ("transferred", "Transferred"),
+                    ("cancelled", "Cancelled"),
+                    ("expired", "Expired"),
+                ],
+                default="available",
+                max_length=20,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="ticket",
+            index=models.Index(
+                fields=["status", "expires_at"], name="tickets_status_5d60c7_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.6 on 2026-10-19 00:06
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0004_ticket_expired_status_and_expiry_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["status", "event_date"], name="events_status_4e8a13_idx"
+            ),
+        ),
+    ]
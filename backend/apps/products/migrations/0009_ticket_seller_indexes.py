@@ -0,0 +1,31 @@
+# Generated by Django 5.2.6 on 2026-10-19 00:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0008_outboxmessage"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="ticket",
+            index=models.Index(
+                fields=["seller", "-listed_at"], name="tickets_seller__fe09a9_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="ticket",
+            index=models.Index(
+                fields=["seller", "status"], name="tickets_seller__4a9d00_idx"
+            ),
+        ),
+        migrations.RemoveIndex(
+            model_name="ticket",
+            name="tickets_seller__302c26_idx",
+        ),
+    ]
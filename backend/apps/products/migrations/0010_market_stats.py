@@ -0,0 +1,62 @@
+# Generated by Django 5.2.6 on 2026-10-19 01:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0009_ticket_seller_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MarketStat",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "dimension",
+                    models.CharField(
+                        choices=[
+                            ("total", "Total"),
+                            ("category", "Category"),
+                            ("city", "City"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("key", models.CharField(blank=True, max_length=100)),
+                ("rank", models.PositiveIntegerField()),
+                ("upcoming_events", models.PositiveIntegerField(default=0)),
+                ("available_tickets", models.PositiveIntegerField(default=0)),
+                (
+                    "listing_price_sum",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=16),
+                ),
+                ("refreshed_at", models.DateTimeField()),
+            ],
+            options={
+                "db_table": "market_stats",
+                "ordering": ["dimension", "rank"],
+                "indexes": [
+                    models.Index(
+                        fields=["dimension", "rank"],
+                        name="market_stat_dimensi_86fca3_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("dimension", "key"), name="market_stats_dimension_key"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.6 on 2026-10-19 01:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0010_market_stats"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EventViewers",
+            fields=[
+                (
+                    "event",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="viewers",
+                        serialize=False,
+                        to="products.event",
+                    ),
+                ),
+                ("sketch", models.BinaryField()),
+                ("unique_viewers", models.PositiveIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "event_viewers",
+            },
+        ),
+    ]
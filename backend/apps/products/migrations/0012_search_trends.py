@@ -0,0 +1,35 @@
+# Generated by Django 5.2.6 on 2026-10-19 01:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0011_event_viewers"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchTrendWindow",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("window_start", models.DateTimeField(unique=True)),
+                ("sketch", models.BinaryField()),
+                ("top_terms", models.JSONField(default=list)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "search_trends",
+                "ordering": ["-window_start"],
+            },
+        ),
+    ]
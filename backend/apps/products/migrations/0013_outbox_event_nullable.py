@@ -0,0 +1,26 @@
+# Generated by Django 5.2.6 on 2026-10-19 02:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0012_search_trends"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="outboxmessage",
+            name="event",
+            field=models.ForeignKey(
+                blank=True,
+                db_constraint=False,
+                null=True,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="+",
+                to="products.event",
+            ),
+        ),
+    ]
@@ -1,7 +1,9 @@
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.core.serializers.json import DjangoJSONEncoder
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
+from decimal import Decimal
 import uuid
 
 User = get_user_model()
@@ -71,6 +73,7 @@ class Event(models.Model):
             models.Index(fields=['event_date']),
             models.Index(fields=['trending_score']),
             models.Index(fields=['is_trending']),
+            models.Index(fields=['status', 'event_date']),
         ]
 
     def __str__(self):
@@ -108,6 +111,16 @@ class Event(models.Model):
         ).order_by('-trending_score')[:limit]
 
 
+class TicketQuerySet(models.QuerySet):
+    """QuerySet helpers for Ticket."""
+
+    def available(self):
+        """Tickets that can be bought now: available and not past expires_at."""
+        return self.filter(status='available').filter(
+            models.Q(expires_at__isnull=True) | models.Q(expires_at__gt=timezone.now())
+        )
+
+
 class Ticket(models.Model):
     """Ticket model for event tickets being resold."""
 
@@ -123,6 +136,7 @@ class Ticket(models.Model):
         ('sold', 'Sold'),
         ('transferred', 'Transferred'),
         ('cancelled', 'Cancelled'),
+        ('expired', 'Expired'),
     ]
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -152,14 +166,24 @@ class Ticket(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     expires_at = models.DateTimeField(null=True, blank=True)
 
+    # Checkout hold: set while status is 'pending' (see products.reservations)
+    held_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='held_tickets')
+    held_until = models.DateTimeField(null=True, blank=True)
+
+    objects = TicketQuerySet.as_manager()
+
     class Meta:
         db_table = 'tickets'
         ordering = ['listing_price']
         indexes = [
             models.Index(fields=['status']),
             models.Index(fields=['event', 'status']),
-            models.Index(fields=['seller']),
+            # Seller lookups, newest first (seller dashboard, my-tickets)
+            models.Index(fields=['seller', '-listed_at']),
+            models.Index(fields=['seller', 'status']),
             models.Index(fields=['listing_price']),
+            models.Index(fields=['status', 'expires_at']),
+            models.Index(fields=['status', 'held_until']),
         ]
 
     def __str__(self):
@@ -174,6 +198,43 @@ class Ticket(models.Model):
         return 0
 
 
+# Fee and payout amounts carry up to 6 decimal places before rounding:
+# 2 from the price, 2 from the fee percentage and 2 from dividing by 100
+EARNINGS_FIELD = models.DecimalField(max_digits=18, decimal_places=6)
+
+
+class TicketListingQuerySet(models.QuerySet):
+    """QuerySet helpers for TicketListing."""
+
+    def with_earnings(self):
+        """
+        Annotate fee_amount and payout_amount, the database-side equivalents
+        of TicketListing.total_fees() and seller_payout().
+        """
+        price = models.F('ticket__listing_price')
+        # Multiplying by 0.01 instead of dividing by 100 avoids integer
+        # division on SQLite, which stores whole-number decimals as integers
+        fees = models.ExpressionWrapper(
+            price * models.F('platform_fee_percentage') * models.Value(Decimal('0.01'))
+            + models.F('payment_processing_fee'),
+            output_field=EARNINGS_FIELD,
+        )
+        return self.annotate(
+            fee_amount=fees,
+            payout_amount=models.ExpressionWrapper(price - fees, output_field=EARNINGS_FIELD),
+        )
+
+    def earnings_by_status(self):
+        """Listing count, tickets, gross, fees and payout per listing status, in one query."""
+        return self.with_earnings().order_by('status').values('status').annotate(
+            listings=models.Count('id'),
+            tickets=models.Sum('ticket__quantity'),
+            gross=models.Sum('ticket__listing_price', output_field=EARNINGS_FIELD),
+            fees=models.Sum('fee_amount', output_field=EARNINGS_FIELD),
+            payout=models.Sum('payout_amount', output_field=EARNINGS_FIELD),
+        )
+
+
 class TicketListing(models.Model):
     """Represents a ticket listing transaction."""
 
@@ -201,6 +262,8 @@ class TicketListing(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = TicketListingQuerySet.as_manager()
+
     class Meta:
         db_table = 'ticket_listings'
 
@@ -216,3 +279,232 @@ class TicketListing(models.Model):
     def seller_payout(self):
         """Calculate how much seller receives after fees."""
         return self.ticket.listing_price - self.total_fees()
+
+
+class Sale(models.Model):
+    """A completed purchase of some or all of a ticket listing's quantity."""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    # No DB constraint: sales outlive their ticket and event when those move
+    # to the archive tables, which keep the same ids
+    ticket = models.ForeignKey(Ticket, on_delete=models.DO_NOTHING, db_constraint=False, related_name='sales')
+    event = models.ForeignKey(Event, on_delete=models.DO_NOTHING, db_constraint=False, related_name='sales')
+    buyer = models.ForeignKey(User, on_delete=models.PROTECT, related_name='purchases')
+    seller = models.ForeignKey(User, on_delete=models.PROTECT, related_name='sales')
+
+    quantity = models.PositiveIntegerField(validators=[MinValueValidator(1), MaxValueValidator(10)])
+    unit_price = models.DecimalField(max_digits=10, decimal_places=2)
+    total_price = models.DecimalField(max_digits=12, decimal_places=2)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'sales'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['event', 'created_at']),
+            models.Index(fields=['buyer', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"Sale: {self.quantity} x {self.ticket_id} @ ${self.unit_price}"
+
+
+class OutboxMessage(models.Model):
+    """A marketplace change recorded in the same transaction as the change itself."""
+
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('dispatched', 'Dispatched'),
+        ('failed', 'Failed'),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    topic = models.CharField(max_length=64)
+    # Messages are delivered in id order per event; no DB constraint so they
+    # outlive archived or deleted events. Null for messages about no single
+    # event (CDN purges), which are delivered in no particular order
+    event = models.ForeignKey(
+        Event, on_delete=models.DO_NOTHING, db_constraint=False, null=True, blank=True, related_name='+'
+    )
+    payload = models.JSONField(encoder=DjangoJSONEncoder, default=dict)
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    dispatched_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'outbox'
+        ordering = ['id']
+        indexes = [
+            # Dispatcher scan and its per-event ordering check only touch pending rows
+            models.Index(fields=['id'], condition=models.Q(status='pending'), name='outbox_pending_idx'),
+            models.Index(fields=['event', 'id'], condition=models.Q(status='pending'), name='outbox_pending_event_idx'),
+            models.Index(fields=['status', 'dispatched_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.topic} #{self.id} ({self.status})"
+
+
+class EventViewers(models.Model):
+    """Unique viewers of an event, as a HyperLogLog sketch (see products.viewers)."""
+
+    event = models.OneToOneField(Event, on_delete=models.CASCADE, primary_key=True, related_name='viewers')
+    sketch = models.BinaryField()
+    # sketch.count() as of the last merge, so readers need not decode it
+    unique_viewers = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'event_viewers'
+
+    def __str__(self):
+        return f"{self.event_id}: ~{self.unique_viewers} viewers"
+
+
+class SearchTrendWindow(models.Model):
+    """Search terms counted in one time window, merged from every worker (see products.searches)."""
+
+    window_start = models.DateTimeField(unique=True)
+    # CountMinSketch of normalized search terms
+    sketch = models.BinaryField()
+    # The window's most frequent terms, the candidates for trending
+    top_terms = models.JSONField(default=list)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'search_trends'
+        ordering = ['-window_start']
+
+    def __str__(self):
+        return f"Searches from {self.window_start:%Y-%m-%d %H:%M}"
+
+
+class MarketStat(models.Model):
+    """One row of the market stats rollup: KPIs overall, for a category or for a city."""
+
+    DIMENSION_CHOICES = [
+        ('total', 'Total'),
+        ('category', 'Category'),
+        ('city', 'City'),
+    ]
+
+    dimension = models.CharField(max_length=20, choices=DIMENSION_CHOICES)
+    # Category or city; empty for the total row
+    key = models.CharField(max_length=100, blank=True)
+    # Position within the dimension, by upcoming events
+    rank = models.PositiveIntegerField()
+
+    upcoming_events = models.PositiveIntegerField(default=0)
+    available_tickets = models.PositiveIntegerField(default=0)
+    # Sum of available listing prices, so averages can be taken across rows
+    listing_price_sum = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+
+    refreshed_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'market_stats'
+        ordering = ['dimension', 'rank']
+        constraints = [
+            models.UniqueConstraint(fields=['dimension', 'key'], name='market_stats_dimension_key'),
+        ]
+        indexes = [
+            models.Index(fields=['dimension', 'rank']),
+        ]
+
+    def __str__(self):
+        return f"{self.dimension} {self.key}: {self.upcoming_events} events, {self.available_tickets} tickets"
+
+    @property
+    def average_ticket_price(self):
+        if not self.available_tickets:
+            return 0
+        return round(float(self.listing_price_sum) / self.available_tickets, 2)
+
+
+class ArchivedEvent(models.Model):
+    """Cold-storage copy of a finished event, moved out of the live events table."""
+
+    id = models.UUIDField(primary_key=True, editable=False)
+    name = models.CharField(max_length=200)
+    description = models.TextField()
+    category = models.CharField(max_length=20, choices=Event.CATEGORY_CHOICES)
+    status = models.CharField(max_length=20, choices=Event.STATUS_CHOICES)
+
+    venue_name = models.CharField(max_length=200)
+    venue_address = models.TextField()
+    city = models.CharField(max_length=100)
+    state = models.CharField(max_length=50)
+    country = models.CharField(max_length=50)
+
+    event_date = models.DateTimeField()
+    doors_open = models.DateTimeField(null=True, blank=True)
+    event_end = models.DateTimeField(null=True, blank=True)
+
+    image_url = models.URLField(blank=True)
+    artist_lineup = models.JSONField(default=list, blank=True)
+
+    view_count = models.PositiveIntegerField(default=0)
+    search_count = models.PositiveIntegerField(default=0)
+    ticket_sales_count = models.PositiveIntegerField(default=0)
+
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='+')
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'archived_events'
+        ordering = ['-event_date']
+
+    def __str__(self):
+        return f"{self.name} - {self.event_date.strftime('%Y-%m-%d')} (archived)"
+
+
+class ArchivedTicket(models.Model):
+    """Cold-storage copy of a ticket of an archived event, with its listing flattened in."""
+
+    id = models.UUIDField(primary_key=True, editable=False)
+    event = models.ForeignKey(ArchivedEvent, on_delete=models.CASCADE, related_name='tickets')
+    seller = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_tickets')
+
+    section = models.CharField(max_length=100, blank=True)
+    row = models.CharField(max_length=20, blank=True)
+    seat_number = models.CharField(max_length=20, blank=True)
+    quantity = models.PositiveIntegerField()
+
+    original_price = models.DecimalField(max_digits=10, decimal_places=2)
+    listing_price = models.DecimalField(max_digits=10, decimal_places=2)
+
+    condition = models.CharField(max_length=20, choices=Ticket.CONDITION_CHOICES)
+    status = models.CharField(max_length=20, choices=Ticket.STATUS_CHOICES)
+    notes = models.TextField(blank=True)
+    transfer_method = models.CharField(max_length=200, blank=True)
+
+    listed_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    expires_at = models.DateTimeField(null=True, blank=True)
+
+    # TicketListing fields, null when the ticket had no listing
+    listing_id = models.UUIDField(null=True, blank=True)
+    listing_status = models.CharField(max_length=20, choices=TicketListing.STATUS_CHOICES, blank=True)
+    listing_views = models.PositiveIntegerField(default=0)
+    listing_saves = models.PositiveIntegerField(default=0)
+    platform_fee_percentage = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
+    payment_processing_fee = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
+
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'archived_tickets'
+        ordering = ['-listed_at']
+        indexes = [
+            models.Index(fields=['seller', 'listed_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.event.name} - {self.section} - ${self.listing_price} (archived)"
@@ -0,0 +1,219 @@
+"""
+Transactional outbox for marketplace events.
+
+Write paths call emit() inside the transaction that changes a Ticket or
+Event, so a message exists if and only if the change committed. The
+dispatcher (dispatch_outbox) drains pending messages in id order. Each
+batch is claimed with SELECT ... FOR UPDATE SKIP LOCKED, so several
+dispatchers can run side by side. Messages go to the handlers registered
+for their topic and, when OUTBOX_WEBHOOK_URL is set, are POSTed to that
+webhook as one JSON batch; topics registered as private (internal work such
+as CDN purges) only go to their handlers.
+
+Delivery is at-least-once. A message is marked dispatched in the same
+transaction that claimed it, after its handlers succeed. A crash in
+between means it is delivered again, so consumers should deduplicate on
+the message id. Messages of one event are delivered in order:
+
+- A dispatcher skips events whose earlier messages another dispatcher holds.
+- After a failure, the rest of that event's batch is left for a retry.
+"""
+import json
+import logging
+import urllib.request
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+_handlers = defaultdict(list)
+
+# Topics kept off the webhook
+_private_topics = set()
+
+
+def register(*topics, private=False):
+    """
+    Decorator registering an in-process handler for ``topics`` ('*' for all).
+
+    Handlers are called with the OutboxMessage inside a savepoint; raising
+    rolls back their writes and schedules the message for redelivery.
+    Messages of ``private`` topics are not sent to the webhook.
+    """
+    def decorator(func):
+        for topic in topics:
+            _handlers[topic].append(func)
+            if private:
+                _private_topics.add(topic)
+        return func
+    return decorator
+
+
+def unregister(func):
+    for handlers in _handlers.values():
+        if func in handlers:
+            handlers.remove(func)
+
+
+def handlers_for(topic):
+    return _handlers[topic] + _handlers['*']
+
+
+def emit(topic, event_id, **payload):
+    """Record a message; call inside the transaction making the change."""
+    return OutboxMessage.objects.create(topic=topic, event_id=event_id, payload=payload)
+
+
+def emit_many(messages):
+    """Record several ``(topic, event_id, payload)`` messages with one INSERT."""
+    return OutboxMessage.objects.bulk_create([
+        OutboxMessage(topic=topic, event_id=event_id, payload=payload)
+        for topic, event_id, payload in messages
+    ])
+
+
+def message_data(message):
+    return {
+        'id': message.id,
+        'topic': message.topic,
+        'event_id': message.event_id,
+        'payload': message.payload,
+        'created_at': message.created_at,
+    }
+
+
+def post_to_webhook(messages):
+    """POST a batch of messages to OUTBOX_WEBHOOK_URL; raises on failure."""
+    body = json.dumps({'messages': [message_data(m) for m in messages]}, cls=DjangoJSONEncoder)
+    request = urllib.request.Request(
+        settings.OUTBOX_WEBHOOK_URL,
+        data=body.encode(),
+        headers={'Content-Type': 'application/json'},
+        method='POST',
+    )
+    with urllib.request.urlopen(request, timeout=settings.OUTBOX_WEBHOOK_TIMEOUT) as response:
+        if response.status >= 300:
+            raise RuntimeError(f'Webhook returned {response.status}')
+
+
+def _record_failure(message, error):
+    message.attempts += 1
+    message.last_error = repr(error)
+    if message.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+        message.status = 'failed'
+        logger.error(f'Outbox message {message.id} ({message.topic}) failed {message.attempts} times: {error!r}')
+
+
+def _dispatch_batch(batch_size, after_id=0):
+    """
+    Claim and deliver up to ``batch_size`` pending messages with an id above
+    ``after_id``. Returns the number delivered and the ids claimed.
+    """
+    with transaction.atomic():
+        batch = list(
+            OutboxMessage.objects.select_for_update(skip_locked=True)
+            .filter(status='pending', id__gt=after_id)
+            .order_by('id')[:batch_size]
+        )
+        if not batch:
+            return 0, []
+
+        # Pending messages below our highest id that we did not get are
+        # locked by another dispatcher; leave their events to it
+        claimed_ids = [message.id for message in batch]
+        blocked = set(
+            OutboxMessage.objects.filter(
+                status='pending',
+                event_id__in={message.event_id for message in batch},
+                id__lt=claimed_ids[-1],
+            ).exclude(id__in=claimed_ids).values_list('event_id', flat=True)
+        )
+        batch = [message for message in batch if message.event_id not in blocked]
+
+        public = [message for message in batch if message.topic not in _private_topics]
+        if settings.OUTBOX_WEBHOOK_URL and public:
+            try:
+                post_to_webhook(public)
+            except Exception as e:
+                logger.warning(f'Outbox webhook delivery failed: {e!r}')
+                for message in public:
+                    _record_failure(message, e)
+                    message.save(update_fields=['status', 'attempts', 'last_error'])
+                # Private messages never depended on the webhook
+                batch = [message for message in batch if message.topic in _private_topics]
+
+        failed_events = set()
+        delivered = []
+        for message in batch:
+            if message.event_id in failed_events:
+                continue
+            handlers = handlers_for(message.topic)
+            try:
+                if handlers:
+                    with transaction.atomic():
+                        for handler in handlers:
+                            handler(message)
+            except Exception as e:
+                logger.exception(f'Outbox handler failed for message {message.id} ({message.topic})')
+                _record_failure(message, e)
+                message.save(update_fields=['status', 'attempts', 'last_error'])
+                if message.event_id is not None:
+                    failed_events.add(message.event_id)
+                continue
+            delivered.append(message.id)
+
+        # One UPDATE for the whole batch; failures above are rare and saved singly
+        OutboxMessage.objects.filter(id__in=delivered).update(
+            status='dispatched', dispatched_at=timezone.now()
+        )
+    return len(delivered), claimed_ids
+
+
+def dispatch_batch(batch_size=500):
+    """
+    Claim and deliver up to ``batch_size`` pending messages.
+
+    Returns ``(delivered, claimed)``: messages delivered, and messages
+    claimed including those that failed or were held back behind another
+    dispatcher's messages of the same event.
+    """
+    delivered, claimed_ids = _dispatch_batch(batch_size)
+    return delivered, len(claimed_ids)
+
+
+def dispatch_pending(batch_size=500):
+    """
+    Deliver batches until a batch claims nothing. Each message is claimed at
+    most once per call, so failing messages are retried on the next call
+    rather than spending their attempts here. Returns ``(delivered, claimed)``.
+    """
+    total_delivered = total_claimed = 0
+    after_id = 0
+    while True:
+        delivered, claimed_ids = _dispatch_batch(batch_size, after_id)
+        if not claimed_ids:
+            return total_delivered, total_claimed
+        total_delivered += delivered
+        total_claimed += len(claimed_ids)
+        after_id = claimed_ids[-1]
+
+
+def purge_dispatched(older_than_days=7, batch_size=5000):
+    """Delete messages dispatched more than ``older_than_days`` ago. Returns the number deleted."""
+    cutoff = timezone.now() - timedelta(days=older_than_days)
+    total = 0
+    while True:
+        ids = list(
+            OutboxMessage.objects.filter(status='dispatched', dispatched_at__lt=cutoff)
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            return total
+        total += OutboxMessage.objects.filter(id__in=ids).delete()[0]
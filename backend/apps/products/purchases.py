@@ -0,0 +1,84 @@
+"""
+Purchase path that stays correct under flash-sale contention.
+
+Inventory is taken with one guarded UPDATE (quantity >= requested,
+decremented with F()), so concurrent buyers can never oversell a listing
+and the only lock taken inside the transaction is the ticket row's.
+"""
+from django.db import transaction
+from django.db.models import Case, F, Q, Value, When
+from django.utils import timezone
+
+from .cache import bump_event_versions, bump_seller_versions
+from .models import Event, Sale, Ticket, TicketListing
+from .outbox import emit
+
+
+class PurchaseError(Exception):
+    """Raised when a purchase cannot be completed."""
+
+
+def purchase_ticket(ticket_id, buyer, quantity=1):
+    """
+    Buy ``quantity`` units of a ticket listing for ``buyer``.
+
+    The listing must be available, held by ``buyer``, or held by someone
+    else past ``held_until``, as reservations treat it. When the last unit
+    is bought the ticket and its listing are marked sold; otherwise any hold
+    is released. Returns the created Sale or raises PurchaseError.
+    """
+    if quantity < 1:
+        raise PurchaseError('Quantity must be at least 1.')
+
+    now = timezone.now()
+    purchasable = (
+        (
+            Q(status='available')
+            | Q(status='pending', held_by=buyer)
+            | Q(status='pending', held_until__lte=now)
+        )
+        & (Q(expires_at__isnull=True) | Q(expires_at__gt=now))
+    )
+
+    with transaction.atomic():
+        # Status is computed from the pre-update quantity in the same statement
+        updated = Ticket.objects.filter(
+            purchasable, id=ticket_id, quantity__gte=quantity
+        ).exclude(seller=buyer).update(
+            quantity=F('quantity') - quantity,
+            status=Case(When(quantity=quantity, then=Value('sold')), default=Value('available')),
+            held_by=None,
+            held_until=None,
+            updated_at=now,
+        )
+        if not updated:
+            raise PurchaseError('Not enough tickets available.')
+
+        ticket = Ticket.objects.only(
+            'event_id', 'seller_id', 'listing_price', 'quantity'
+        ).get(id=ticket_id)
+        sale = Sale.objects.create(
+            ticket_id=ticket_id,
+            event_id=ticket.event_id,
+            buyer=buyer,
+            seller_id=ticket.seller_id,
+            quantity=quantity,
+            unit_price=ticket.listing_price,
+            total_price=ticket.listing_price * quantity,
+        )
+        if ticket.quantity == 0:
+            TicketListing.objects.filter(ticket_id=ticket_id).update(status='sold', updated_at=now)
+        emit(
+            'ticket.sold', ticket.event_id,
+            ticket_id=ticket_id, sale_id=sale.id, quantity=quantity,
+            unit_price=ticket.listing_price, remaining=ticket.quantity,
+        )
+
+    # Kept out of the transaction: the event row is shared by every listing
+    # of a hot event and must not be locked for the whole purchase
+    Event.objects.filter(id=ticket.event_id).update(
+        ticket_sales_count=F('ticket_sales_count') + quantity
+    )
+    bump_event_versions([ticket.event_id])
+    bump_seller_versions([ticket.seller_id])
+    return sale
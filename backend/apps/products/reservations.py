@@ -0,0 +1,95 @@
+"""
+Time-limited checkout holds on tickets.
+
+A hold moves a ticket from 'available' to 'pending' with a single
+conditional UPDATE, so however many buyers race for the same listing the
+database lets exactly one of them win, without explicit locks. Holds that
+run past held_until can be taken over straight away and are released in
+bulk by release_expired_holds().
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from .cache import bump_event_versions, bump_seller_versions
+from .models import Ticket
+
+logger = logging.getLogger(__name__)
+
+
+def _invalidate(ticket_id):
+    row = Ticket.objects.filter(id=ticket_id).values_list('event_id', 'seller_id').first()
+    if row is not None:
+        bump_event_versions([row[0]])
+        bump_seller_versions([row[1]])
+
+
+def reserve_ticket(ticket_id, user, hold_seconds=None):
+    """
+    Hold a ticket for ``user`` for ``hold_seconds``.
+
+    Returns the held_until timestamp, or None when the ticket is not
+    available (already held, sold, expired or listed by ``user``).
+    """
+    now = timezone.now()
+    held_until = now + timedelta(seconds=hold_seconds or settings.TICKET_HOLD_SECONDS)
+
+    claimable = (
+        (Q(status='available') | Q(status='pending', held_until__lte=now))
+        & (Q(expires_at__isnull=True) | Q(expires_at__gt=now))
+    )
+    reserved = Ticket.objects.filter(claimable, id=ticket_id).exclude(
+        seller=user
+    ).update(status='pending', held_by=user, held_until=held_until, updated_at=now)
+
+    if not reserved:
+        return None
+    _invalidate(ticket_id)
+    return held_until
+
+
+def release_ticket(ticket_id, user):
+    """Release ``user``'s hold on a ticket. Returns whether a hold was released."""
+    released = Ticket.objects.filter(
+        id=ticket_id, status='pending', held_by=user
+    ).update(status='available', held_by=None, held_until=None, updated_at=timezone.now())
+
+    if released:
+        _invalidate(ticket_id)
+    return bool(released)
+
+
+def release_expired_holds(batch_size=5000):
+    """
+    Return tickets whose hold ran out to 'available', in batches.
+
+    Returns the number of holds released.
+    """
+    total = 0
+    while True:
+        now = timezone.now()
+        rows = list(
+            Ticket.objects.filter(status='pending', held_until__lte=now)
+            .values_list('id', 'event_id', 'seller_id')[:batch_size]
+        )
+        if not rows:
+            break
+
+        released = Ticket.objects.filter(
+            id__in=[ticket_id for ticket_id, _, _ in rows],
+            status='pending',
+            held_until__lte=now,
+        ).update(status='available', held_by=None, held_until=None, updated_at=now)
+        bump_event_versions(event_id for _, event_id, _ in rows)
+        bump_seller_versions(seller_id for _, _, seller_id in rows)
+        total += released
+
+        if len(rows) < batch_size:
+            break
+
+    if total:
+        logger.info(f'Released {total} expired ticket holds')
+    return total
@@ -0,0 +1,130 @@
+"""
+Marketplace stats rollup behind the market_stats endpoint.
+
+market_stats used to count upcoming events and available tickets, average
+every listing price and group categories on each call, so its cost grew
+with the tables. refresh_market_stats() now computes those KPIs, with
+per-category and per-city breakdowns, in two GROUP BY queries and replaces
+the MarketStat rows in one transaction. The endpoint reads them back with
+one query on the (dimension, rank) index.
+
+The refresh_market_stats command (the Procfile's rollups process) runs it
+every MARKET_STATS_REFRESH_SECONDS, so the stats lag writes by about that
+long. Reads also refresh a rollup older than that, in case the command is
+not running: one reader locks the total row and refreshes while the others
+keep serving the current rows. A plain table rather than a PostgreSQL
+materialized view, so SQLite and PostgreSQL share one code path.
+"""
+import logging
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from .cdn import MARKET_STATS_KEY, purge
+from .models import Event, MarketStat, Ticket
+
+logger = logging.getLogger(__name__)
+
+
+def _new_counts():
+    return {'upcoming_events': 0, 'available_tickets': 0, 'listing_price_sum': Decimal(0)}
+
+
+def refresh_market_stats():
+    """Recompute the MarketStat rollup. Returns the new rows."""
+    counts = {dimension: defaultdict(_new_counts) for dimension, _ in MarketStat.DIMENSION_CHOICES}
+
+    def add(category, city, **values):
+        for dimension, key in (('total', ''), ('category', category), ('city', city)):
+            row = counts[dimension][key]
+            for name, value in values.items():
+                row[name] += value or 0
+
+    for group in Event.objects.filter(status='upcoming').values('category', 'city').annotate(
+        events=Count('id')
+    ).order_by():
+        add(group['category'], group['city'], upcoming_events=group['events'])
+    for group in Ticket.objects.available().values('event__category', 'event__city').annotate(
+        tickets=Count('id'), price_sum=Sum('listing_price')
+    ).order_by():
+        add(
+            group['event__category'], group['event__city'],
+            available_tickets=group['tickets'], listing_price_sum=group['price_sum'],
+        )
+    # The total row exists even when the marketplace is empty
+    counts['total'].setdefault('', _new_counts())
+
+    now = timezone.now()
+    rows = [
+        MarketStat(dimension=dimension, key=key, rank=rank, refreshed_at=now, **values)
+        for dimension, by_key in counts.items()
+        for rank, (key, values) in enumerate(
+            sorted(by_key.items(), key=lambda item: (-item[1]['upcoming_events'], item[0])), start=1
+        )
+    ]
+    with transaction.atomic():
+        MarketStat.objects.all().delete()
+        MarketStat.objects.bulk_create(rows)
+        purge([MARKET_STATS_KEY])
+    logger.info(f'Refreshed market stats: {len(rows)} rows')
+    return rows
+
+
+def _read():
+    return list(MarketStat.objects.filter(
+        Q(dimension__in=('total', 'category'))
+        | Q(dimension='city', rank__lte=settings.MARKET_STATS_TOP_CITIES)
+    ))
+
+
+def _shown(rows):
+    return [
+        row for row in rows
+        if row.dimension != 'city' or row.rank <= settings.MARKET_STATS_TOP_CITIES
+    ]
+
+
+def _refresh_if_stale(stale_before):
+    """
+    Refresh the rollup unless another process is already refreshing it or
+    did so since ``stale_before``. Returns the new rows, or None.
+    """
+    try:
+        with transaction.atomic():
+            total = MarketStat.objects.select_for_update(skip_locked=True).filter(dimension='total').first()
+            if total is None and MarketStat.objects.filter(dimension='total').exists():
+                # Locked by another refresh
+                return None
+            if total is not None and total.refreshed_at > stale_before:
+                return None
+            return refresh_market_stats()
+    except IntegrityError:
+        # Another process built the first rollup at the same time
+        return None
+
+
+def read_market_stats():
+    """
+    The rollup rows market_stats shows: the total, every category and the
+    MARKET_STATS_TOP_CITIES cities with the most upcoming events. The rollup
+    is built on first use, and refreshed when older than
+    MARKET_STATS_REFRESH_SECONDS.
+    """
+    rows = _read()
+    total = next((row for row in rows if row.dimension == 'total'), None)
+    stale_before = timezone.now() - timedelta(seconds=settings.MARKET_STATS_REFRESH_SECONDS)
+    if total is not None and total.refreshed_at > stale_before:
+        return rows
+
+    refreshed = _refresh_if_stale(stale_before)
+    if refreshed is not None:
+        return _shown(refreshed)
+    if total is None:
+        # Built by the process that won the race, which has committed
+        return _read()
+    return rows
@@ -0,0 +1,165 @@
+"""
+Trending search terms, and search counts of the events searches return.
+
+Searches on the event list are normalized (case-folded, whitespace
+collapsed) and counted per worker in a SearchCounter: a count-min sketch
+with a top-k heap of the leading terms (see products.sketches), plus how
+often each event was returned. Memory is fixed however many distinct terms
+come in.
+
+Each worker merges its counts into the shared SearchTrendWindow row of the
+current SEARCH_TRENDS_WINDOW_SECONDS window once SEARCH_FLUSH_SEARCHES
+searches are pending or SEARCH_FLUSH_SECONDS have passed, and adds the
+event counts to Event.search_count. Trending terms are those leading the
+last SEARCH_TRENDS_WINDOWS windows combined; older windows are deleted.
+"""
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Event, SearchTrendWindow
+from .sketches import CountMinSketch, TopK
+
+logger = logging.getLogger(__name__)
+
+TRENDING_CACHE_KEY = 'trending-searches'
+
+# Longer terms are cut, so one request cannot make a counter key arbitrarily large
+SEARCH_TERM_MAX_LENGTH = 100
+
+
+def normalize_search(value):
+    """The term a search is counted under, or '' if it is too short to count."""
+    term = ' '.join(value.casefold().split())[:SEARCH_TERM_MAX_LENGTH]
+    return term if len(term) >= 2 else ''
+
+
+class SearchCounter:
+    """Thread-safe per-worker counts of searches since the last merge."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._terms = TopK(settings.SEARCH_TRENDS_TOP_K)
+        self._events = Counter()
+        self._searches = 0
+        self._last_flush = time.monotonic()
+
+    def add(self, term, event_ids):
+        """Count a search. Returns True when the counts are due to be merged."""
+        with self._lock:
+            self._terms.add(term)
+            self._events.update(event_ids)
+            self._searches += 1
+            return (
+                self._searches >= settings.SEARCH_FLUSH_SEARCHES
+                or time.monotonic() - self._last_flush >= settings.SEARCH_FLUSH_SECONDS
+            )
+
+    def take(self):
+        """Reset the counts, returning the term TopK and the event Counter."""
+        with self._lock:
+            terms, events = self._terms, self._events
+            self._reset()
+            return terms, events
+
+    def __len__(self):
+        return self._searches
+
+
+search_counter = SearchCounter()
+
+
+def _window_start(now):
+    size = settings.SEARCH_TRENDS_WINDOW_SECONDS
+    return datetime.fromtimestamp(now.timestamp() // size * size, tz=dt_timezone.utc)
+
+
+def merge_searches(terms, events):
+    """Merge one worker's counts into the current window and Event.search_count."""
+    window_start = _window_start(timezone.now())
+    with transaction.atomic():
+        # Create the window first, so concurrent merges lock the same row
+        SearchTrendWindow.objects.bulk_create(
+            [SearchTrendWindow(window_start=window_start, sketch=CountMinSketch().to_bytes())],
+            ignore_conflicts=True,
+        )
+        window = SearchTrendWindow.objects.select_for_update().get(window_start=window_start)
+        sketch = CountMinSketch.from_bytes(window.sketch)
+        sketch.merge(terms.sketch)
+        leaders = TopK(settings.SEARCH_TRENDS_TOP_K, sketch)
+        for term in [*window.top_terms, *(term for term, _ in terms.items())]:
+            leaders.offer(term)
+        window.sketch = sketch.to_bytes()
+        window.top_terms = [term for term, _ in leaders.items()]
+        window.save()
+
+        # One UPDATE per distinct increment rather than per event
+        by_increment = defaultdict(list)
+        for event_id, count in events.items():
+            by_increment[count].append(event_id)
+        for count, event_ids in by_increment.items():
+            Event.objects.filter(id__in=event_ids).update(search_count=F('search_count') + count)
+
+    retention = timedelta(seconds=settings.SEARCH_TRENDS_WINDOW_SECONDS * settings.SEARCH_TRENDS_WINDOWS)
+    SearchTrendWindow.objects.filter(window_start__lte=window_start - retention).delete()
+
+
+def flush_searches():
+    """Merge this worker's counts. Failures are logged and the counts dropped."""
+    terms, events = search_counter.take()
+    if not len(terms):
+        return
+    try:
+        merge_searches(terms, events)
+    except DatabaseError as e:
+        logger.warning(f'Dropped counts of {terms.sketch.total} searches: {e!r}')
+
+
+def record_search(term, event_ids):
+    """Count a normalized search ``term`` and the events it returned."""
+    if search_counter.add(term, event_ids):
+        flush_searches()
+
+
+def trending_searches():
+    """
+    ``[{'term', 'count'}]`` for the leading terms of the last
+    SEARCH_TRENDS_WINDOWS windows, most searched first. Counts are
+    count-min estimates, which may run slightly high.
+    """
+    trending = cache.get(TRENDING_CACHE_KEY)
+    if trending is not None:
+        return trending
+
+    since = _window_start(timezone.now()) - timedelta(
+        seconds=settings.SEARCH_TRENDS_WINDOW_SECONDS * (settings.SEARCH_TRENDS_WINDOWS - 1)
+    )
+    sketch = None
+    candidates = set()
+    for stored, top_terms in SearchTrendWindow.objects.filter(
+        window_start__gte=since
+    ).values_list('sketch', 'top_terms'):
+        window = CountMinSketch.from_bytes(stored)
+        if sketch is None:
+            sketch = window
+        else:
+            sketch.merge(window)
+        candidates.update(top_terms)
+
+    trending = []
+    if sketch is not None:
+        counts = sorted(((term, sketch.estimate(term)) for term in candidates), key=lambda c: (-c[1], c[0]))
+        trending = [{'term': term, 'count': count} for term, count in counts[:settings.SEARCH_TRENDS_TOP_K]]
+    cache.set(TRENDING_CACHE_KEY, trending, timeout=settings.SEARCH_FLUSH_SECONDS)
+    return trending
@@ -1,14 +1,81 @@
+from decimal import Decimal
+
+from django.db.models import Count, Max, Min, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from rest_framework import serializers
-from .models import Event, Ticket, TicketListing
+from rest_framework.relations import PKOnlyObject, RelatedField
+from .models import ArchivedTicket, Event, Sale, Ticket, TicketListing
+
+
+def _split_names(value):
+    return [name.strip() for name in (value or '').split(',') if name.strip()]
 
 
-class EventSerializer(serializers.ModelSerializer):
+def sparse_fieldset(query_params, serializer_class):
+    """
+    Names of the fields of ``serializer_class`` selected by ``?fields=a,b``
+    and/or ``?exclude=c``, in declaration order, or None if neither is given.
+
+    Raises ValidationError for names the serializer does not have.
+    """
+    fields = _split_names(query_params.get('fields'))
+    exclude = _split_names(query_params.get('exclude'))
+    if not fields and not exclude:
+        return None
+    available = serializer_class.field_names()
+    unknown = [name for name in fields + exclude if name not in available]
+    if unknown:
+        raise serializers.ValidationError({'fields': f"Unknown field(s): {', '.join(unknown)}"})
+    return [name for name in available if (not fields or name in fields) and name not in exclude]
+
+
+class SparseFieldsMixin:
+    """
+    ModelSerializer mixin taking a ``fields`` keyword argument that limits
+    the output to those fields.
+
+    ``trim_queryset()`` restricts a queryset to the columns and joins the
+    selected fields read. SerializerMethodFields must list the columns they
+    need in ``field_columns``; if one does not, the queryset is left whole.
+    """
+
+    # SerializerMethodField name -> model field paths it reads
+    field_columns = {}
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    @classmethod
+    def field_names(cls):
+        return list(cls().fields)
+
+    @classmethod
+    def trim_queryset(cls, queryset, fields):
+        columns = []
+        for name, field in cls(fields=fields).fields.items():
+            if isinstance(field, serializers.SerializerMethodField):
+                if name not in cls.field_columns:
+                    return queryset
+                columns.extend(cls.field_columns[name])
+            else:
+                columns.append(field.source.replace('.', '__'))
+        relations = {column.rsplit('__', 1)[0] for column in columns if '__' in column}
+        return queryset.select_related(None).select_related(*relations).only('pk', *columns)
+
+
+class EventSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for Event model."""
 
     ticket_count = serializers.SerializerMethodField()
     lowest_price = serializers.SerializerMethodField()
     highest_price = serializers.SerializerMethodField()
 
+    # Ticket stats are queried through the primary key alone
+    field_columns = {'ticket_count': [], 'lowest_price': [], 'highest_price': []}
+
     class Meta:
         model = Event
         fields = [
@@ -22,27 +89,29 @@ class EventSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
 
     def get_ticket_count(self, obj):
-        return obj.tickets.filter(status='available').count()
+        return obj.tickets.available().count()
 
     def get_lowest_price(self, obj):
-        tickets = obj.tickets.filter(status='available')
+        tickets = obj.tickets.available()
         if tickets.exists():
             return tickets.order_by('listing_price').first().listing_price
         return None
 
     def get_highest_price(self, obj):
-        tickets = obj.tickets.filter(status='available')
+        tickets = obj.tickets.available()
         if tickets.exists():
             return tickets.order_by('-listing_price').first().listing_price
         return None
 
 
-class EventListSerializer(serializers.ModelSerializer):
+class EventListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Lightweight serializer for event listings."""
 
     ticket_count = serializers.SerializerMethodField()
     lowest_price = serializers.SerializerMethodField()
 
+    field_columns = {'ticket_count': [], 'lowest_price': []}
+
     class Meta:
         model = Event
         fields = [
@@ -52,16 +121,16 @@ class EventListSerializer(serializers.ModelSerializer):
         ]
 
     def get_ticket_count(self, obj):
-        return obj.tickets.filter(status='available').count()
+        return obj.tickets.available().count()
 
     def get_lowest_price(self, obj):
-        tickets = obj.tickets.filter(status='available')
+        tickets = obj.tickets.available()
         if tickets.exists():
             return tickets.order_by('listing_price').first().listing_price
         return None
 
 
-class TicketSerializer(serializers.ModelSerializer):
+class TicketSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for Ticket model."""
 
     event_name = serializers.CharField(source='event.name', read_only=True)
@@ -79,13 +148,15 @@ class TicketSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'seller', 'listed_at', 'updated_at']
 
 
-class TicketListSerializer(serializers.ModelSerializer):
+class TicketListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Lightweight serializer for ticket listings."""
 
     event_name = serializers.CharField(source='event.name', read_only=True)
     event_date = serializers.DateTimeField(source='event.event_date', read_only=True)
     markup_percentage = serializers.SerializerMethodField()
 
+    field_columns = {'markup_percentage': ['listing_price', 'original_price']}
+
     class Meta:
         model = Ticket
         fields = [
@@ -99,6 +170,19 @@ class TicketListSerializer(serializers.ModelSerializer):
         return round(obj.markup_percentage(), 1)
 
 
+class SellerListingSerializer(TicketListSerializer):
+    """Ticket listing row on the seller dashboard, with listing engagement."""
+
+    listing_status = serializers.CharField(source='listing.status', read_only=True)
+    views = serializers.IntegerField(source='listing.views', read_only=True)
+    saves = serializers.IntegerField(source='listing.saves', read_only=True)
+
+    class Meta(TicketListSerializer.Meta):
+        fields = TicketListSerializer.Meta.fields + [
+            'event', 'listed_at', 'listing_status', 'views', 'saves'
+        ]
+
+
 class TicketCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating tickets."""
 
@@ -117,7 +201,7 @@ class TicketCreateSerializer(serializers.ModelSerializer):
 
     def validate(self, data):
         # Ensure listing price is reasonable
-        if data['listing_price'] < data['original_price'] * 0.5:
+        if data['listing_price'] < data['original_price'] * Decimal('0.5'):
             raise serializers.ValidationError(
                 "Listing price cannot be less than 50% of original price."
             )
@@ -150,4 +234,230 @@ class TicketListingSerializer(serializers.ModelSerializer):
         return obj.total_fees()
 
     def get_seller_payout(self, obj):
-        return obj.seller_payout()
\ No newline at end of file
+        return obj.seller_payout()
+
+
+class ArchivedTicketSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """Serializer for a seller's tickets of archived events."""
+
+    event_name = serializers.CharField(source='event.name', read_only=True)
+    event_date = serializers.DateTimeField(source='event.event_date', read_only=True)
+
+    class Meta:
+        model = ArchivedTicket
+        fields = [
+            'id', 'event_name', 'event_date',
+            'section', 'row', 'quantity',
+            'original_price', 'listing_price',
+            'condition', 'status', 'listing_status',
+            'listing_views', 'listing_saves',
+            'listed_at', 'archived_at'
+        ]
+
+
+class SaleSerializer(serializers.ModelSerializer):
+    """Serializer for Sale model."""
+
+    class Meta:
+        model = Sale
+        fields = [
+            'id', 'ticket', 'event', 'quantity',
+            'unit_price', 'total_price', 'created_at'
+        ]
+        read_only_fields = fields
+
+
+class PurchaseSerializer(serializers.Serializer):
+    """Input for a ticket purchase."""
+
+    quantity = serializers.IntegerField(min_value=1, max_value=10, default=1)
+
+
+class EarningsSerializer(serializers.Serializer):
+    """Seller fees and payouts for a group of listings, rounded to cents."""
+
+    listings = serializers.IntegerField()
+    tickets = serializers.IntegerField()
+    gross = serializers.DecimalField(max_digits=14, decimal_places=2)
+    fees = serializers.DecimalField(max_digits=14, decimal_places=2)
+    payout = serializers.DecimalField(max_digits=14, decimal_places=2)
+
+
+class EarningsByStatusSerializer(EarningsSerializer):
+    status = serializers.CharField()
+
+
+class FastListSerializer:
+    """
+    Read-only stand-in for a list serializer on hot endpoints.
+
+    Works from ``.values()`` rows instead of model instances, with per-field
+    extractors compiled once per class: each output field is read from its
+    row key and converted with the ``to_representation`` of the matching
+    field on ``serializer_class``, so the output is identical to that
+    serializer's (related fields are given the primary key, as DRF does for
+    them). Fields computed per row (SerializerMethodFields) are given
+    in ``computed`` as functions of the row, with the row keys they read in
+    ``requires``; keys that are annotations come from ``get_annotations()``.
+
+    Views pass their queryset through ``prepare_queryset()`` before
+    pagination and then use the class like ``serializer_class(page, many=True)``.
+    Both take an optional ``fields`` list (see sparse_fieldset()); columns
+    and annotations only other fields need are then left out of the query.
+    """
+
+    serializer_class = None
+    # Output field -> values() key, where the field's source is not its name
+    sources = {}
+    # Output field -> function(row) returning the representation
+    computed = {}
+    # Computed output field -> values() keys its function reads
+    requires = {}
+
+    _extractors = None
+
+    def __init__(self, instance=None, many=True, fields=None, **kwargs):
+        self.instance = instance
+        self.fields = fields
+
+    @classmethod
+    def get_extractors(cls, fields=None):
+        if cls.__dict__.get('_extractors') is None:
+            extractors = []
+            for name, field in cls.serializer_class().fields.items():
+                if name in cls.computed:
+                    extractors.append((name, None, cls.computed[name]))
+                elif isinstance(field, RelatedField):
+                    extractors.append((
+                        name, cls.sources.get(name, name),
+                        lambda pk, field=field: field.to_representation(PKOnlyObject(pk)),
+                    ))
+                else:
+                    extractors.append((name, cls.sources.get(name, name), field.to_representation))
+            cls._extractors = extractors
+        if fields is None:
+            return cls._extractors
+        fields = set(fields)
+        return [extractor for extractor in cls._extractors if extractor[0] in fields]
+
+    @classmethod
+    def field_names(cls):
+        return [name for name, _, _ in cls.get_extractors()]
+
+    @classmethod
+    def get_annotations(cls):
+        """Expressions for the values() keys that are not model fields."""
+        return {}
+
+    @classmethod
+    def value_keys(cls, fields=None):
+        keys = []
+        for name, key, _ in cls.get_extractors(fields):
+            for needed in cls.requires.get(name, []) if key is None else [key]:
+                if needed not in keys:
+                    keys.append(needed)
+        return keys
+
+    @classmethod
+    def prepare_queryset(cls, queryset, fields=None):
+        """Restrict ``queryset`` to the columns the output needs."""
+        keys = cls.value_keys(fields)
+        annotations = {key: expression for key, expression in cls.get_annotations().items() if key in keys}
+        if annotations:
+            queryset = queryset.annotate(**annotations)
+        # values() with no keys would select every column
+        return queryset.values(*keys or ['pk'])
+
+    @property
+    def data(self):
+        extractors = self.get_extractors(self.fields)
+        data = []
+        for row in self.instance:
+            item = {}
+            for name, key, convert in extractors:
+                if key is None:
+                    item[name] = convert(row)
+                else:
+                    value = row[key]
+                    item[name] = None if value is None else convert(value)
+            data.append(item)
+        return data
+
+
+class FastEventListSerializer(FastListSerializer):
+    """EventListSerializer output, with ticket stats from one aggregate query."""
+
+    serializer_class = EventListSerializer
+    computed = {
+        'ticket_count': lambda row: row['available_ticket_count'],
+        'lowest_price': lambda row: row['available_lowest_price'],
+    }
+    requires = {
+        'ticket_count': ['available_ticket_count'],
+        'lowest_price': ['available_lowest_price'],
+    }
+
+    @classmethod
+    def get_annotations(cls):
+        # Correlated subqueries rather than a join and GROUP BY, so only the
+        # rows of the page being returned are aggregated
+        tickets = Ticket.objects.available().filter(event=OuterRef('pk')).order_by().values('event')
+        return {
+            'available_ticket_count': Coalesce(
+                Subquery(tickets.annotate(count=Count('id')).values('count')), 0
+            ),
+            'available_lowest_price': Subquery(
+                tickets.annotate(lowest=Min('listing_price')).values('lowest')
+            ),
+            'available_highest_price': Subquery(
+                tickets.annotate(highest=Max('listing_price')).values('highest')
+            ),
+        }
+
+
+class FastEventSerializer(FastEventListSerializer):
+    """EventSerializer output for many events at once, for batch lookups."""
+
+    serializer_class = EventSerializer
+    computed = {
+        **FastEventListSerializer.computed,
+        'highest_price': lambda row: row['available_highest_price'],
+    }
+    requires = {
+        **FastEventListSerializer.requires,
+        'highest_price': ['available_highest_price'],
+    }
+
+
+def _markup_percentage(row):
+    # Same arithmetic as Ticket.markup_percentage() and TicketListSerializer
+    original_price = row['original_price']
+    if original_price > 0:
+        return round(((row['listing_price'] - original_price) / original_price) * 100, 1)
+    return round(0, 1)
+
+
+class FastTicketListSerializer(FastListSerializer):
+    """TicketListSerializer output, with the event columns joined in."""
+
+    serializer_class = TicketListSerializer
+    sources = {
+        'event_name': 'event__name',
+        'event_date': 'event__event_date',
+    }
+    computed = {
+        'markup_percentage': _markup_percentage,
+    }
+    requires = {
+        'markup_percentage': ['listing_price', 'original_price'],
+    }
+
+
+class FastTicketSerializer(FastListSerializer):
+    """TicketSerializer output for many tickets at once, for batch lookups."""
+
+    serializer_class = TicketSerializer
+    sources = {
+        'event_name': 'event__name',
+        'seller_email': 'seller__email',
+    }
@@ -0,0 +1,25 @@
+"""
+Signal handlers for the products app.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import bump_event_versions, bump_seller_versions
+from .cdn import EVENTS_KEY, listing_key
+from .models import Event, Ticket
+
+
+@receiver(post_save, sender=Ticket)
+@receiver(post_delete, sender=Ticket)
+def invalidate_event_cache(sender, instance, **kwargs):
+    """Bump the event's and seller's cache versions when a ticket changes."""
+    bump_event_versions([instance.event_id], purge_keys=[listing_key(instance.pk)])
+    bump_seller_versions([instance.seller_id])
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def invalidate_event(sender, instance, **kwargs):
+    """Bump the event's cache version and purge event lists when an event changes."""
+    # Lists it joins or moves within are not tagged with its key yet
+    bump_event_versions([instance.pk], purge_keys=[EVENTS_KEY])
@@ -0,0 +1,231 @@
+"""
+Fixed-size probabilistic sketches, stored as compact binary values.
+
+HyperLogLog counts distinct items; CountMinSketch and TopK count how often
+items occur and which occur most.
+"""
+import hashlib
+import heapq
+import math
+import operator
+import struct
+import sys
+import zlib
+from array import array
+from collections import defaultdict
+
+# 2**13 registers: about 1.15% standard error, 8 KB uncompressed
+HLL_PRECISION = 13
+
+# Count-min estimates exceed true counts by at most e/width of the total,
+# except with probability exp(-depth): 0.13% and 1.8% here, in 64 KB
+CMS_WIDTH = 2048
+CMS_DEPTH = 4
+
+
+def hash64(value):
+    """Stable 64-bit hash of ``value``'s string form (unlike hash(), the same in every process)."""
+    return int.from_bytes(hashlib.blake2b(str(value).encode(), digest_size=8).digest(), 'big')
+
+
+def _sigma(x):
+    if x == 1:
+        return math.inf
+    y, z = 1, x
+    while True:
+        x *= x
+        previous = z
+        z += x * y
+        y += y
+        if z == previous:
+            return z
+
+
+def _tau(x):
+    if x == 0 or x == 1:
+        return 0
+    y, z = 1.0, 1 - x
+    while True:
+        x = math.sqrt(x)
+        previous = z
+        y *= 0.5
+        z -= (1 - x) ** 2 * y
+        if z == previous:
+            return z / 3
+
+
+class HyperLogLog:
+    """
+    Distinct-count sketch: 2**precision one-byte registers, each holding the
+    longest run of leading zeros seen among the hashes routed to it.
+
+    The relative standard error is 1.04 / sqrt(2**precision) whatever the
+    count. Sketches of the same precision merge losslessly (register-wise
+    max), so counts can be built in batches and combined. count() uses
+    Ertl's improved estimator, which needs no bias-correction tables and is
+    accurate from a handful of items up.
+    """
+
+    def __init__(self, precision=HLL_PRECISION, registers=None):
+        self.precision = precision
+        self.registers = bytearray(registers) if registers is not None else bytearray(1 << precision)
+        self._width = 64 - precision
+        self._mask = (1 << self._width) - 1
+
+    def add_hash(self, hashed):
+        """Add an item given its hash64()."""
+        index = hashed >> self._width
+        rank = self._width - (hashed & self._mask).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def add(self, value):
+        self.add_hash(hash64(value))
+
+    def merge(self, other):
+        """Fold ``other`` into this sketch."""
+        if other.precision != self.precision:
+            raise ValueError(f'Cannot merge precision {other.precision} into {self.precision}')
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def count(self):
+        """Estimated number of distinct items added."""
+        m = len(self.registers)
+        histogram = defaultdict(int)
+        for k in range(max(self.registers) + 1):
+            histogram[k] = self.registers.count(k)
+        z = m * _tau(1 - histogram[self._width + 1] / m)
+        for k in range(self._width, 0, -1):
+            z = 0.5 * (z + histogram[k])
+        z += m * _sigma(histogram[0] / m)
+        return round(m * m / (2 * math.log(2) * z))
+
+    def to_bytes(self):
+        """Precision byte followed by the zlib-compressed registers."""
+        # Level 1 is ~3x faster than the default for ~5% more bytes
+        return bytes([self.precision]) + zlib.compress(self.registers, 1)
+
+    @classmethod
+    def from_bytes(cls, data):
+        data = bytes(data)
+        return cls(precision=data[0], registers=zlib.decompress(data[1:]))
+
+
+class CountMinSketch:
+    """
+    Frequency sketch: ``depth`` rows of ``width`` counters, each item adding
+    to one counter per row. An item's estimate is its smallest counter, which
+    never undercounts. Sketches of the same shape merge by adding counters.
+    """
+
+    def __init__(self, width=CMS_WIDTH, depth=CMS_DEPTH, counts=None):
+        self.width = width
+        self.depth = depth
+        self.counts = counts if counts is not None else array('Q', bytes(8 * width * depth))
+
+    def _cells(self, item):
+        # An independent 32-bit hash per row; deriving the rows from one
+        # hash makes items that collide in one row collide in all of them
+        digest = hashlib.blake2b(str(item).encode(), digest_size=4 * self.depth).digest()
+        return [
+            row * self.width + hashed % self.width
+            for row, hashed in enumerate(struct.unpack(f'<{self.depth}I', digest))
+        ]
+
+    def add(self, item, count=1):
+        """Count ``item`` ``count`` more times. Returns its new estimate."""
+        cells = self._cells(item)
+        counts = self.counts
+        for cell in cells:
+            counts[cell] += count
+        return min(counts[cell] for cell in cells)
+
+    def estimate(self, item):
+        return min(self.counts[cell] for cell in self._cells(item))
+
+    @property
+    def total(self):
+        """Number of items counted (the sum of any one row)."""
+        return sum(self.counts[:self.width])
+
+    def merge(self, other):
+        """Fold ``other`` into this sketch."""
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError(f'Cannot merge a {other.depth}x{other.width} sketch into {self.depth}x{self.width}')
+        self.counts = array('Q', map(operator.add, self.counts, other.counts))
+
+    def to_bytes(self):
+        """Width and depth followed by the zlib-compressed little-endian counters."""
+        counts = self.counts
+        if sys.byteorder == 'big':
+            counts = array('Q', counts)
+            counts.byteswap()
+        return struct.pack('<IB', self.width, self.depth) + zlib.compress(counts.tobytes(), 1)
+
+    @classmethod
+    def from_bytes(cls, data):
+        data = bytes(data)
+        width, depth = struct.unpack_from('<IB', data)
+        counts = array('Q', zlib.decompress(data[5:]))
+        if sys.byteorder == 'big':
+            counts.byteswap()
+        return cls(width, depth, counts)
+
+
+class TopK:
+    """
+    The ``k`` most frequent items of a stream, by count-min estimate.
+
+    Only the ``k`` leading items are kept, in a min-heap, so memory does
+    not grow with the number of distinct items; an item enters once its
+    estimate passes the smallest one tracked. Updated items leave outdated
+    heap entries behind, which are skipped and periodically dropped.
+    """
+
+    def __init__(self, k, sketch=None):
+        self.k = k
+        self.sketch = sketch if sketch is not None else CountMinSketch()
+        self._estimates = {}
+        self._heap = []
+
+    def add(self, item, count=1):
+        estimate = self.sketch.add(item, count)
+        if item not in self._estimates:
+            if len(self._estimates) >= self.k:
+                smallest, evicted = self._smallest()
+                if estimate <= smallest:
+                    return
+                heapq.heappop(self._heap)
+                del self._estimates[evicted]
+        self._track(item, estimate)
+
+    def offer(self, item):
+        """Consider ``item`` with its current estimate, without counting it."""
+        if item not in self._estimates:
+            estimate = self.sketch.estimate(item)
+            if len(self._estimates) >= self.k:
+                smallest, evicted = self._smallest()
+                if estimate <= smallest:
+                    return
+                heapq.heappop(self._heap)
+                del self._estimates[evicted]
+            self._track(item, estimate)
+
+    def _track(self, item, estimate):
+        self._estimates[item] = estimate
+        heapq.heappush(self._heap, (estimate, item))
+        if len(self._heap) > 4 * self.k:
+            self._heap = [(value, key) for key, value in self._estimates.items()]
+            heapq.heapify(self._heap)
+
+    def _smallest(self):
+        while self._heap[0][0] != self._estimates.get(self._heap[0][1]):
+            heapq.heappop(self._heap)
+        return self._heap[0]
+
+    def items(self):
+        """``[(item, estimate)]``, most frequent first."""
+        return sorted(self._estimates.items(), key=lambda entry: (-entry[1], entry[0]))
+
+    def __len__(self):
+        return len(self._estimates)
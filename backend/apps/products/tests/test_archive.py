@@ -0,0 +1,109 @@
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from products.archive import archive_events
+from products.cdn import EVENTS_KEY
+from products.models import ArchivedEvent, ArchivedTicket, Event, Ticket, TicketListing
+
+from .utils import create_event, create_ticket
+
+User = get_user_model()
+
+
+class ArchiveEventsTests(TestCase):
+    """Test suite for moving finished events into the archive tables."""
+
+    def setUp(self):
+        self.seller = User.objects.create_user('seller@crowdbolt.com', 'TestPass123!', role='seller')
+
+    def test_old_completed_event_is_moved_with_tickets(self):
+        """Test the event, its tickets and listings leave the live tables."""
+        event = create_event(-60, status='completed')
+        ticket = create_ticket(event, self.seller, status='sold')
+        ticket.listing.views = 7
+        ticket.listing.save()
+
+        events, tickets = archive_events(older_than_days=30)
+
+        self.assertEqual((events, tickets), (1, 1))
+        self.assertFalse(Event.objects.exists())
+        self.assertFalse(Ticket.objects.exists())
+        self.assertFalse(TicketListing.objects.exists())
+        archived = ArchivedTicket.objects.get(id=ticket.id)
+        self.assertEqual(archived.event_id, event.id)
+        self.assertEqual(archived.listing_price, Decimal('120.00'))
+        self.assertEqual(archived.listing_views, 7)
+        self.assertEqual(archived.listing_status, 'active')
+
+    def test_recent_and_upcoming_events_stay_live(self):
+        """Test only events past the cutoff in a final status are archived."""
+        create_event(-5, status='completed')
+        create_event(-60, status='live')
+        create_event(10)
+
+        events, _ = archive_events(older_than_days=30)
+
+        self.assertEqual(events, 0)
+        self.assertEqual(Event.objects.count(), 3)
+
+    def test_multi_day_event_archived_after_it_ends(self):
+        """Test the cutoff applies to the event's end, not its start."""
+        create_event(-60, status='completed', event_end=timezone.now() - timedelta(days=5))
+        ended = create_event(-60, status='completed', event_end=timezone.now() - timedelta(days=40))
+
+        events, _ = archive_events(older_than_days=30)
+
+        self.assertEqual(events, 1)
+        self.assertEqual(ArchivedEvent.objects.get().id, ended.id)
+
+    def test_archive_invalidates_cached_responses(self):
+        """Test each batch bumps its events' and sellers' versions and purges event lists."""
+        event = create_event(-60, status='completed')
+        create_ticket(event, self.seller, status='sold')
+
+        with mock.patch('products.archive.bump_event_versions') as bump_events, \
+                mock.patch('products.archive.bump_seller_versions') as bump_sellers:
+            archive_events(older_than_days=30)
+
+        bump_events.assert_called_once_with([event.id], purge_keys=[EVENTS_KEY])
+        bump_sellers.assert_called_once_with({self.seller.id})
+
+    def test_archive_runs_in_batches(self):
+        """Test all eligible events are archived across several batches."""
+        for i in range(5):
+            create_event(-60 - i, status='completed', name=f'Past {i}')
+
+        events, _ = archive_events(older_than_days=30, batch_size=2)
+
+        self.assertEqual(events, 5)
+        self.assertEqual(ArchivedEvent.objects.count(), 5)
+
+
+class MyTicketHistoryTests(APITestCase):
+    """Test suite for the seller history read path."""
+
+    def setUp(self):
+        self.seller = User.objects.create_user('seller@crowdbolt.com', 'TestPass123!', role='seller')
+        other = User.objects.create_user('other@crowdbolt.com', 'TestPass123!', role='seller')
+        event = create_event(-60, status='completed', name='Old Rave')
+        create_ticket(event, self.seller, status='sold')
+        create_ticket(event, other, status='sold')
+        archive_events(older_than_days=30)
+        self.client.force_authenticate(self.seller)
+
+    def test_history_lists_own_archived_tickets(self):
+        """Test sellers see only their own archived tickets."""
+        response = self.client.get(reverse('products:my-ticket-history'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(response.data['results'][0]['event_name'], 'Old Rave')
+        self.assertEqual(response.data['results'][0]['status'], 'sold')
@@ -0,0 +1,81 @@
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from products.views import BATCH_MAX_IDS
+
+from .utils import create_event, create_ticket
+
+User = get_user_model()
+
+
+class BatchEndpointTests(APITestCase):
+    """Test the event and ticket multi-get endpoints."""
+
+    def setUp(self):
+        self.seller = User.objects.create_user('seller@crowdbolt.com', 'TestPass123!', role='seller')
+        self.events = [
+            create_event(10, name='Warehouse Rave', artist_lineup=['Björk'], doors_open=timezone.now()),
+            create_event(20, name='Empty Event'),
+            create_event(-5, status='completed', name='Past Event'),
+        ]
+        self.tickets = [
+            create_ticket(self.events[0], self.seller, listing_price='150.00', row='B'),
+            create_ticket(self.events[0], self.seller, listing_price='90.00', status='sold'),
+            create_ticket(self.events[0], self.seller, listing_price='80.00'),
+        ]
+
+    def batch(self, name, ids, **params):
+        return self.client.get(reverse(f'products:{name}'), {'ids': ','.join(map(str, ids)), **params})
+
+    def test_events_match_detail_endpoint_in_requested_order(self):
+        missing = uuid.uuid4()
+        ids = [self.events[2].id, missing, self.events[0].id, self.events[1].id]
+
+        with self.assertNumQueries(1):
+            response = self.batch('event-batch', ids)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['missing'], [str(missing)])
+        expected = [
+            self.client.get(reverse('products:event-detail', kwargs={'pk': pk})).json()
+            for pk in ids if pk != missing
+        ]
+        self.assertEqual(response.json()['results'], expected)
+        self.assertEqual(response.json()['results'][1]['ticket_count'], 2)
+
+    def test_tickets_match_detail_endpoint(self):
+        ids = [ticket.id for ticket in reversed(self.tickets)]
+
+        with self.assertNumQueries(1):
+            response = self.batch('ticket-batch', ids)
+
+        expected = [
+            self.client.get(reverse('products:ticket-detail', kwargs={'pk': pk})).json()
+            for pk in ids
+        ]
+        self.assertEqual(response.json(), {'results': expected, 'missing': []})
+
+    def test_sparse_fieldset_without_id(self):
+        response = self.batch('event-batch', [self.events[1].id, self.events[0].id], fields='name,lowest_price')
+
+        self.assertEqual(response.data['results'], [
+            {'name': 'Empty Event', 'lowest_price': None},
+            {'name': 'Warehouse Rave', 'lowest_price': self.tickets[2].listing_price},
+        ])
+
+    def test_duplicate_ids_returned_once(self):
+        response = self.batch('ticket-batch', [self.tickets[0].id, self.tickets[0].id])
+
+        self.assertEqual(len(response.data['results']), 1)
+
+    def test_invalid_requests(self):
+        for ids in ([], ['not-a-uuid'], [uuid.uuid4() for _ in range(BATCH_MAX_IDS + 1)]):
+            with self.subTest(count=len(ids)):
+                response = self.batch('event-batch', ids)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIn('ids', response.data)
@@ -0,0 +1,187 @@
+import json
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from products import cdn, outbox
+from products.models import OutboxMessage
+from products.waiting_room import active_event_ids
+
+from .utils import create_event, create_ticket
+
+User = get_user_model()
+
+
+class SurrogateKeyTests(SimpleTestCase):
+    """Test Surrogate-Key header assembly."""
+
+    def test_optional_keys_added_when_they_fit(self):
+        self.assertEqual(cdn.surrogate_keys(['event:1', 'event:1'], ['listing:2']), 'event:1 listing:2')
+
+    def test_optional_keys_dropped_when_too_long(self):
+        listings = [cdn.listing_key(i) for i in range(cdn.SURROGATE_KEY_MAX_BYTES)]
+
+        self.assertEqual(cdn.surrogate_keys(['event:1'], listings), 'event:1')
+
+
+class CDNHeaderTests(APITestCase):
+    """Test cache policies and surrogate keys on the public read endpoints."""
+
+    def setUp(self):
+        cache.clear()
+        self.seller = User.objects.create_user('seller@crowdbolt.com', 'TestPass123!', role='seller')
+        self.event = create_event(10, name='Warehouse Rave', trending_score=100)
+        self.ticket = create_ticket(self.event, self.seller)
+
+    def test_event_list(self):
+        response = self.client.get(reverse('products:event-list'))
+
+        self.assertEqual(response['Cache-Control'], 'public, max-age=0, s-maxage=300, stale-while-revalidate=60')
+        self.assertEqual(response['Surrogate-Key'], f'events event:{self.event.id}')
+
+    def test_sparse_list_without_ids_not_cached(self):
+        response = self.client.get(reverse('products:event-list'), {'fields': 'name'})
+
+        self.assertFalse(response.has_header('Cache-Control'))
+        self.assertFalse(response.has_header('Surrogate-Key'))
+
+    def test_trending_and_market_stats(self):
+        trending = self.client.get(reverse('products:trending-events'))
+        stats = self.client.get(reverse('products:market-stats'))
+
+        self.assertEqual(trending['Surrogate-Key'], f'events trending event:{self.event.id}')
+        self.assertIn('s-maxage=60', trending['Cache-Control'])
+        self.assertEqual(stats['Surrogate-Key'], 'market-stats')
+        self.assertIn('s-maxage=30', stats['Cache-Control'])
+
+    def test_event_tickets_and_page_tagged_with_listings(self):
+        for name in ('event-tickets', 'event-page'):
+            with self.subTest(name=name):
+                response = self.client.get(reverse(f'products:{name}', args=[self.event.id]))
+
+                self.assertEqual(response['Surrogate-Key'], f'event:{self.event.id} listing:{self.ticket.id}')
+
+    @override_settings(WAITING_ROOM_ENABLED=True, WAITING_ROOM_TRENDING_LIMIT=1)
+    def test_waiting_room_responses_are_private(self):
+        token = self.client.post(reverse('products:event-waiting-room', args=[self.event.id])).data
+
+        for name in ('event-tickets', 'event-page'):
+            with self.subTest(name=name):
+                response = self.client.get(
+                    reverse(f'products:{name}', args=[self.event.id]),
+                    HTTP_X_ADMISSION_TOKEN=token['admission_token'],
+                )
+
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response['Cache-Control'], 'private, no-store')
+                self.assertFalse(response.has_header('Surrogate-Key'))
+
+    def test_errors_not_cached(self):
+        response = self.client.get(reverse('products:event-list'), {'fields': 'nope'})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.has_header('Cache-Control'))
+
+    @override_settings(CDN_CACHE_ENABLED=False)
+    def test_disabled(self):
+        response = self.client.get(reverse('products:event-list'))
+
+        self.assertFalse(response.has_header('Cache-Control'))
+
+
+class CDNPurgeTests(APITestCase):
+    """Test surrogate-key purges fired by write paths."""
+
+    def setUp(self):
+        self.seller = User.objects.create_user('seller@crowdbolt.com', 'TestPass123!', role='seller')
+        self.event = create_event(10)
+
+    def purged_keys(self, logs):
+        return {key for line in logs.output for key in line.split('CDN purge: ')[1].split()}
+
+    def test_ticket_write_purges_event_and_listing(self):
+        with self.assertLogs('products.cdn', 'INFO') as logs, self.captureOnCommitCallbacks(execute=True):
+            ticket = create_ticket(self.event, self.seller)
+
+        self.assertEqual(self.purged_keys(logs), {f'event:{self.event.id}', f'listing:{ticket.id}'})
+
+    def test_bulk_update_purges_event(self):
+        ticket = create_ticket(self.event, self.seller)
+        self.client.force_authenticate(User.objects.create_user('buyer@crowdbolt.com', 'TestPass123!'))
+
+        with self.assertLogs('products.cdn', 'INFO') as logs, self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('products:ticket-purchase', args=[ticket.id]))
+
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertIn(f'event:{self.event.id}', self.purged_keys(logs))
+
+    def test_event_write_purges_event_lists(self):
+        with self.assertLogs('products.cdn', 'INFO') as logs, self.captureOnCommitCallbacks(execute=True):
+            self.event.name = 'Renamed'
+            self.event.save()
+
+        self.assertEqual(self.purged_keys(logs), {'events', f'event:{self.event.id}'})
+
+    @override_settings(CDN_PURGE_URL='https://cdn.example.com/purge')
+    def test_purge_endpoint(self):
+        with mock.patch('urllib.request.urlopen') as urlopen:
+            urlopen.return_value.__enter__.return_value.status = 200
+            cdn.send_purge(['event:1', 'events'])
+
+        request = urlopen.call_args.args[0]
+        self.assertEqual(request.full_url, 'https://cdn.example.com/purge')
+        self.assertEqual(json.loads(request.data), {'surrogate_keys': ['event:1', 'events']})
+
+    @override_settings(CDN_PURGE_URL='https://cdn.example.com/purge')
+    def test_purges_sent_through_outbox_and_retried(self):
+        """Test purges are recorded with the write and retried by the dispatcher until sent."""
+        self.event.name = 'Renamed'
+        self.event.save()
+        message = OutboxMessage.objects.get(topic=cdn.PURGE_TOPIC)
+        self.assertEqual(message.payload, {'keys': sorted(['events', f'event:{self.event.id}'])})
+
+        with mock.patch('urllib.request.urlopen', side_effect=OSError('refused')), \
+                self.assertLogs('products.outbox', 'ERROR'):
+            outbox.dispatch_batch()
+        message.refresh_from_db()
+        self.assertEqual((message.status, message.attempts), ('pending', 1))
+
+        with mock.patch('urllib.request.urlopen') as urlopen:
+            urlopen.return_value.__enter__.return_value.status = 200
+            outbox.dispatch_batch()
+        message.refresh_from_db()
+        self.assertEqual(message.status, 'dispatched')
+
+    @override_settings(
+        CDN_PURGE_URL='https://cdn.example.com/purge',
+        OUTBOX_WEBHOOK_URL='https://hooks.example.com/outbox',
+    )
+    def test_purges_not_sent_to_webhook(self):
+        self.event.save()
+
+        with mock.patch('products.outbox.post_to_webhook') as post, \
+                mock.patch('products.cdn.send_purge') as send_purge:
+            outbox.dispatch_batch()
+
+        self.assertFalse(post.called)
+        self.assertEqual(send_purge.call_count, 1)
+
+    @override_settings(WAITING_ROOM_ENABLED=True, WAITING_ROOM_TRENDING_LIMIT=1)
+    def test_events_entering_waiting_room_purged(self):
+        """Test public ticket responses cached before a waiting room opened are purged."""
+        cache.clear()
+        self.event.trending_score = 100
+        self.event.save()
+
+        with self.assertLogs('products.cdn', 'INFO') as logs, self.captureOnCommitCallbacks(execute=True):
+            active_event_ids()
+        cache.delete('waiting-room:active')
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            active_event_ids()
+
+        self.assertEqual(self.purged_keys(logs), {f'event:{self.event.id}'})
+        self.assertEqual(callbacks, [])
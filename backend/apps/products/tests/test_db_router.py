@@ -0,0 +1,153 @@
+from datetime import timedelta
+from unittest import mock, skipUnless
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import router
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from config.db_router import ReplicaRoutingMiddleware
+from products.models import Event
+from users.tokens import VersionedRefreshToken
+
+User = get_user_model()
+
+
+@override_settings(DATABASE_REPLICAS=['replica_1'])
+class ReplicaRouterTests(SimpleTestCase):
+    """Test suite for routing decisions of the replica router."""
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+
+    def route(self, method, write=False, path='/api/events/', **extra):
+        """Run a request through the middleware and return the read alias it used."""
+        used = {}
+
+        def view(request):
+            if write:
+                router.db_for_write(Event)
+            used['read'] = router.db_for_read(Event)
+            return HttpResponse()
+
+        request = self.factory.generic(method, path, **extra)
+        ReplicaRoutingMiddleware(view)(request)
+        return used['read']
+
+    def test_safe_requests_read_from_replica(self):
+        """Test GET requests read from a replica."""
+        self.assertEqual(self.route('GET'), 'replica_1')
+
+    def test_unsafe_requests_read_from_primary(self):
+        """Test POST requests read from the primary."""
+        self.assertEqual(self.route('POST'), 'default')
+
+    def test_reads_after_write_in_request_use_primary(self):
+        """Test a request that wrote keeps reading from the primary."""
+        self.assertEqual(self.route('GET', write=True), 'default')
+
+    def test_client_pinned_to_primary_after_write(self):
+        """Test the next safe request after a write reads from the primary."""
+        self.route('POST', write=True)
+
+        self.assertEqual(self.route('GET'), 'default')
+
+    def test_views_not_allowlisted_read_from_primary(self):
+        """Test safe requests to private views read from the primary."""
+        self.assertEqual(self.route('GET', path='/api/my-tickets/'), 'default')
+        self.assertEqual(self.route('GET', path='/api/unknown/'), 'default')
+
+    def test_reads_outside_requests_use_primary(self):
+        """Test management commands and shells read from the primary."""
+        self.assertEqual(router.db_for_read(Event), 'default')
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_no_replicas_skips_client_lookup_and_pins(self):
+        """Test single-database deployments neither decode tokens nor touch the cache."""
+        with mock.patch('config.db_router.client_id') as client, \
+                mock.patch('config.db_router.cache') as pins:
+            used = self.route('POST', write=True)
+
+        self.assertEqual(used, 'default')
+        client.assert_not_called()
+        self.assertEqual(pins.mock_calls, [])
+
+
+@override_settings(DATABASE_REPLICAS=['replica_1'])
+class ReplicaPinTests(TestCase):
+    """Test read-your-writes pins of authenticated clients."""
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.writer, self.other = (
+            User.objects.create_user(email=f'{name}@crowdbolt.com', password='TestPass123!')
+            for name in ('writer', 'other')
+        )
+
+    def route(self, user, ip, write=False):
+        used = {}
+
+        def view(request):
+            if write:
+                router.db_for_write(Event)
+            used['read'] = router.db_for_read(Event)
+            return HttpResponse()
+
+        token = VersionedRefreshToken.for_user(user).access_token
+        request = self.factory.get(
+            '/api/events/', REMOTE_ADDR=ip, HTTP_AUTHORIZATION=f'Bearer {token}'
+        )
+        ReplicaRoutingMiddleware(view)(request)
+        return used['read']
+
+    def test_pin_follows_user_not_address(self):
+        """Test a user who wrote is pinned from any address, and others behind theirs are not."""
+        self.route(self.writer, '10.0.0.1', write=True)
+
+        self.assertEqual(self.route(self.writer, '10.0.0.2'), 'default')
+        self.assertEqual(self.route(self.other, '10.0.0.1'), 'replica_1')
+
+
+@skipUnless(
+    settings.DATABASE_REPLICAS,
+    'set DATABASE_REPLICA_URLS (e.g. sqlite:///replica.sqlite3) to run'
+)
+class ReplicaRoutingIntegrationTests(APITestCase):
+    """Test read-your-writes against a real, separate replica database."""
+
+    databases = {'default', *settings.DATABASE_REPLICAS}
+
+    def setUp(self):
+        cache.clear()
+        self.event_data = {
+            'name': 'Replica Night',
+            'description': 'Routing test event',
+            'category': 'rave',
+            'venue_name': 'Warehouse',
+            'venue_address': '1 Test St',
+            'city': 'Brooklyn',
+            'state': 'NY',
+            'event_date': (timezone.now() + timedelta(days=10)).isoformat(),
+        }
+
+    def test_writer_sees_own_listing_while_others_read_replica(self):
+        """Test only the writing client is pinned to the primary."""
+        url = reverse('products:event-list')
+
+        response = self.client.post(url, self.event_data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(Event.objects.using('default').exists())
+
+        writer = self.client.get(url)
+        reader = self.client.get(url, REMOTE_ADDR='10.0.0.2')
+
+        self.assertEqual(writer.data['count'], 1)
+        self.assertEqual(reader.data['count'], 0)
@@ -0,0 +1,146 @@
+import uuid
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.db import OperationalError
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from products.cache import bump_event_versions
+from products.documents import DocumentCache, get_event_documents, local_documents
+
+from .utils import create_event, create_ticket
+
+User = get_user_model()
+
+
+class DocumentCacheTests(SimpleTestCase):
+    """Test the per-worker LRU and its metrics."""
+
+    def test_evicts_least_recently_used(self):
+        documents = DocumentCache(max_size=2)
+        documents.set('a', (1, 0, {}))
+        documents.set('b', (1, 0, {}))
+        documents.get('a')
+        documents.set('c', (1, 0, {}))
+
+        self.assertIsNotNone(documents.get('a'))
+        self.assertIsNone(documents.get('b'))
+        self.assertEqual(len(documents), 2)
+
+    def test_stats(self):
+        documents = DocumentCache(max_size=2)
+        documents.record('local', 3, 0.003)
+        documents.record('database', 1, 0.01)
+
+        stats = documents.stats()
+
+        self.assertEqual(stats['lookups'], 4)
+        self.assertEqual(stats['hit_rate'], 0.75)
+        self.assertEqual(stats['outcomes']['local'], {'count': 3, 'avg_ms': 1.0})
+        self.assertEqual(stats['outcomes']['stale'], {'count': 0, 'avg_ms': None})
+
+
+class EventDocumentTests(APITestCase):
+    """Test the two-tier serialized event cache behind the event detail and batch endpoints."""
+
+    def setUp(self):
+        cache.clear()
+        caches[settings.EVENT_DOCUMENT_CACHE].clear()
+        local_documents.clear()
+        self.seller = User.objects.create_user('seller@crowdbolt.com', 'TestPass123!', role='seller')
+        self.event = create_event(10, name='Warehouse Rave')
+        create_ticket(self.event, self.seller, listing_price='90.00')
+        self.url = reverse('products:event-detail', args=[self.event.id])
+
+    def test_local_then_shared_hits(self):
+        cold = self.client.get(self.url).json()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.url).json(), cold)
+
+        # Another worker: empty LRU, warm shared cache
+        local_documents.clear()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.url).json(), cold)
+
+        outcomes = local_documents.stats()['outcomes']
+        self.assertEqual(outcomes['shared']['count'], 1)
+        self.assertEqual(cold['name'], 'Warehouse Rave')
+        self.assertEqual(cold['lowest_price'], 90.0)
+
+    def test_writes_invalidate_documents(self):
+        self.client.get(self.url)
+
+        create_ticket(self.event, self.seller, listing_price='80.00')
+
+        document = self.client.get(self.url).json()
+        self.assertEqual(document['ticket_count'], 2)
+        self.assertEqual(document['lowest_price'], 80.0)
+
+    @override_settings(EVENT_DOCUMENT_FRESH_SECONDS=0)
+    def test_documents_expire(self):
+        self.client.get(self.url)
+
+        self.client.get(self.url)
+
+        self.assertEqual(local_documents.stats()['outcomes']['database']['count'], 2)
+
+    def test_serves_stale_when_database_fails(self):
+        cached = self.client.get(self.url).json()
+        bump_event_versions([self.event.id])
+
+        with mock.patch('products.documents.load_documents', side_effect=OperationalError('down')), \
+                self.assertLogs('products.documents', 'WARNING'):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), cached)
+        self.assertEqual(local_documents.stats()['outcomes']['stale']['count'], 1)
+
+    def test_database_failure_without_stale_document(self):
+        with mock.patch('products.documents.load_documents', side_effect=OperationalError('down')):
+            with self.assertRaises(OperationalError):
+                get_event_documents([self.event.id])
+
+    def test_deleted_event(self):
+        self.client.get(self.url)
+
+        self.event.delete()
+
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(len(local_documents), 0)
+        self.assertEqual(self.client.get(reverse('products:event-detail', args=[uuid.uuid4()])).status_code, 404)
+
+    def test_batch_uses_cache(self):
+        other = create_event(20, name='Jazz Night')
+        url = reverse('products:event-batch')
+        ids = f'{other.id},{self.event.id}'
+        self.client.get(self.url)
+
+        with self.assertNumQueries(0):
+            self.client.get(url, {'ids': str(self.event.id)})
+        first = self.client.get(url, {'ids': ids}).json()
+        with self.assertNumQueries(0):
+            second = self.client.get(url, {'ids': ids}).json()
+
+        self.assertEqual(first, second)
+        self.assertEqual([item['name'] for item in second['results']], ['Jazz Night', 'Warehouse Rave'])
+        self.assertEqual(second['results'][1], self.client.get(self.url).json())
+
+    def test_cache_stats_staff_only(self):
+        self.client.get(self.url)
+        self.client.get(self.url)
+        stats_url = reverse('products:event-cache-stats')
+
+        self.client.force_authenticate(self.seller)
+        self.assertEqual(self.client.get(stats_url).status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(User.objects.create_user('staff@crowdbolt.com', 'TestPass123!', is_staff=True))
+        stats = self.client.get(stats_url).json()
+        self.assertEqual(stats['lookups'], 2)
+        self.assertEqual(stats['hit_rate'], 0.5)
@@ -0,0 +1,109 @@
+import random
+from collections import defaultdict
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from products.models import TicketListing
+
+from .utils import create_event, create_ticket
+
+User = get_user_model()
+
+STATUSES = ['active', 'paused', 'sold', 'expired', 'cancelled']
+
+
+def create_priced_listings(seller, count, seed=0):
+    """Listings with awkward prices and fee rates, spread over every status."""
+    rng = random.Random(seed)
+    event = create_event(10)
+    for i in range(count):
+        ticket = create_ticket(
+            event, seller,
+            listing_price=f'{rng.randint(1000, 99999) / 100:.2f}',
+            original_price='100.00',
+            quantity=rng.randint(1, 10),
+        )
+        TicketListing.objects.filter(ticket=ticket).update(
+            status=STATUSES[i % len(STATUSES)],
+            platform_fee_percentage=Decimal(rng.randint(0, 1500)) / 100,
+            payment_processing_fee=Decimal(rng.randint(0, 500)) / 100,
+        )
+    return event
+
+
+class ListingEarningsQuerySetTests(TestCase):
+    """Test the database-side fee and payout expressions."""
+
+    def setUp(self):
+        self.seller = User.objects.create_user('seller@crowdbolt.com', 'TestPass123!', role='seller')
+        create_priced_listings(self.seller, 200)
+
+    def test_annotations_match_python_methods_exactly(self):
+        for listing in TicketListing.objects.with_earnings().select_related('ticket'):
+            self.assertEqual(listing.fee_amount, listing.total_fees())
+            self.assertEqual(listing.payout_amount, listing.seller_payout())
+
+    def test_status_totals_match_python_methods_exactly(self):
+        expected = defaultdict(lambda: defaultdict(Decimal))
+        for listing in TicketListing.objects.select_related('ticket'):
+            row = expected[listing.status]
+            row['listings'] += 1
+            row['tickets'] += listing.ticket.quantity
+            row['gross'] += listing.ticket.listing_price
+            row['fees'] += listing.total_fees()
+            row['payout'] += listing.seller_payout()
+
+        with self.assertNumQueries(1):
+            rows = list(TicketListing.objects.earnings_by_status())
+
+        self.assertEqual(len(rows), len(STATUSES))
+        for row in rows:
+            for field, value in expected[row['status']].items():
+                self.assertEqual(row[field], value, (row['status'], field))
+
+
+class SellerEarningsApiTests(APITestCase):
+    """Test suite for the seller earnings endpoint."""
+
+    def setUp(self):
+        self.seller = User.objects.create_user('seller@crowdbolt.com', 'TestPass123!', role='seller')
+        other = User.objects.create_user('other@crowdbolt.com', 'TestPass123!', role='seller')
+        self.event = create_event(10)
+        create_ticket(self.event, self.seller, listing_price='120.00', quantity=2)
+        create_ticket(self.event, self.seller, listing_price='80.50')
+        create_ticket(create_event(20), self.seller, listing_price='100.00')
+        create_ticket(self.event, other, listing_price='500.00')
+        self.url = reverse('products:seller-earnings')
+        self.client.force_authenticate(self.seller)
+
+    def test_totals_cover_only_own_listings(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['totals'], {
+            'listings': 3,
+            'tickets': 4,
+            'gross': '300.50',
+            # 5% of 300.50 plus 2.90 per listing is 23.725, rounded half-even
+            'fees': '23.72',
+            'payout': '276.78',
+        })
+        self.assertEqual([row['status'] for row in response.data['by_status']], ['active'])
+
+    def test_filter_by_event(self):
+        response = self.client.get(self.url, {'event': self.event.id})
+
+        self.assertEqual(response.data['totals']['listings'], 2)
+        self.assertEqual(response.data['totals']['gross'], '200.50')
+
+    def test_requires_authentication(self):
+        self.client.force_authenticate(None)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,91 @@
+import uuid
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from products.models import Sale
+
+from .utils import create_event, create_ticket
+
+User = get_user_model()
+
+
+class EventPageTests(APITestCase):
+    """Test the combined event page endpoint."""
+
+    def setUp(self):
+        cache.clear()
+        self.seller = User.objects.create_user('seller@crowdbolt.com', 'TestPass123!', role='seller')
+        self.buyer = User.objects.create_user('buyer@crowdbolt.com', 'TestPass123!')
+        self.event = create_event(10, name='Warehouse Rave', trending_score=100)
+        for price in ('150.00', '90.00', '120.00'):
+            create_ticket(self.event, self.seller, listing_price=price)
+        sold = create_ticket(self.event, self.seller, listing_price='60.00', status='sold')
+        Sale.objects.create(
+            ticket=sold, event=self.event, buyer=self.buyer, seller=self.seller,
+            quantity=1, unit_price=Decimal('60.00'), total_price=Decimal('60.00'),
+        )
+        self.url = reverse('products:event-page', args=[self.event.id])
+
+    def test_page_matches_separate_endpoints(self):
+        """Test one response carries what the detail, tickets and stats endpoints returned."""
+        detail = self.client.get(reverse('products:event-detail', args=[self.event.id])).json()
+        tickets = self.client.get(reverse('products:ticket-list'), {'event': self.event.id}).json()
+        event_tickets = self.client.get(reverse('products:event-tickets', args=[self.event.id])).json()
+
+        page = self.client.get(self.url).json()
+
+        self.assertEqual(page['event'], detail)
+        self.assertEqual(page['tickets'], {'count': 3, 'next': None, 'results': tickets['results']})
+        self.assertEqual(page['stats'], {**event_tickets['stats'], 'last_sale_price': 60.0})
+        self.assertFalse(page['admission_required'])
+
+    def test_query_count(self):
+        """Test a cold page costs three queries and a cached one none."""
+        with self.assertNumQueries(3):
+            self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+
+    def test_writes_invalidate_cached_page(self):
+        self.client.get(self.url)
+
+        create_ticket(self.event, self.seller, listing_price='80.00')
+
+        page = self.client.get(self.url).data
+        self.assertEqual(page['stats']['total_available'], 4)
+        self.assertEqual(page['tickets']['results'][0]['listing_price'], '80.00')
+
+    def test_event_update_invalidates_cached_page(self):
+        self.client.get(self.url)
+
+        self.event.name = 'Renamed Rave'
+        self.event.save()
+
+        self.assertEqual(self.client.get(self.url).data['event']['name'], 'Renamed Rave')
+
+    @override_settings(REST_FRAMEWORK={'PAGE_SIZE': 2})
+    def test_next_link_to_ticket_list(self):
+        page = self.client.get(self.url).data
+
+        self.assertEqual(len(page['tickets']['results']), 2)
+        self.assertIn(f'/api/tickets/?event={self.event.id}&page=2', page['tickets']['next'])
+
+    @override_settings(WAITING_ROOM_ENABLED=True, WAITING_ROOM_TRENDING_LIMIT=1)
+    def test_waiting_room_hides_tickets(self):
+        page = self.client.get(self.url).data
+
+        self.assertIsNone(page['tickets'])
+        self.assertTrue(page['admission_required'])
+        self.assertEqual(page['event']['name'], 'Warehouse Rave')
+
+    def test_missing_event(self):
+        response = self.client.get(reverse('products:event-page', args=[uuid.uuid4()]))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,75 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from products.cache import get_event_version
+from products.expiry import expire_tickets
+from products.models import Ticket, TicketListing
+
+from .utils import create_event, create_ticket
+
+User = get_user_model()
+
+
+class ExpireTicketsTests(TestCase):
+    """Test suite for the bulk ticket expiry sweeper."""
+
+    def setUp(self):
+        self.seller = User.objects.create_user('seller@crowdbolt.com', 'TestPass123!', role='seller')
+        self.event = create_event(10)
+
+    def test_expired_tickets_and_listings_are_flipped(self):
+        """Test only available tickets past expires_at are expired."""
+        expired = create_ticket(self.event, self.seller, expires_at=timezone.now() - timedelta(hours=1))
+        live = create_ticket(self.event, self.seller, expires_at=timezone.now() + timedelta(hours=1))
+        no_expiry = create_ticket(self.event, self.seller)
+        sold = create_ticket(self.event, self.seller, status='sold', expires_at=timezone.now() - timedelta(hours=1))
+
+        tickets, events = expire_tickets()
+
+        self.assertEqual((tickets, events), (1, 1))
+        statuses = dict(Ticket.objects.values_list('id', 'status'))
+        self.assertEqual(statuses[expired.id], 'expired')
+        self.assertEqual(statuses[live.id], 'available')
+        self.assertEqual(statuses[no_expiry.id], 'available')
+        self.assertEqual(statuses[sold.id], 'sold')
+        self.assertEqual(TicketListing.objects.get(ticket=expired).status, 'expired')
+        self.assertEqual(TicketListing.objects.get(ticket=live).status, 'active')
+
+    def test_sweeper_runs_in_batches(self):
+        """Test all expirations are processed across several small batches."""
+        for _ in range(5):
+            create_ticket(self.event, self.seller, expires_at=timezone.now() - timedelta(hours=1))
+
+        tickets, _ = expire_tickets(batch_size=2)
+
+        self.assertEqual(tickets, 5)
+        self.assertFalse(Ticket.objects.filter(status='available').exists())
+
+    def test_affected_event_cache_version_is_bumped(self):
+        """Test caches keyed on the event version are invalidated."""
+        create_ticket(self.event, self.seller, expires_at=timezone.now() - timedelta(hours=1))
+        version = get_event_version(self.event.id)
+
+        expire_tickets()
+
+        self.assertNotEqual(get_event_version(self.event.id), version)
+
+
+class ExpiredTicketVisibilityTests(APITestCase):
+    """Test expired listings are hidden even before the sweeper runs."""
+
+    def test_ticket_list_hides_tickets_past_expires_at(self):
+        seller = User.objects.create_user('seller@crowdbolt.com', 'TestPass123!', role='seller')
+        event = create_event(10)
+        create_ticket(event, seller, expires_at=timezone.now() - timedelta(minutes=1))
+        visible = create_ticket(event, seller)
+
+        response = self.client.get(reverse('products:ticket-list'))
+
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(response.data['results'][0]['id'], str(visible.id))
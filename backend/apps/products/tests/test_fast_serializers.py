@@ -0,0 +1,82 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from products.models import Event, Ticket
+from products.serializers import (
+    EventListSerializer,
+    FastEventListSerializer,
+    FastTicketListSerializer,
+    TicketListSerializer,
+)
+
+from .utils import create_event, create_ticket
+
+User = get_user_model()
+
+
+class FastSerializerTests(APITestCase):
+    """Test that the fast list serializers match the DRF serializers byte for byte."""
+
+    def setUp(self):
+        seller = User.objects.create_user('seller@crowdbolt.com', 'TestPass123!', role='seller')
+        busy = create_event(
+            10, name='Ünïcode Fest', artist_lineup=['Björk', 'Sigur Rós'],
+            image_url='https://example.com/a.jpg',
+        )
+        create_ticket(busy, seller, listing_price='120.00', section='GA', row='B', quantity=4)
+        create_ticket(busy, seller, listing_price='99.99', original_price='150.00')
+        create_ticket(busy, seller, listing_price='75.50', original_price='0.00')
+        create_ticket(busy, seller, listing_price='10.00', expires_at=timezone.now() - timedelta(hours=1))
+        create_ticket(busy, seller, listing_price='5.00', status='sold')
+        create_event(20, name='Empty Event', event_end=None)
+        create_event(30, name='Other Event', doors_open=timezone.now())
+
+    def render(self, data):
+        return JSONRenderer().render(data)
+
+    def test_event_list_output_is_identical(self):
+        queryset = Event.objects.filter(status='upcoming').order_by('event_date')
+
+        expected = self.render(EventListSerializer(queryset, many=True).data)
+        actual = self.render(
+            FastEventListSerializer(FastEventListSerializer.prepare_queryset(queryset), many=True).data
+        )
+
+        self.assertEqual(actual, expected)
+
+    def test_ticket_list_output_is_identical(self):
+        queryset = Ticket.objects.order_by('listing_price')
+
+        expected = self.render(TicketListSerializer(queryset, many=True).data)
+        actual = self.render(
+            FastTicketListSerializer(FastTicketListSerializer.prepare_queryset(queryset), many=True).data
+        )
+
+        self.assertEqual(actual, expected)
+
+    def test_only_returned_columns_are_loaded(self):
+        queryset = FastTicketListSerializer.prepare_queryset(Ticket.objects.all())
+
+        sql = str(queryset.query)
+
+        self.assertNotIn('"notes"', sql)
+        self.assertNotIn('"description"', sql)
+
+    def test_event_list_endpoint_uses_fixed_number_of_queries(self):
+        """Test ticket stats no longer cost queries per event."""
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('products:event-list'))
+
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual(response.data['results'][0]['ticket_count'], 3)
+
+    def test_ticket_list_endpoint(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('products:ticket-list'))
+
+        self.assertEqual([row['listing_price'] for row in response.data['results']], ['75.50', '99.99', '120.00'])
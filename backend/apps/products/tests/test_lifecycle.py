@@ -0,0 +1,107 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from products.lifecycle import transition_events
+from products.models import Event, Ticket, TicketListing
+from products.reservations import reserve_ticket
+from products.rollups import refresh_market_stats
+
+from .utils import create_event, create_ticket
+
+User = get_user_model()
+
+
+class TransitionEventsTests(TestCase):
+    """Test suite for scheduled event status transitions."""
+
+    def setUp(self):
+        self.seller = User.objects.create_user('seller@crowdbolt.com', 'TestPass123!', role='seller')
+
+    def test_started_event_becomes_live(self):
+        """Test an event past its start but before its end goes live."""
+        event = create_event(0, event_end=timezone.now() + timedelta(hours=2))
+        Event.objects.filter(id=event.id).update(event_date=timezone.now() - timedelta(hours=1))
+
+        started, completed = transition_events()
+
+        event.refresh_from_db()
+        self.assertEqual((started, completed), (1, 0))
+        self.assertEqual(event.status, 'live')
+
+    def test_finished_event_completes_and_expires_open_tickets(self):
+        """Test completion cascades to available tickets and active listings."""
+        event = create_event(-2)
+        available = create_ticket(event, self.seller)
+        sold = create_ticket(event, self.seller, status='sold')
+
+        started, completed = transition_events()
+
+        event.refresh_from_db()
+        self.assertEqual((started, completed), (0, 1))
+        self.assertEqual(event.status, 'completed')
+        self.assertEqual(Ticket.objects.get(id=available.id).status, 'expired')
+        self.assertEqual(Ticket.objects.get(id=sold.id).status, 'sold')
+        self.assertEqual(TicketListing.objects.get(ticket=available).status, 'expired')
+
+    def test_expired_held_ticket_loses_its_holder(self):
+        """Test a hold on a ticket expired by completion is cleared with it."""
+        event = create_event(-2)
+        held = create_ticket(event, self.seller)
+        buyer = User.objects.create_user('buyer@crowdbolt.com', 'TestPass123!')
+        self.assertIsNotNone(reserve_ticket(held.id, buyer))
+
+        transition_events()
+
+        held.refresh_from_db()
+        self.assertEqual(held.status, 'expired')
+        self.assertIsNone(held.held_by)
+        self.assertIsNone(held.held_until)
+
+    def test_future_and_cancelled_events_untouched(self):
+        """Test events that have not started, or were cancelled, keep their status."""
+        upcoming = create_event(5)
+        cancelled = create_event(-5, status='cancelled')
+
+        transition_events(batch_size=1)
+
+        self.assertEqual(Event.objects.get(id=upcoming.id).status, 'upcoming')
+        self.assertEqual(Event.objects.get(id=cancelled.id).status, 'cancelled')
+
+
+class HotQueryWorkingSetTests(APITestCase):
+    """Test the hot read paths stop scanning past events after transitions."""
+
+    def setUp(self):
+        seller = User.objects.create_user('seller@crowdbolt.com', 'TestPass123!', role='seller')
+        for i in range(8):
+            past = create_event(-30 - i, name=f'Past {i}', trending_score=1000 + i)
+            create_ticket(past, seller)
+        for i in range(2):
+            upcoming = create_event(10 + i, name=f'Upcoming {i}', trending_score=i)
+            create_ticket(upcoming, seller)
+
+    def hot_query_sizes(self):
+        return {
+            'events': self.client.get(reverse('products:event-list')).data['count'],
+            'stats_events': self.client.get(reverse('products:market-stats')).data['total_events'],
+            'stats_tickets': self.client.get(reverse('products:market-stats')).data['total_tickets'],
+            'trending': [event.name for event in Event.get_trending_events(limit=2)],
+        }
+
+    def test_working_set_shrinks_to_upcoming_events(self):
+        before = self.hot_query_sizes()
+        transition_events()
+        refresh_market_stats()
+        after = self.hot_query_sizes()
+
+        self.assertEqual(before['events'], 10)
+        self.assertEqual(after['events'], 2)
+        self.assertEqual((before['stats_events'], after['stats_events']), (10, 2))
+        self.assertEqual((before['stats_tickets'], after['stats_tickets']), (10, 2))
+        self.assertEqual(before['trending'], ['Past 7', 'Past 6'])
+        self.assertEqual(after['trending'], ['Upcoming 1', 'Upcoming 0'])
@@ -0,0 +1,134 @@
+import asyncio
+import uuid
+from decimal import Decimal
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.db import DatabaseError
+from django.test import AsyncRequestFactory, TestCase, override_settings
+
+from products.live import EventChannel, PriceHub
+from products.models import Ticket
+from products.views import event_live
+
+from .utils import create_event, create_ticket
+
+User = get_user_model()
+
+
+@override_settings(LIVE_PRICES_POLL_SECONDS=0.01)
+class PriceHubTests(TestCase):
+    """Test the per-process fan-out hub behind the live price stream."""
+
+    def setUp(self):
+        self.seller = User.objects.create_user('seller@crowdbolt.com', 'TestPass123!', role='seller')
+        self.event = create_event(10)
+        self.ticket = create_ticket(self.event, self.seller, listing_price='120.00')
+        create_ticket(self.event, self.seller, listing_price='150.00')
+        self.hub = PriceHub()
+
+    async def next_message(self, stream):
+        return await asyncio.wait_for(anext(stream), timeout=5)
+
+    async def test_snapshot_then_delta_on_ticket_change(self):
+        """Test subscribers get a full snapshot, then only the fields that changed."""
+        stream = self.hub.subscribe(self.event.id)
+
+        first = await self.next_message(stream)
+        self.ticket.listing_price = Decimal('99.00')
+        await sync_to_async(self.ticket.save)()
+        second = await self.next_message(stream)
+        await stream.aclose()
+
+        self.assertEqual(first, ('snapshot', {'best_ask': '120.00', 'count': 2, 'last_sale': None}))
+        self.assertEqual(second, ('update', {'best_ask': '99.00'}))
+
+    async def test_subscribers_share_one_channel(self):
+        """Test every subscriber of an event is served by a single watcher."""
+        streams = [self.hub.subscribe(self.event.id) for _ in range(50)]
+        for stream in streams:
+            await self.next_message(stream)
+
+        channel = self.hub.channels[self.event.id]
+        self.assertEqual(len(self.hub.channels), 1)
+        self.assertEqual(channel.subscribers, 50)
+
+        await sync_to_async(self.ticket.delete)()
+        updates = [await self.next_message(stream) for stream in streams]
+        for stream in streams:
+            await stream.aclose()
+        await asyncio.sleep(0)
+
+        self.assertEqual({kind for kind, _ in updates}, {'update'})
+        self.assertEqual(updates[0][1], {'best_ask': '150.00', 'count': 1})
+        self.assertEqual(self.hub.channels, {})
+        self.assertTrue(channel.watcher.done())
+
+    @override_settings(LIVE_PRICES_REBUILD_POLLS=2)
+    async def test_changes_without_version_bump_pushed_by_rebuild(self):
+        """Test writes that skip the cache version still reach subscribers."""
+        stream = self.hub.subscribe(self.event.id)
+        await self.next_message(stream)
+
+        await Ticket.objects.filter(id=self.ticket.id).aupdate(listing_price=Decimal('99.00'))
+        message = await self.next_message(stream)
+        await stream.aclose()
+
+        self.assertEqual(message, ('update', {'best_ask': '99.00'}))
+
+    async def test_watcher_survives_failed_poll(self):
+        """Test a poll that raises is logged and the watcher keeps polling."""
+        stream = self.hub.subscribe(self.event.id)
+        await self.next_message(stream)
+
+        with mock.patch('products.live.build_snapshot', side_effect=DatabaseError('down')), \
+                self.assertLogs('products.live', 'ERROR'):
+            await sync_to_async(self.ticket.delete)()
+            await asyncio.sleep(0.05)
+        message = await self.next_message(stream)
+        await stream.aclose()
+
+        self.assertEqual(message, ('update', {'best_ask': '150.00', 'count': 1}))
+
+    async def test_poll_drops_stale_connections(self):
+        """Test each poll closes broken or expired connections before and after querying."""
+        channel = EventChannel(self.event.id)
+
+        with mock.patch('products.live.close_old_connections') as close, \
+                mock.patch('products.live.build_snapshot', side_effect=DatabaseError('down')):
+            with self.assertRaises(DatabaseError):
+                await channel.refresh(force=True)
+
+        self.assertEqual(close.call_count, 2)
+
+    async def test_idle_subscriber_gets_heartbeat(self):
+        stream = self.hub.subscribe(self.event.id, heartbeat=0.01)
+
+        await self.next_message(stream)
+        message = await self.next_message(stream)
+        await stream.aclose()
+
+        self.assertEqual(message, ('heartbeat', None))
+
+
+class EventLiveViewTests(TestCase):
+    """Test the Server-Sent Events endpoint."""
+
+    async def test_streams_event_stream(self):
+        event = await sync_to_async(create_event)(10)
+        request = AsyncRequestFactory().get(f'/api/events/{event.id}/live/')
+
+        response = await event_live(request, event_id=event.id)
+        first = await anext(aiter(response.streaming_content))
+
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+        self.assertTrue(first.startswith(b'event: snapshot\ndata: '))
+
+    async def test_unknown_event_returns_404(self):
+        request = AsyncRequestFactory().get('/api/events/missing/live/')
+
+        response = await event_live(request, event_id=uuid.uuid4())
+
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,172 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from products import outbox
+from products.lifecycle import transition_events
+from products.models import OutboxMessage
+from products.purchases import purchase_ticket
+
+from .utils import create_event, create_ticket
+
+User = get_user_model()
+
+
+class OutboxEmitTests(APITestCase):
+    """Test that write paths record outbox messages with their changes."""
+
+    def setUp(self):
+        self.seller = User.objects.create_user('seller@crowdbolt.com', 'TestPass123!', role='seller')
+        self.event = create_event(10)
+
+    def test_listing_a_ticket_records_message(self):
+        self.client.force_authenticate(self.seller)
+
+        response = self.client.post(reverse('products:ticket-list'), {
+            'event': self.event.id,
+            'section': 'GA',
+            'quantity': 2,
+            'original_price': '100.00',
+            'listing_price': '150.00',
+        })
+
+        message = OutboxMessage.objects.get()
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(message.topic, 'ticket.listed')
+        self.assertEqual(message.event_id, self.event.id)
+        self.assertEqual(message.payload['listing_price'], '150.00')
+
+    def test_cancelling_a_ticket_records_message(self):
+        ticket = create_ticket(self.event, self.seller)
+        self.client.force_authenticate(self.seller)
+
+        self.client.patch(reverse('products:ticket-detail', args=[ticket.id]), {'status': 'cancelled'})
+
+        self.assertEqual(OutboxMessage.objects.get().topic, 'ticket.cancelled')
+
+    def test_purchase_records_sale_message(self):
+        buyer = User.objects.create_user('buyer@crowdbolt.com', 'TestPass123!')
+        ticket = create_ticket(self.event, self.seller, quantity=2)
+
+        sale = purchase_ticket(ticket.id, buyer)
+
+        message = OutboxMessage.objects.get()
+        self.assertEqual(message.topic, 'ticket.sold')
+        self.assertEqual(message.payload['sale_id'], str(sale.id))
+        self.assertEqual(message.payload['remaining'], 1)
+
+    def test_lifecycle_transition_records_status_change(self):
+        create_event(-0.1, name='Started')
+
+        transition_events()
+
+        message = OutboxMessage.objects.get()
+        self.assertEqual(message.topic, 'event.status_changed')
+        self.assertEqual(message.payload, {'status': 'live'})
+
+
+class OutboxDispatchTests(TestCase):
+    """Test the batch dispatcher."""
+
+    def setUp(self):
+        self.event = create_event(10)
+        self.other_event = create_event(10, name='Other Event')
+        self.delivered = []
+        outbox.register('*')(self.handler)
+        self.addCleanup(outbox.unregister, self.handler)
+        self.fail_topics = set()
+
+    def handler(self, message):
+        if message.topic in self.fail_topics:
+            raise RuntimeError('handler down')
+        self.delivered.append((message.event_id, message.payload['n']))
+
+    def emit(self, event, n, topic='ticket.listed'):
+        return outbox.emit(topic, event.id, n=n)
+
+    def test_delivers_in_order_and_marks_dispatched(self):
+        for n in range(5):
+            self.emit(self.event, n)
+
+        delivered = outbox.dispatch_pending(batch_size=2)
+
+        self.assertEqual(delivered, (5, 5))
+        self.assertEqual(self.delivered, [(self.event.id, n) for n in range(5)])
+        self.assertFalse(OutboxMessage.objects.filter(status='pending').exists())
+
+    def test_failure_holds_back_later_messages_of_same_event_only(self):
+        """Test a failed message blocks its event's later messages but not other events."""
+        self.emit(self.event, 0, topic='ticket.sold')
+        self.emit(self.event, 1)
+        self.emit(self.other_event, 2)
+        self.fail_topics.add('ticket.sold')
+
+        outbox.dispatch_batch()
+
+        failed = OutboxMessage.objects.get(topic='ticket.sold')
+        self.assertEqual(self.delivered, [(self.other_event.id, 2)])
+        self.assertEqual(failed.status, 'pending')
+        self.assertEqual(failed.attempts, 1)
+        self.assertIn('handler down', failed.last_error)
+
+        self.fail_topics.clear()
+        outbox.dispatch_batch()
+
+        self.assertEqual(self.delivered[1:], [(self.event.id, 0), (self.event.id, 1)])
+
+    def test_dispatch_pending_continues_past_partly_failed_batches(self):
+        """Test batches delivering fewer than batch_size do not stop the run."""
+        self.emit(self.event, 0, topic='ticket.sold')
+        for n in range(1, 4):
+            self.emit(self.other_event, n)
+        self.fail_topics.add('ticket.sold')
+
+        delivered = outbox.dispatch_pending(batch_size=2)
+
+        self.assertEqual(delivered, (3, 4))
+        self.assertEqual(self.delivered, [(self.other_event.id, n) for n in range(1, 4)])
+        self.assertEqual(OutboxMessage.objects.get(topic='ticket.sold').attempts, 1)
+
+    @override_settings(OUTBOX_MAX_ATTEMPTS=2)
+    def test_message_fails_permanently_after_max_attempts(self):
+        self.emit(self.event, 0, topic='ticket.sold')
+        self.fail_topics.add('ticket.sold')
+
+        outbox.dispatch_batch()
+        outbox.dispatch_batch()
+
+        self.assertEqual(OutboxMessage.objects.get().status, 'failed')
+
+    @override_settings(OUTBOX_WEBHOOK_URL='http://127.0.0.1:9/outbox/')
+    def test_webhook_failure_keeps_batch_pending(self):
+        self.emit(self.event, 0)
+
+        with mock.patch('products.outbox.post_to_webhook', side_effect=OSError('refused')) as post:
+            delivered = outbox.dispatch_batch()
+
+        self.assertEqual(delivered, (0, 1))
+        self.assertEqual(post.call_count, 1)
+        self.assertEqual(self.delivered, [])
+        self.assertEqual(OutboxMessage.objects.get().attempts, 1)
+
+    def test_purge_removes_old_dispatched_messages(self):
+        old = self.emit(self.event, 0)
+        recent = self.emit(self.event, 1)
+        pending = self.emit(self.event, 2)
+        OutboxMessage.objects.filter(id=old.id).update(
+            status='dispatched', dispatched_at=timezone.now() - timedelta(days=30)
+        )
+        OutboxMessage.objects.filter(id=recent.id).update(status='dispatched', dispatched_at=timezone.now())
+
+        purged = outbox.purge_dispatched(older_than_days=7)
+
+        self.assertEqual(purged, 1)
+        self.assertEqual(
+            set(OutboxMessage.objects.values_list('id', flat=True)), {recent.id, pending.id}
+        )
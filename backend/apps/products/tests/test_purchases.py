@@ -0,0 +1,139 @@
+import threading
+
+from django.contrib.auth import get_user_model
+from django.db import OperationalError, connection
+from django.test import TransactionTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from products.models import Event, Sale, Ticket
+from products.purchases import PurchaseError, purchase_ticket
+from products.reservations import reserve_ticket
+
+from .utils import create_event, create_ticket
+
+User = get_user_model()
+
+
+class PurchaseApiTests(APITestCase):
+    """Test suite for the ticket purchase endpoint."""
+
+    def setUp(self):
+        self.seller = User.objects.create_user('seller@crowdbolt.com', 'TestPass123!', role='seller')
+        self.buyer = User.objects.create_user('buyer@crowdbolt.com', 'TestPass123!')
+        self.event = create_event(10)
+        self.ticket = create_ticket(self.event, self.seller, quantity=4)
+        self.url = reverse('products:ticket-purchase', args=[self.ticket.id])
+        self.client.force_authenticate(self.buyer)
+
+    def test_partial_purchase_decrements_quantity(self):
+        """Test buying part of a listing leaves the rest available."""
+        response = self.client.post(self.url, {'quantity': 3})
+
+        self.ticket.refresh_from_db()
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['total_price'], '360.00')
+        self.assertEqual(self.ticket.quantity, 1)
+        self.assertEqual(self.ticket.status, 'available')
+        self.assertEqual(Event.objects.get(id=self.event.id).ticket_sales_count, 3)
+
+    def test_buying_last_units_marks_ticket_and_listing_sold(self):
+        """Test the listing is sold once quantity reaches zero."""
+        self.client.post(self.url, {'quantity': 4})
+
+        self.ticket.refresh_from_db()
+        self.assertEqual(self.ticket.quantity, 0)
+        self.assertEqual(self.ticket.status, 'sold')
+        self.assertEqual(self.ticket.listing.status, 'sold')
+
+    def test_cannot_buy_more_than_available(self):
+        """Test an oversized purchase is rejected without side effects."""
+        response = self.client.post(self.url, {'quantity': 5})
+
+        self.ticket.refresh_from_db()
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(self.ticket.quantity, 4)
+        self.assertFalse(Sale.objects.exists())
+
+    def test_ticket_held_by_other_buyer_cannot_be_bought(self):
+        other = User.objects.create_user('other@crowdbolt.com', 'TestPass123!')
+        reserve_ticket(self.ticket.id, other)
+
+        response = self.client.post(self.url, {'quantity': 1})
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+    def test_lapsed_hold_of_other_buyer_does_not_block_purchase(self):
+        """Test a hold past held_until no longer blocks other buyers, as for reservations."""
+        other = User.objects.create_user('other@crowdbolt.com', 'TestPass123!')
+        reserve_ticket(self.ticket.id, other, hold_seconds=-1)
+
+        response = self.client.post(self.url, {'quantity': 1})
+
+        self.ticket.refresh_from_db()
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.ticket.status, 'available')
+        self.assertIsNone(self.ticket.held_by)
+
+    def test_holder_can_buy_and_hold_is_released(self):
+        reserve_ticket(self.ticket.id, self.buyer)
+
+        response = self.client.post(self.url, {'quantity': 1})
+
+        self.ticket.refresh_from_db()
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.ticket.status, 'available')
+        self.assertIsNone(self.ticket.held_by)
+
+    def test_seller_cannot_buy_own_ticket(self):
+        with self.assertRaises(PurchaseError):
+            purchase_ticket(self.ticket.id, self.seller)
+
+
+class PurchaseContentionTests(TransactionTestCase):
+    """Test concurrent buyers never oversell a listing."""
+
+    BUYERS = 100
+
+    def test_no_oversell_under_contention(self):
+        seller = User.objects.create_user('seller@crowdbolt.com', 'TestPass123!', role='seller')
+        ticket = create_ticket(create_event(10), seller, quantity=10)
+        buyers = User.objects.bulk_create([
+            User(email=f'buyer{i}@crowdbolt.com', username=f'buyer{i}')
+            for i in range(self.BUYERS)
+        ])
+
+        barrier = threading.Barrier(self.BUYERS)
+        errors = []
+
+        def buy(buyer):
+            try:
+                barrier.wait()
+                while True:
+                    try:
+                        purchase_ticket(ticket.id, buyer)
+                    except OperationalError:
+                        # SQLite's shared-cache test database locks whole
+                        # tables; the purchase rolled back, so try again
+                        continue
+                    except PurchaseError:
+                        pass
+                    break
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=buy, args=(buyer,)) for buyer in buyers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        ticket.refresh_from_db()
+        self.assertEqual(errors, [])
+        self.assertEqual(Sale.objects.count(), 10)
+        self.assertEqual(ticket.quantity, 0)
+        self.assertEqual(ticket.status, 'sold')
+        self.assertEqual(Ticket.objects.get(id=ticket.id).listing.status, 'sold')
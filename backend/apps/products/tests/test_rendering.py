@@ -0,0 +1,126 @@
+import gzip
+import json
+import uuid
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock, skipUnless
+
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from config import compression
+from config.compression import CompressionMiddleware, accepted_encodings
+from config.renderers import FastJSONRenderer
+
+from .utils import create_event, create_ticket
+
+User = get_user_model()
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    """Test that FastJSONRenderer output matches DRF's JSONRenderer."""
+
+    def assertSameOutput(self, data, accepted_media_type=None):
+        self.assertEqual(
+            FastJSONRenderer().render(data, accepted_media_type),
+            JSONRenderer().render(data, accepted_media_type),
+        )
+
+    def test_matches_json_renderer(self):
+        self.assertSameOutput({
+            'id': uuid.uuid4(),
+            'price': Decimal('120.50'),
+            'created_at': datetime(2026, 5, 1, 12, 30, 15, 123456, tzinfo=dt_timezone.utc),
+            'local': datetime(2026, 5, 1, 12, 30, tzinfo=dt_timezone(timedelta(hours=-5))),
+            'naive': datetime(2026, 5, 1, 12, 30, 15, 500),
+            'date': date(2026, 5, 1),
+            'duration': timedelta(minutes=90),
+            'label': gettext_lazy('Available'),
+            'name': 'Ünïcode Fest',
+            'items': [1, 2.5, None, True, {'nested': ['a', 'b']}],
+            1: 'integer key',
+        })
+
+    def test_escapes_line_separators(self):
+        self.assertSameOutput({'name': 'line\u2028paragraph\u2029end'})
+        self.assertNotIn('\u2028'.encode(), FastJSONRenderer().render({'name': '\u2028'}))
+
+    def test_indented_and_empty_output(self):
+        self.assertSameOutput({'a': [1, 2]}, 'application/json; indent=4')
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+
+
+@override_settings(RESPONSE_COMPRESSION_MIN_BYTES=100)
+class CompressionMiddlewareTests(SimpleTestCase):
+    """Test suite for brotli/gzip response compression."""
+
+    body = json.dumps({'tickets': [{'section': 'Floor', 'price': '120.00'}] * 50}).encode()
+
+    def respond(self, accept_encoding=None, response=None):
+        headers = {'HTTP_ACCEPT_ENCODING': accept_encoding} if accept_encoding else {}
+        request = RequestFactory().get('/api/events/', **headers)
+        response = response or HttpResponse(self.body, content_type='application/json')
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_accepted_encodings(self):
+        self.assertEqual(accepted_encodings('gzip, deflate, br;q=0.9'), {'gzip', 'deflate', 'br'})
+        self.assertEqual(accepted_encodings('br;q=0, gzip'), {'gzip'})
+        self.assertEqual(accepted_encodings(''), set())
+
+    def test_gzip(self):
+        with mock.patch.object(compression, 'brotli', None):
+            response = self.respond('gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertEqual(int(response['Content-Length']), len(response.content))
+        self.assertEqual(gzip.decompress(response.content), self.body)
+
+    @skipUnless(compression.brotli, 'Brotli is not installed')
+    def test_brotli_preferred(self):
+        response = self.respond('gzip, deflate, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(compression.brotli.decompress(response.content), self.body)
+
+    def test_uncompressed(self):
+        response = self.respond()
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertEqual(response.content, self.body)
+
+        small = self.respond('gzip', HttpResponse(b'{"ok":true}'))
+        self.assertFalse(small.has_header('Content-Encoding'))
+
+        stream = self.respond('gzip', StreamingHttpResponse(iter([self.body])))
+        self.assertFalse(stream.has_header('Content-Encoding'))
+
+    def test_strong_etag_weakened(self):
+        response = HttpResponse(self.body)
+        response['ETag'] = '"abc"'
+        response = self.respond('gzip', response)
+        self.assertEqual(response['ETag'], 'W/"abc"')
+
+
+class CompressedEndpointTests(APITestCase):
+    """Test that API responses are rendered with orjson and compressed."""
+
+    def test_event_tickets_compressed(self):
+        seller = User.objects.create_user('seller@crowdbolt.com', 'TestPass123!', role='seller')
+        event = create_event(10)
+        for i in range(30):
+            create_ticket(event, seller, listing_price=f'{100 + i}.50')
+        url = reverse('products:event-tickets', kwargs={'event_id': event.id})
+
+        plain = self.client.get(url)
+        with mock.patch.object(compression, 'brotli', None):
+            compressed = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertFalse(plain.has_header('Content-Encoding'))
+        self.assertEqual(compressed['Content-Encoding'], 'gzip')
+        self.assertLess(len(compressed.content), len(plain.content) / 3)
+        self.assertEqual(json.loads(gzip.decompress(compressed.content)), plain.json())
+        self.assertEqual(plain.json()['tickets'][0]['listing_price'], '100.50')
@@ -0,0 +1,147 @@
+import threading
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import OperationalError, connection
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from products.models import Ticket
+from products.reservations import release_expired_holds, reserve_ticket
+
+from .utils import create_event, create_ticket
+
+User = get_user_model()
+
+
+class TicketReservationApiTests(APITestCase):
+    """Test suite for the ticket reservation endpoint."""
+
+    def setUp(self):
+        self.seller = User.objects.create_user('seller@crowdbolt.com', 'TestPass123!', role='seller')
+        self.buyer = User.objects.create_user('buyer@crowdbolt.com', 'TestPass123!')
+        self.ticket = create_ticket(create_event(10), self.seller)
+        self.url = reverse('products:ticket-reservation', args=[self.ticket.id])
+        self.client.force_authenticate(self.buyer)
+
+    def test_reserve_moves_ticket_to_pending(self):
+        """Test a hold marks the ticket pending for the buyer."""
+        response = self.client.post(self.url)
+
+        self.ticket.refresh_from_db()
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.ticket.status, 'pending')
+        self.assertEqual(self.ticket.held_by, self.buyer)
+        self.assertGreater(self.ticket.held_until, timezone.now())
+
+    def test_second_buyer_gets_conflict(self):
+        """Test a held ticket cannot be reserved by someone else."""
+        self.client.post(self.url)
+        other = User.objects.create_user('other@crowdbolt.com', 'TestPass123!')
+        self.client.force_authenticate(other)
+
+        response = self.client.post(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+    def test_seller_cannot_reserve_own_ticket(self):
+        self.client.force_authenticate(self.seller)
+
+        response = self.client.post(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+    def test_release_returns_ticket_to_available(self):
+        """Test the holder can release the hold."""
+        self.client.post(self.url)
+
+        response = self.client.delete(self.url)
+
+        self.ticket.refresh_from_db()
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.ticket.status, 'available')
+        self.assertIsNone(self.ticket.held_by)
+
+
+class ExpiredHoldTests(TestCase):
+    """Test suite for holds that ran past held_until."""
+
+    def setUp(self):
+        self.seller = User.objects.create_user('seller@crowdbolt.com', 'TestPass123!', role='seller')
+        self.buyer = User.objects.create_user('buyer@crowdbolt.com', 'TestPass123!')
+        self.ticket = create_ticket(create_event(10), self.seller)
+        reserve_ticket(self.ticket.id, self.buyer)
+        Ticket.objects.filter(id=self.ticket.id).update(held_until=timezone.now() - timedelta(seconds=1))
+
+    def test_reaper_releases_expired_holds(self):
+        released = release_expired_holds()
+
+        self.ticket.refresh_from_db()
+        self.assertEqual(released, 1)
+        self.assertEqual(self.ticket.status, 'available')
+        self.assertIsNone(self.ticket.held_until)
+
+    def test_expired_hold_can_be_taken_over_before_reaping(self):
+        other = User.objects.create_user('other@crowdbolt.com', 'TestPass123!')
+
+        self.assertIsNotNone(reserve_ticket(self.ticket.id, other))
+        self.ticket.refresh_from_db()
+        self.assertEqual(self.ticket.held_by, other)
+
+
+class ReservationContentionTests(TransactionTestCase):
+    """Test many simultaneous buyers racing for a single listing."""
+
+    BUYERS = 200
+
+    def test_exactly_one_winner_with_bounded_latency(self):
+        seller = User.objects.create_user('seller@crowdbolt.com', 'TestPass123!', role='seller')
+        ticket = create_ticket(create_event(10), seller)
+        buyers = User.objects.bulk_create([
+            User(email=f'buyer{i}@crowdbolt.com', username=f'buyer{i}')
+            for i in range(self.BUYERS)
+        ])
+
+        barrier = threading.Barrier(self.BUYERS)
+        results = [None] * self.BUYERS
+        timings = [None] * self.BUYERS
+        errors = []
+
+        def buy(index):
+            try:
+                barrier.wait()
+                start = time.perf_counter()
+                while True:
+                    try:
+                        results[index] = reserve_ticket(ticket.id, buyers[index])
+                    except OperationalError:
+                        # SQLite's shared-cache test database locks whole
+                        # tables; the reservation rolled back, so try again
+                        continue
+                    break
+                timings[index] = time.perf_counter() - start
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=buy, args=(i,)) for i in range(self.BUYERS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        winners = [buyers[i] for i, held_until in enumerate(results) if held_until]
+        timings.sort()
+        p99 = timings[int(self.BUYERS * 0.99) - 1]
+
+        ticket.refresh_from_db()
+        self.assertEqual(len(winners), 1)
+        self.assertEqual(ticket.held_by, winners[0])
+        self.assertEqual(ticket.status, 'pending')
+        self.assertLess(p99, 5.0)
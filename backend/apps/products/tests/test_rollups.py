@@ -0,0 +1,108 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import IntegrityError
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from products import rollups
+from products.models import Event, MarketStat
+from products.rollups import refresh_market_stats
+
+from .utils import create_event, create_ticket
+
+User = get_user_model()
+
+
+class MarketStatsRollupTests(APITestCase):
+    """Test the market stats rollup and the endpoint reading it."""
+
+    def setUp(self):
+        cache.clear()
+        self.seller = User.objects.create_user('seller@crowdbolt.com', 'TestPass123!', role='seller')
+        rave = create_event(10, category='concert', city='Brooklyn')
+        jazz = create_event(20, category='concert', city='Chicago')
+        game = create_event(30, category='sports', city='Brooklyn')
+        past = create_event(-5, category='theater', city='Austin', status='completed')
+        create_ticket(rave, self.seller, listing_price='100.00')
+        create_ticket(rave, self.seller, listing_price='50.00')
+        create_ticket(jazz, self.seller, listing_price='60.00', status='sold')
+        create_ticket(game, self.seller, listing_price='30.00')
+        create_ticket(past, self.seller, listing_price='20.00')
+        self.url = reverse('products:market-stats')
+
+    def test_totals_and_breakdowns(self):
+        data = self.client.get(self.url).json()
+
+        self.assertEqual(data['total_events'], 3)
+        self.assertEqual(data['total_tickets'], 4)
+        self.assertEqual(data['average_ticket_price'], 50.0)
+        self.assertEqual(data['popular_categories'], [
+            {'category': 'concert', 'count': 2},
+            {'category': 'sports', 'count': 1},
+        ])
+        self.assertEqual(data['categories'][0], {
+            'category': 'concert', 'events': 2, 'tickets': 2, 'average_ticket_price': 75.0,
+        })
+        self.assertEqual(data['categories'][2], {
+            'category': 'theater', 'events': 0, 'tickets': 1, 'average_ticket_price': 20.0,
+        })
+        self.assertEqual([(city['city'], city['events']) for city in data['top_cities']], [
+            ('Brooklyn', 2), ('Chicago', 1), ('Austin', 0),
+        ])
+
+    def test_single_query_once_refreshed(self):
+        refresh_market_stats()
+
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
+
+    def test_reflects_writes_after_refresh(self):
+        refresh_market_stats()
+        create_event(40, category='sports', city='Austin')
+
+        self.assertEqual(self.client.get(self.url).data['total_events'], 3)
+        refresh_market_stats()
+        self.assertEqual(self.client.get(self.url).data['total_events'], 4)
+
+    def test_stale_rollup_refreshed_on_read(self):
+        refresh_market_stats()
+        create_event(40, category='sports', city='Austin')
+        MarketStat.objects.update(refreshed_at=timezone.now() - timedelta(minutes=5))
+
+        self.assertEqual(self.client.get(self.url).data['total_events'], 4)
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
+
+    def test_concurrent_first_build_serves_winner(self):
+        """Test a reader losing the race to build the first rollup reads the winner's rows."""
+        refresh_market_stats()
+        MarketStat.objects.update(refreshed_at=timezone.now() - timedelta(minutes=5))
+        built_by_winner = rollups._read()
+
+        with mock.patch('products.rollups._read', side_effect=[[], built_by_winner]), \
+                mock.patch('products.rollups.refresh_market_stats', side_effect=IntegrityError('duplicate key')):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total_events'], 3)
+
+    @override_settings(MARKET_STATS_TOP_CITIES=1)
+    def test_top_cities_limit(self):
+        data = self.client.get(self.url).json()
+
+        self.assertEqual([city['city'] for city in data['top_cities']], ['Brooklyn'])
+
+    def test_empty_marketplace(self):
+        refresh_market_stats()
+        Event.objects.all().delete()
+        refresh_market_stats()
+
+        data = self.client.get(self.url).json()
+
+        self.assertEqual((data['total_events'], data['total_tickets'], data['average_ticket_price']), (0, 0, 0))
+        self.assertEqual(data['popular_categories'], [])
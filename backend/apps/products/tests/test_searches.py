@@ -0,0 +1,144 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from products.models import Event, SearchTrendWindow
+from products.searches import flush_searches, normalize_search, search_counter
+from products.sketches import CountMinSketch, TopK
+
+from .utils import create_event
+
+
+class CountMinSketchTests(SimpleTestCase):
+    """Test the count-min sketch and top-k tracking."""
+
+    def test_estimates_never_undercount(self):
+        sketch = CountMinSketch(width=64, depth=4)
+        for i in range(1000):
+            sketch.add(f'term {i % 100}', count=i % 3 + 1)
+
+        exact = Counter()
+        for i in range(1000):
+            exact[f'term {i % 100}'] += i % 3 + 1
+        for term, count in exact.items():
+            self.assertGreaterEqual(sketch.estimate(term), count)
+        self.assertEqual(sketch.total, sum(exact.values()))
+
+    def test_merge_and_round_trip(self):
+        left, right = CountMinSketch(), CountMinSketch()
+        left.add('jazz', 3)
+        right.add('jazz', 2)
+        right.add('rave')
+
+        left.merge(right)
+        restored = CountMinSketch.from_bytes(left.to_bytes())
+
+        self.assertEqual((restored.estimate('jazz'), restored.estimate('rave')), (5, 1))
+        with self.assertRaises(ValueError):
+            left.merge(CountMinSketch(width=16))
+
+    def test_top_k_bounded(self):
+        top = TopK(3)
+        for i in range(5000):
+            top.add(f'rare {i}')
+            top.add(['jazz', 'rave', 'rock'][i % 3])
+
+        self.assertEqual({term for term, _ in top.items()}, {'jazz', 'rave', 'rock'})
+        self.assertEqual(len(top), 3)
+        self.assertLessEqual(len(top._heap), 12)
+
+
+class NormalizeSearchTests(SimpleTestCase):
+    """Test search term normalization."""
+
+    def test_normalize(self):
+        self.assertEqual(normalize_search('  Daft   PUNK '), 'daft punk')
+        self.assertEqual(normalize_search('x'), '')
+        self.assertEqual(len(normalize_search('a' * 500)), 100)
+
+
+class TrendingSearchTests(APITestCase):
+    """Test search counting from the event list and the trending searches endpoint."""
+
+    def setUp(self):
+        cache.clear()
+        search_counter.take()
+        self.rave = create_event(10, name='Warehouse Rave')
+        self.jazz = create_event(20, name='Jazz Night')
+        self.url = reverse('products:trending-searches')
+
+    def search(self, term):
+        response = self.client.get(reverse('products:event-list'), {'search': term})
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_trending_terms(self):
+        for term in ['Rave', 'rave', ' RAVE ', 'jazz', 'jazz', 'opera']:
+            self.search(term)
+        flush_searches()
+
+        data = self.client.get(self.url).json()
+
+        self.assertEqual(data['trending_searches'], [
+            {'term': 'rave', 'count': 3},
+            {'term': 'jazz', 'count': 2},
+            {'term': 'opera', 'count': 1},
+        ])
+        self.assertEqual(self.client.get(self.url, {'limit': 1}).json()['count'], 1)
+
+    def test_search_count_of_returned_events(self):
+        for term in ['rave', 'rave', 'warehouse', 'jazz']:
+            self.search(term)
+        flush_searches()
+
+        self.assertEqual(Event.objects.get(id=self.rave.id).search_count, 3)
+        self.assertEqual(Event.objects.get(id=self.jazz.id).search_count, 1)
+
+    def test_workers_merge_into_window(self):
+        self.search('rave')
+        flush_searches()
+        self.search('rave')
+        flush_searches()
+
+        window = SearchTrendWindow.objects.get()
+        self.assertEqual(CountMinSketch.from_bytes(window.sketch).estimate('rave'), 2)
+        self.assertEqual(window.top_terms, ['rave'])
+
+    @override_settings(SEARCH_FLUSH_SEARCHES=2)
+    def test_flushes_when_due(self):
+        self.search('rave')
+        self.assertFalse(SearchTrendWindow.objects.exists())
+
+        self.search('jazz')
+
+        self.assertTrue(SearchTrendWindow.objects.exists())
+        self.assertEqual(len(search_counter), 0)
+
+    def test_old_windows_dropped(self):
+        self.search('rave')
+        flush_searches()
+        SearchTrendWindow.objects.update(window_start=timezone.now() - timedelta(days=2))
+
+        self.search('jazz')
+        flush_searches()
+
+        self.assertEqual(SearchTrendWindow.objects.count(), 1)
+        self.assertEqual([t['term'] for t in self.client.get(self.url).json()['trending_searches']], ['jazz'])
+
+    def test_searches_bypass_cdn(self):
+        response = self.search('rave')
+
+        self.assertEqual(response['Cache-Control'], 'private, no-store')
+        self.assertIn('s-maxage', self.client.get(reverse('products:event-list'))['Cache-Control'])
+
+    def test_sparse_search_without_ids(self):
+        self.client.get(reverse('products:event-list'), {'search': 'rave', 'fields': 'name'})
+        flush_searches()
+
+        self.assertEqual(SearchTrendWindow.objects.get().top_terms, ['rave'])
+        self.assertEqual(Event.objects.get(id=self.rave.id).search_count, 0)
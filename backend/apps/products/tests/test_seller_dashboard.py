@@ -0,0 +1,116 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from products.expiry import expire_tickets
+from products.models import Ticket, TicketListing
+from products.purchases import purchase_ticket
+from products.reservations import reserve_ticket
+
+from .utils import create_event, create_ticket
+
+User = get_user_model()
+
+
+class SellerDashboardTests(APITestCase):
+    """Test suite for the seller dashboard endpoint."""
+
+    def setUp(self):
+        cache.clear()
+        self.seller = User.objects.create_user('seller@crowdbolt.com', 'TestPass123!', role='seller')
+        self.other = User.objects.create_user('other@crowdbolt.com', 'TestPass123!', role='seller')
+        self.url = reverse('products:seller-dashboard')
+        self.client.force_authenticate(self.seller)
+
+    def create_listings(self, count, status='available', views=0, saves=0):
+        event = create_event(10)
+        for _ in range(count):
+            ticket = create_ticket(event, self.seller, status=status)
+            TicketListing.objects.filter(ticket=ticket).update(views=views, saves=saves)
+
+    def test_rows_include_event_and_engagement(self):
+        self.create_listings(1, views=12, saves=3)
+
+        row = self.client.get(self.url).data['results'][0]
+
+        self.assertEqual(row['event_name'], 'Test Event')
+        self.assertEqual(row['listing_status'], 'active')
+        self.assertEqual(row['views'], 12)
+        self.assertEqual(row['saves'], 3)
+
+    def test_summary_counts_statuses_and_engagement(self):
+        self.create_listings(3, views=10, saves=1)
+        self.create_listings(2, status='sold', views=5)
+        create_ticket(create_event(10), self.other)
+
+        summary = self.client.get(self.url).data['summary']
+
+        self.assertEqual(summary, {
+            'total_listings': 5,
+            'status_counts': {'available': 3, 'sold': 2},
+            'total_views': 40,
+            'total_saves': 3,
+        })
+
+    def test_query_count_does_not_grow_with_listings(self):
+        """Test the dashboard runs a fixed number of queries however many listings there are."""
+        self.create_listings(2)
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(self.url)
+
+        self.create_listings(30)
+        cache.clear()
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 20)
+        self.assertEqual(len(few), len(many))
+        self.assertLessEqual(len(many), 3)
+
+    def test_summary_is_cached_between_requests(self):
+        self.create_listings(1)
+        self.client.get(self.url)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url)
+
+        self.assertEqual(len(queries), 2)
+
+    def test_ticket_writes_invalidate_summary(self):
+        """Test holds, purchases and bulk expiry show up in the cached summary."""
+        buyer = User.objects.create_user('buyer@crowdbolt.com', 'TestPass123!')
+        event = create_event(10)
+        held, sold, expiring = (create_ticket(event, self.seller) for _ in range(3))
+        self.client.get(self.url)
+
+        reserve_ticket(held.id, buyer)
+        purchase_ticket(sold.id, buyer, 1)
+        Ticket.objects.filter(id=expiring.id).update(expires_at=timezone.now())
+        expire_tickets()
+
+        summary = self.client.get(self.url).data['summary']
+        self.assertEqual(summary['status_counts'], {'pending': 1, 'sold': 1, 'expired': 1})
+
+    def test_ticket_without_listing(self):
+        self.create_listings(1)
+        TicketListing.objects.all().delete()
+
+        row = self.client.get(self.url).data['results'][0]
+
+        self.assertIsNone(row['listing_status'])
+        self.assertIsNone(row['views'])
+        self.assertEqual(Ticket.objects.count(), 1)
+
+    def test_my_tickets_does_not_query_per_row(self):
+        self.create_listings(10)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('products:my-tickets'))
+
+        self.assertLessEqual(len(queries), 2)
@@ -0,0 +1,99 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from .utils import create_event, create_ticket
+
+User = get_user_model()
+
+
+class SparseFieldsetTests(APITestCase):
+    """Test ?fields= and ?exclude= on the products endpoints."""
+
+    def setUp(self):
+        cache.clear()
+        self.seller = User.objects.create_user('seller@crowdbolt.com', 'TestPass123!', role='seller')
+        self.event = create_event(10, name='Warehouse Rave')
+        create_event(20, name='Empty Event')
+        create_ticket(self.event, self.seller, listing_price='150.00')
+        create_ticket(self.event, self.seller, listing_price='90.00', original_price='60.00')
+
+    def get(self, name, params, **kwargs):
+        """GET an endpoint and return the response and the SQL of its last query."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse(f'products:{name}', kwargs=kwargs), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, queries
+
+    def test_event_list_fields(self):
+        """Test the mobile fieldset drops columns and the ticket count subquery."""
+        full, full_queries = self.get('event-list', {})
+        sparse, sparse_queries = self.get('event-list', {'fields': 'id,name,event_date,lowest_price'})
+
+        expected = [
+            {key: row[key] for key in ('id', 'name', 'event_date', 'lowest_price')}
+            for row in full.data['results']
+        ]
+        self.assertEqual(sparse.data['results'], expected)
+        self.assertEqual(sparse.json()['results'][0]['lowest_price'], 90.0)
+
+        full_sql, sparse_sql = full_queries[-1]['sql'], sparse_queries[-1]['sql']
+        self.assertIn('"venue_name"', full_sql)
+        self.assertNotIn('"venue_name"', sparse_sql)
+        self.assertIn('COUNT(', full_sql)
+        self.assertNotIn('COUNT(', sparse_sql)
+        self.assertIn('MIN(', sparse_sql)
+
+    def test_event_list_exclude(self):
+        """Test excluding the ticket stats removes both subqueries."""
+        response, queries = self.get('event-list', {'exclude': 'ticket_count,lowest_price'})
+
+        self.assertNotIn('ticket_count', response.data['results'][0])
+        self.assertIn('venue_name', response.data['results'][0])
+        self.assertNotIn('"tickets"', queries[-1]['sql'])
+
+    def test_event_detail_fields_skip_ticket_queries(self):
+        """Test the detail endpoint skips ticket stat queries for fields not asked for."""
+        _, full_queries = self.get('event-detail', {}, pk=self.event.id)
+        response, queries = self.get('event-detail', {'fields': 'id,name'}, pk=self.event.id)
+
+        self.assertEqual(response.data, {'id': str(self.event.id), 'name': 'Warehouse Rave'})
+        self.assertIn('"tickets"', full_queries[-1]['sql'])
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('"tickets"', queries[0]['sql'])
+        self.assertNotIn('"description"', queries[0]['sql'])
+
+    def test_ticket_list_fields_skip_event_join(self):
+        response, queries = self.get('ticket-list', {'fields': 'id,listing_price,markup_percentage'})
+
+        self.assertEqual(
+            [(row['listing_price'], row['markup_percentage']) for row in response.data['results']],
+            [('90.00', 50.0), ('150.00', 50.0)],
+        )
+        self.assertNotIn('JOIN', queries[-1]['sql'])
+        self.assertNotIn('"section"', queries[-1]['sql'])
+
+    def test_seller_dashboard_fields_join_only_what_is_read(self):
+        self.client.force_authenticate(self.seller)
+
+        response, queries = self.get('seller-dashboard', {'fields': 'id,views'})
+
+        self.assertEqual(set(response.data['results'][0]), {'id', 'views'})
+        listing_sql = next(q['sql'] for q in queries if '"views"' in q['sql'] and 'ORDER BY' in q['sql'])
+        self.assertIn('"ticket_listings"', listing_sql)
+        self.assertNotIn('"events"', listing_sql)
+
+    def test_trending_fields(self):
+        response, _ = self.get('trending-events', {'fields': 'name,ticket_count'})
+
+        self.assertEqual(response.data['trending_events'][0], {'name': 'Warehouse Rave', 'ticket_count': 2})
+
+    def test_unknown_field_rejected(self):
+        response = self.client.get(reverse('products:event-list'), {'fields': 'id,secret'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('secret', str(response.data['fields']))
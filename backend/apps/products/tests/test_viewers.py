@@ -0,0 +1,120 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from products.models import EventViewers
+from products.sketches import HyperLogLog
+from products.viewers import flush_viewers, merge_viewers, viewer_buffer
+
+from .utils import create_event
+
+User = get_user_model()
+
+
+class HyperLogLogTests(SimpleTestCase):
+    """Test the HyperLogLog sketch."""
+
+    def test_small_counts_exact(self):
+        sketch = HyperLogLog()
+        for i in range(50):
+            sketch.add(f'user:{i % 25}')
+
+        self.assertEqual(HyperLogLog().count(), 0)
+        self.assertEqual(sketch.count(), 25)
+
+    def test_large_count_within_error(self):
+        sketch = HyperLogLog()
+        for i in range(50000):
+            sketch.add(f'user:{i}')
+
+        self.assertAlmostEqual(sketch.count() / 50000, 1, delta=0.035)
+        self.assertLess(len(sketch.to_bytes()), 8192)
+
+    def test_merge_counts_union(self):
+        left, right, union = HyperLogLog(), HyperLogLog(), HyperLogLog()
+        for i in range(3000):
+            left.add(i)
+            union.add(i)
+        for i in range(2000, 5000):
+            right.add(i)
+            union.add(i)
+
+        left.merge(right)
+
+        self.assertEqual(left.registers, union.registers)
+        self.assertEqual(HyperLogLog.from_bytes(left.to_bytes()).count(), union.count())
+
+    def test_merge_other_precision(self):
+        with self.assertRaises(ValueError):
+            HyperLogLog().merge(HyperLogLog(precision=10))
+
+
+class EventViewersTests(APITestCase):
+    """Test unique viewer counting from the event view endpoint."""
+
+    def setUp(self):
+        viewer_buffer.take()
+        self.event = create_event(10)
+        self.view_url = reverse('products:event-view', args=[self.event.id])
+        self.stats_url = reverse('products:event-stats', args=[self.event.id])
+
+    def view_as(self, user=None, ip='10.0.0.1'):
+        self.client.force_authenticate(user)
+        response = self.client.post(self.view_url, REMOTE_ADDR=ip)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+    def test_unique_viewers_in_stats(self):
+        self.assertEqual(self.client.get(self.stats_url).data['interested_buyers'], 0)
+        users = [User.objects.create_user(f'buyer{i}@crowdbolt.com', 'TestPass123!') for i in range(3)]
+
+        for user in users + users:
+            self.view_as(user)
+        self.view_as(ip='10.0.0.1')
+        self.view_as(ip='10.0.0.1')
+        self.view_as(ip='10.0.0.2')
+        flush_viewers()
+
+        self.assertEqual(self.client.get(self.stats_url).data['interested_buyers'], 5)
+
+    def test_batches_merge(self):
+        self.view_as(ip='10.0.0.1')
+        flush_viewers()
+        self.view_as(ip='10.0.0.1')
+        self.view_as(ip='10.0.0.2')
+        flush_viewers()
+
+        self.assertEqual(EventViewers.objects.get(event=self.event).unique_viewers, 2)
+
+    @override_settings(VIEWER_FLUSH_VIEWS=2)
+    def test_flushes_when_buffer_full(self):
+        self.view_as(ip='10.0.0.1')
+        self.assertFalse(EventViewers.objects.exists())
+
+        self.view_as(ip='10.0.0.2')
+
+        self.assertEqual(EventViewers.objects.get(event=self.event).unique_viewers, 2)
+        self.assertEqual(len(viewer_buffer), 0)
+
+    @override_settings(EVENT_VIEW_RATE_LIMIT='2/m')
+    def test_views_rate_limited_per_ip(self):
+        cache.clear()
+        self.view_as(ip='10.0.0.7')
+        self.view_as(ip='10.0.0.7')
+
+        limited = self.client.post(self.view_url, REMOTE_ADDR='10.0.0.7')
+
+        self.assertEqual(limited.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(len(viewer_buffer), 2)
+        self.view_as(ip='10.0.0.8')
+
+    def test_missing_events_skipped(self):
+        self.view_as()
+        pending = viewer_buffer.take()
+        self.event.delete()
+
+        merge_viewers(pending)
+
+        self.assertFalse(EventViewers.objects.exists())
@@ -0,0 +1,171 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from .utils import create_event, create_ticket
+
+User = get_user_model()
+
+
+@override_settings(
+    WAITING_ROOM_ENABLED=True,
+    WAITING_ROOM_TRENDING_LIMIT=1,
+    WAITING_ROOM_RATE=1.0,
+    WAITING_ROOM_BURST=2,
+)
+class WaitingRoomTests(APITestCase):
+    """Test suite for the waiting room in front of hot events."""
+
+    def setUp(self):
+        cache.clear()
+        self.seller = User.objects.create_user('seller@crowdbolt.com', 'TestPass123!', role='seller')
+        self.hot_event = create_event(10, name='Hot Event', trending_score=100)
+        self.quiet_event = create_event(10, name='Quiet Event', trending_score=1)
+        self.join_url = reverse('products:event-waiting-room', args=[self.hot_event.id])
+        self.tickets_url = reverse('products:event-tickets', args=[self.hot_event.id])
+
+    def join(self):
+        response = self.client.post(self.join_url)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.data
+
+    def test_quiet_event_needs_no_admission(self):
+        """Test events outside the trending set are served directly."""
+        url = reverse('products:event-tickets', args=[self.quiet_event.id])
+
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+    def test_hot_event_requires_admission(self):
+        """Test ticket endpoints of a trending event reject clients without a token."""
+        response = self.client.get(self.tickets_url)
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_burst_is_admitted_then_clients_queue_in_order(self):
+        """Test the bucket admits a burst and queues the rest FIFO with an ETA."""
+        first, second, third, fourth = [self.join() for _ in range(4)]
+
+        self.assertTrue(first['admitted'])
+        self.assertTrue(second['admitted'])
+        self.assertFalse(third['admitted'])
+        self.assertEqual(third['position'], 1)
+        self.assertEqual(fourth['position'], 2)
+        self.assertEqual(fourth['eta_seconds'], 2)
+
+    def test_admission_token_unlocks_ticket_endpoints(self):
+        token = self.join()['admission_token']
+
+        response = self.client.get(self.tickets_url, HTTP_X_ADMISSION_TOKEN=token)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_admission_token_is_bound_to_event(self):
+        other = create_event(10, name='Other Hot Event', trending_score=200)
+        token = self.join()['admission_token']
+
+        with override_settings(WAITING_ROOM_TRENDING_LIMIT=2):
+            cache.clear()
+            url = reverse('products:event-tickets', args=[other.id])
+            response = self.client.get(url, HTTP_X_ADMISSION_TOKEN=token)
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_queued_client_is_admitted_as_bucket_refills(self):
+        """Test polling admits a queued client once tokens accumulate."""
+        with mock.patch('products.waiting_room.time.time', return_value=1000.0):
+            self.join()
+            self.join()
+            queued = self.join()
+
+        with mock.patch('products.waiting_room.time.time', return_value=1000.5):
+            waiting = self.client.get(self.join_url, {'token': queued['queue_token']}).data
+        with mock.patch('products.waiting_room.time.time', return_value=1001.0):
+            admitted = self.client.get(self.join_url, {'token': queued['queue_token']}).data
+
+        self.assertFalse(waiting['admitted'])
+        self.assertEqual(waiting['position'], 1)
+        self.assertTrue(admitted['admitted'])
+
+    def test_invalid_queue_token_is_rejected(self):
+        response = self.client.get(self.join_url, {'token': 'forged'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_purchase_requires_admission(self):
+        """Test ticket purchases for a hot event are gated by the waiting room."""
+        buyer = User.objects.create_user('buyer@crowdbolt.com', 'TestPass123!')
+        ticket = create_ticket(self.hot_event, self.seller)
+        url = reverse('products:ticket-purchase', args=[ticket.id])
+        self.client.force_authenticate(buyer)
+
+        rejected = self.client.post(url)
+        token = self.join()['admission_token']
+        accepted = self.client.post(url, HTTP_X_ADMISSION_TOKEN=token)
+
+        self.assertEqual(rejected.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(accepted.status_code, status.HTTP_201_CREATED)
+
+    def test_tokens_are_bound_to_the_client(self):
+        """Test admission and queue tokens issued to one client are refused to another."""
+        admission = self.join()['admission_token']
+        self.join()
+        queued = self.join()['queue_token']
+        other = User.objects.create_user('other@crowdbolt.com', 'TestPass123!')
+
+        from_other_ip = self.client.get(self.tickets_url, HTTP_X_ADMISSION_TOKEN=admission, REMOTE_ADDR='10.0.0.9')
+        self.client.force_authenticate(other)
+        signed_in = self.client.get(self.tickets_url, HTTP_X_ADMISSION_TOKEN=admission)
+        shared_queue = self.client.get(self.join_url, {'token': queued}, REMOTE_ADDR='10.0.0.9')
+
+        self.assertEqual(from_other_ip.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(signed_in.status_code, status.HTTP_200_OK)
+        self.assertEqual(shared_queue.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_admission_token_spent_by_purchase(self):
+        """Test an admission token cannot be replayed after a completed checkout."""
+        buyer = User.objects.create_user('buyer@crowdbolt.com', 'TestPass123!')
+        ticket = create_ticket(self.hot_event, self.seller, quantity=4)
+        url = reverse('products:ticket-purchase', args=[ticket.id])
+        self.client.force_authenticate(buyer)
+        token = self.join()['admission_token']
+
+        first = self.client.post(url, HTTP_X_ADMISSION_TOKEN=token)
+        replay = self.client.post(url, HTTP_X_ADMISSION_TOKEN=token)
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(replay.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_ticket_list_by_event_requires_admission(self):
+        """Test the ticket list filtered to a hot event is gated like its ticket endpoints."""
+        url = reverse('products:ticket-list')
+        create_ticket(self.hot_event, self.seller)
+
+        rejected = self.client.get(url, {'event': self.hot_event.id})
+        token = self.join()['admission_token']
+        accepted = self.client.get(url, {'event': self.hot_event.id}, HTTP_X_ADMISSION_TOKEN=token)
+        quiet = self.client.get(url, {'event': self.quiet_event.id})
+
+        self.assertEqual(rejected.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(accepted.status_code, status.HTTP_200_OK)
+        self.assertEqual(quiet.status_code, status.HTTP_200_OK)
+
+    def test_ticket_batch_requires_admission_to_every_event(self):
+        """Test a batch lookup cannot fetch tickets of a hot event past the queue."""
+        hot = create_ticket(self.hot_event, self.seller)
+        quiet = create_ticket(self.quiet_event, self.seller)
+        url = reverse('products:ticket-batch')
+
+        rejected = self.client.get(url, {'ids': f'{quiet.id},{hot.id}'})
+        token = self.join()['admission_token']
+        accepted = self.client.get(url, {'ids': f'{quiet.id},{hot.id}'}, HTTP_X_ADMISSION_TOKEN=token)
+        quiet_only = self.client.get(url, {'ids': str(quiet.id)})
+
+        self.assertEqual(rejected.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(accepted.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(accepted.data['results']), 2)
+        self.assertEqual(quiet_only.status_code, status.HTTP_200_OK)
@@ -0,0 +1,37 @@
+"""
+Helpers for building test data in the products tests.
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.utils import timezone
+
+from products.models import Event, Ticket, TicketListing
+
+
+def create_event(days_from_now, status='upcoming', **kwargs):
+    return Event.objects.create(
+        name=kwargs.pop('name', 'Test Event'),
+        description='Test description',
+        category=kwargs.pop('category', 'rave'),
+        status=status,
+        venue_name='Warehouse',
+        venue_address='1 Test St',
+        city=kwargs.pop('city', 'Brooklyn'),
+        state='NY',
+        event_date=timezone.now() + timedelta(days=days_from_now),
+        **kwargs
+    )
+
+
+def create_ticket(event, seller, listing_price='120.00', **kwargs):
+    ticket = Ticket.objects.create(
+        event=event,
+        seller=seller,
+        section=kwargs.pop('section', 'GA'),
+        original_price=Decimal(kwargs.pop('original_price', '100.00')),
+        listing_price=Decimal(listing_price),
+        **kwargs
+    )
+    TicketListing.objects.create(ticket=ticket)
+    return ticket
@@ -6,16 +6,29 @@ app_name = 'products'
 urlpatterns = [
     # Events
     path('events/', views.EventListView.as_view(), name='event-list'),
+    path('events/batch/', views.event_batch, name='event-batch'),
+    path('events/cache-stats/', views.event_cache_stats, name='event-cache-stats'),
     path('events/<uuid:pk>/', views.EventDetailView.as_view(), name='event-detail'),
     path('events/<uuid:event_id>/tickets/', views.event_tickets, name='event-tickets'),
     path('events/<uuid:event_id>/stats/', views.event_stats, name='event-stats'),
+    path('events/<uuid:event_id>/page/', views.event_page, name='event-page'),
+    path('events/<uuid:event_id>/view/', views.event_view, name='event-view'),
+    path('events/<uuid:event_id>/live/', views.event_live, name='event-live'),
+    path('events/<uuid:event_id>/waiting-room/', views.waiting_room, name='event-waiting-room'),
 
     # Tickets
     path('tickets/', views.TicketListView.as_view(), name='ticket-list'),
+    path('tickets/batch/', views.ticket_batch, name='ticket-batch'),
     path('tickets/<uuid:pk>/', views.TicketDetailView.as_view(), name='ticket-detail'),
+    path('tickets/<uuid:pk>/reservation/', views.ticket_reservation, name='ticket-reservation'),
+    path('tickets/<uuid:pk>/purchase/', views.purchase, name='ticket-purchase'),
     path('my-tickets/', views.MyTicketsView.as_view(), name='my-tickets'),
+    path('my-tickets/history/', views.MyTicketHistoryView.as_view(), name='my-ticket-history'),
+    path('seller/dashboard/', views.SellerDashboardView.as_view(), name='seller-dashboard'),
+    path('seller/earnings/', views.seller_earnings, name='seller-earnings'),
 
     # Stats and trending
     path('stats/', views.market_stats, name='market-stats'),
     path('trending/', views.trending_events, name='trending-events'),
+    path('trending/searches/', views.trending_search_terms, name='trending-searches'),
 ]
\ No newline at end of file
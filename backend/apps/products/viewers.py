@@ -0,0 +1,117 @@
+"""
+Unique viewers per event, counted with HyperLogLog sketches.
+
+Storing exact (viewer, event) pairs would grow without bound. Each event
+has instead one EventViewers row with a HyperLogLog sketch (a few KB,
+about 1% error; see products.sketches) and the count it estimates.
+
+Views are recorded with record_view(). Viewers are identified by user id,
+or by IP address and User-Agent when anonymous, and only their hashes are
+kept. Each worker buffers the hashes per event (ViewerBuffer) and merges
+them into the stored sketches in one transaction once
+VIEWER_FLUSH_VIEWS views are pending or VIEWER_FLUSH_SECONDS have passed.
+Sketch merges are idempotent, so a viewer seen by several workers or in
+several batches is still counted once. Views buffered in a worker that
+exits are lost, which only makes the estimate slightly low.
+"""
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+
+from users.utils import get_client_ip
+
+from .models import Event, EventViewers
+from .sketches import HyperLogLog, hash64
+
+logger = logging.getLogger(__name__)
+
+
+class ViewerBuffer:
+    """Thread-safe per-worker buffer of viewer hashes per event, awaiting a merge."""
+
+    def __init__(self):
+        self._pending = defaultdict(set)
+        self._views = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def add(self, event_id, viewer_hash):
+        """Buffer a view. Returns True when the buffer is due to be flushed."""
+        with self._lock:
+            self._pending[str(event_id)].add(viewer_hash)
+            self._views += 1
+            return (
+                self._views >= settings.VIEWER_FLUSH_VIEWS
+                or time.monotonic() - self._last_flush >= settings.VIEWER_FLUSH_SECONDS
+            )
+
+    def take(self):
+        """Empty the buffer, returning {event_id: set of viewer hashes}."""
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(set)
+            self._views = 0
+            self._last_flush = time.monotonic()
+            return pending
+
+    def __len__(self):
+        return self._views
+
+
+viewer_buffer = ViewerBuffer()
+
+
+def viewer_id(request):
+    """Identity a viewer is counted under."""
+    if request.user.is_authenticated:
+        return f'user:{request.user.pk}'
+    return f'anon:{get_client_ip(request)}:{request.META.get("HTTP_USER_AGENT", "")}'
+
+
+def merge_viewers(pending):
+    """
+    Merge ``{event_id: viewer hashes}`` into the stored sketches, in one
+    transaction. Events that no longer exist are skipped.
+    """
+    event_ids = list(Event.objects.filter(id__in=list(pending)).values_list('id', flat=True))
+    if not event_ids:
+        return
+    with transaction.atomic():
+        # Create missing rows first, so concurrent merges lock the same rows
+        EventViewers.objects.bulk_create(
+            [EventViewers(event_id=event_id, sketch=HyperLogLog().to_bytes()) for event_id in event_ids],
+            ignore_conflicts=True,
+        )
+        now = timezone.now()
+        for event_id, stored in EventViewers.objects.select_for_update().filter(
+            event_id__in=event_ids
+        ).values_list('event_id', 'sketch'):
+            sketch = HyperLogLog.from_bytes(stored)
+            for viewer_hash in pending[str(event_id)]:
+                sketch.add_hash(viewer_hash)
+            # One UPDATE per event: bulk_update()'s CASE expressions cost
+            # several times more to build than these take to run
+            EventViewers.objects.filter(event_id=event_id).update(
+                sketch=sketch.to_bytes(), unique_viewers=sketch.count(), updated_at=now
+            )
+
+
+def flush_viewers():
+    """Merge this worker's buffered views. Failures are logged and the views dropped."""
+    pending = viewer_buffer.take()
+    if not pending:
+        return
+    try:
+        merge_viewers(pending)
+    except DatabaseError as e:
+        logger.warning(f'Dropped buffered views of {len(pending)} events: {e!r}')
+
+
+def record_view(request, event_id):
+    """Count the requesting client as a viewer of an event."""
+    if viewer_buffer.add(event_id, hash64(viewer_id(request))):
+        flush_viewers()
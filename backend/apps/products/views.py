@@ -1,29 +1,128 @@
+import random
+import uuid
+
 from rest_framework import generics, status
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
-from django.db.models import Q, Min, Max, Avg, Count
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q, Min, Max, Avg, Count, Sum
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.urls import reverse
 from django.utils import timezone
-
-from .models import Event, Ticket, TicketListing
+from django.utils.decorators import method_decorator
+from django_ratelimit.decorators import ratelimit
+
+from users.utils import get_client_ip
+
+from .cache import get_seller_version
+from .cdn import EVENTS_KEY, MARKET_STATS_KEY, TRENDING_KEY, cdn_cache, event_key, listing_key, surrogate_keys
+from .documents import get_event_document, get_event_documents, local_documents
+from .event_page import get_event_page
+from .live import event_stream
+from .models import ArchivedTicket, Event, Ticket, TicketListing
+from .outbox import emit
+from .purchases import PurchaseError, purchase_ticket
+from .reservations import release_ticket, reserve_ticket
+from .rollups import read_market_stats
+from .searches import normalize_search, record_search, trending_searches
+from .viewers import record_view
+from .waiting_room import (
+    AdmissionRequired, is_active, join_queue, queue_status, require_admission, require_ticket_admission,
+    spend_admission,
+)
 from .serializers import (
     EventSerializer,
-    EventListSerializer,
+    FastEventListSerializer,
+    FastEventSerializer,
+    FastListSerializer,
+    FastTicketListSerializer,
+    FastTicketSerializer,
     TicketSerializer,
     TicketListSerializer,
     TicketCreateSerializer,
     TicketListingSerializer,
+    ArchivedTicketSerializer,
+    EarningsByStatusSerializer,
+    EarningsSerializer,
+    PurchaseSerializer,
+    SaleSerializer,
+    SellerListingSerializer,
+    sparse_fieldset,
 )
 
 
-class EventListView(generics.ListCreateAPIView):
+def _event_keys(rows, *collection_keys):
+    ids = [row.get('id') for row in rows]
+    if None in ids:
+        # A sparse fieldset left the ids out; the response cannot be purged
+        return None
+    return surrogate_keys([*collection_keys, *(event_key(pk) for pk in ids)])
+
+
+def _event_list_keys(request, response, **kwargs):
+    return _event_keys(response.data['results'], EVENTS_KEY)
+
+
+def _trending_keys(request, response, **kwargs):
+    return _event_keys(response.data['trending_events'], EVENTS_KEY, TRENDING_KEY)
+
+
+def _market_stats_keys(request, response, **kwargs):
+    return MARKET_STATS_KEY
+
+
+def _event_tickets_keys(request, response, event_id, **kwargs):
+    # Any ticket write purges the event key; listing keys allow finer purges
+    tickets = response.data['tickets']
+    if isinstance(tickets, dict):
+        tickets = tickets['results']
+    return surrogate_keys([event_key(event_id)], [listing_key(ticket['id']) for ticket in tickets])
+
+
+class SparseFieldsetMixin:
+    """
+    Sparse fieldsets for GET requests: ``?fields=a,b`` returns only those
+    serializer fields and ``?exclude=c`` drops some. The queryset is trimmed
+    to match, so fields nobody asked for cost no columns, joins or queries.
+    """
+
+    def get_fieldset(self):
+        if not hasattr(self, '_fieldset'):
+            self._fieldset = None
+            if self.request.method == 'GET':
+                self._fieldset = sparse_fieldset(self.request.query_params, self.get_serializer_class())
+        return self._fieldset
+
+    def get_serializer(self, *args, **kwargs):
+        fieldset = self.get_fieldset()
+        if fieldset is not None:
+            kwargs['fields'] = fieldset
+        return super().get_serializer(*args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        serializer_class = self.get_serializer_class()
+        if issubclass(serializer_class, FastListSerializer):
+            return serializer_class.prepare_queryset(queryset, self.get_fieldset())
+        fieldset = self.get_fieldset()
+        if fieldset is not None:
+            queryset = serializer_class.trim_queryset(queryset, fieldset)
+        return queryset
+
+
+@method_decorator(cdn_cache(max_age=300, stale_while_revalidate=60, keys=_event_list_keys), name='get')
+class EventListView(SparseFieldsetMixin, generics.ListCreateAPIView):
     """List and create events."""
 
     permission_classes = [AllowAny]  # Anyone can view events
 
     def get_serializer_class(self):
         if self.request.method == 'GET':
-            return EventListSerializer
+            return FastEventListSerializer
         return EventSerializer
 
     def get_queryset(self):
@@ -50,15 +149,26 @@ class EventListView(generics.ListCreateAPIView):
 
         return queryset.order_by('event_date')
 
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        term = normalize_search(request.query_params.get('search', ''))
+        if term:
+            record_search(term, [row['id'] for row in response.data['results'] if 'id' in row])
+            # Searches answered by the CDN would never be counted
+            response['Cache-Control'] = 'private, no-store'
+        return response
+
+    @transaction.atomic
     def perform_create(self, serializer):
         # Set creator to current user if authenticated
         if self.request.user.is_authenticated:
-            serializer.save(created_by=self.request.user)
+            event = serializer.save(created_by=self.request.user)
         else:
-            serializer.save()
+            event = serializer.save()
+        emit('event.created', event.id, status=event.status, event_date=event.event_date)
 
 
-class EventDetailView(generics.RetrieveUpdateDestroyAPIView):
+class EventDetailView(SparseFieldsetMixin, generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update, or delete a specific event."""
 
     queryset = Event.objects.all()
@@ -71,14 +181,33 @@ class EventDetailView(generics.RetrieveUpdateDestroyAPIView):
             return [IsAuthenticated()]
         return [AllowAny()]
 
+    def retrieve(self, request, *args, **kwargs):
+        if self.get_fieldset() is not None:
+            return super().retrieve(request, *args, **kwargs)
+        document, _ = get_event_document(kwargs['pk'])
+        if document is None:
+            raise Http404('No Event matches the given query.')
+        return Response(document)
 
-class TicketListView(generics.ListCreateAPIView):
+    @transaction.atomic
+    def perform_update(self, serializer):
+        event = serializer.save()
+        emit('event.updated', event.id, status=event.status, event_date=event.event_date)
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        event_id = instance.id
+        instance.delete()
+        emit('event.deleted', event_id)
+
+
+class TicketListView(SparseFieldsetMixin, generics.ListCreateAPIView):
     """List and create tickets."""
 
     def get_serializer_class(self):
         if self.request.method == 'POST':
             return TicketCreateSerializer
-        return TicketListSerializer
+        return FastTicketListSerializer
 
     def get_permissions(self):
         # Anyone can view tickets, auth required to create
@@ -87,11 +216,13 @@ class TicketListView(generics.ListCreateAPIView):
         return [AllowAny()]
 
     def get_queryset(self):
-        queryset = Ticket.objects.filter(status='available')
+        queryset = Ticket.objects.available()
 
         # Filter by event
         event_id = self.request.query_params.get('event')
         if event_id:
+            # Listing by event must not get around its waiting room
+            require_admission(self.request, event_id=event_id)
             queryset = queryset.filter(event=event_id)
 
         # Filter by price range
@@ -118,13 +249,18 @@ class TicketListView(generics.ListCreateAPIView):
 
         return queryset
 
+    @transaction.atomic
     def perform_create(self, serializer):
         ticket = serializer.save()
         # Automatically create a listing for the ticket
         TicketListing.objects.create(ticket=ticket)
+        emit(
+            'ticket.listed', ticket.event_id,
+            ticket_id=ticket.id, listing_price=ticket.listing_price, quantity=ticket.quantity,
+        )
 
 
-class TicketDetailView(generics.RetrieveUpdateDestroyAPIView):
+class TicketDetailView(SparseFieldsetMixin, generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update, or delete a specific ticket."""
 
     queryset = Ticket.objects.all()
@@ -145,71 +281,263 @@ class TicketDetailView(generics.RetrieveUpdateDestroyAPIView):
                 raise PermissionDenied("You can only modify your own tickets.")
         return obj
 
+    @transaction.atomic
+    def perform_update(self, serializer):
+        ticket = serializer.save()
+        emit(
+            'ticket.cancelled' if ticket.status == 'cancelled' else 'ticket.updated', ticket.event_id,
+            ticket_id=ticket.id, listing_price=ticket.listing_price, quantity=ticket.quantity,
+            status=ticket.status,
+        )
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        ticket_id, event_id = instance.id, instance.event_id
+        instance.delete()
+        emit('ticket.cancelled', event_id, ticket_id=ticket_id, deleted=True)
+
 
-class MyTicketsView(generics.ListAPIView):
+class MyTicketsView(SparseFieldsetMixin, generics.ListAPIView):
     """Get current user's tickets."""
 
     serializer_class = TicketListSerializer
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return Ticket.objects.filter(seller=self.request.user).order_by('-listed_at')
+        return Ticket.objects.filter(
+            seller=self.request.user
+        ).select_related('event').order_by('-listed_at')
+
+
+class SellerDashboardView(SparseFieldsetMixin, generics.ListAPIView):
+    """
+    Current user's listings, newest first, with views and saves, plus a
+    summary of ticket statuses and engagement across all of their listings.
+    """
+
+    serializer_class = SellerListingSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return Ticket.objects.filter(
+            seller=self.request.user
+        ).select_related('event', 'listing').order_by('-listed_at')
+
+    def get_summary(self):
+        # One grouped query, whatever the number of listings. It still scans
+        # all of them, so it is cached until the seller's tickets change
+        seller_id = self.request.user.pk
+        key = f'seller-dashboard-summary:{seller_id}:{get_seller_version(seller_id)}'
+        summary = cache.get(key)
+        if summary is None:
+            rows = Ticket.objects.filter(seller=self.request.user).order_by().values('status').annotate(
+                count=Count('id'),
+                views=Sum('listing__views'),
+                saves=Sum('listing__saves'),
+            )
+            status_counts = {row['status']: row['count'] for row in rows}
+            summary = {
+                'total_listings': sum(status_counts.values()),
+                'status_counts': status_counts,
+                'total_views': sum(row['views'] or 0 for row in rows),
+                'total_saves': sum(row['saves'] or 0 for row in rows),
+            }
+            cache.set(key, summary, timeout=settings.SELLER_DASHBOARD_SUMMARY_TTL)
+        return summary
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        response.data['summary'] = self.get_summary()
+        return response
+
+
+class MyTicketHistoryView(SparseFieldsetMixin, generics.ListAPIView):
+    """Get current user's tickets for archived (past) events."""
+
+    serializer_class = ArchivedTicketSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return ArchivedTicket.objects.filter(
+            seller=self.request.user
+        ).select_related('event').order_by('-listed_at')
+
+
+# Most ids a batch lookup accepts
+BATCH_MAX_IDS = 100
+
+
+def _batch_ids(request):
+    """Distinct ids from ``?ids=a,b,...``, in the order given."""
+    ids = []
+    for value in request.query_params.get('ids', '').split(','):
+        value = value.strip()
+        if not value:
+            continue
+        try:
+            pk = uuid.UUID(value)
+        except ValueError:
+            raise ValidationError({'ids': f'Invalid id: {value}'})
+        if pk not in ids:
+            ids.append(pk)
+    if not ids or len(ids) > BATCH_MAX_IDS:
+        raise ValidationError({'ids': f'Pass between 1 and {BATCH_MAX_IDS} comma-separated ids.'})
+    return ids
+
+
+def _batch_response(request, queryset, serializer_class, get_documents=None):
+    """
+    Serialize the rows of ``queryset`` with the requested ids in one query.
+
+    Results follow the order of ``?ids=``; ids with no row are listed under
+    ``missing``. Sparse fieldsets (``?fields=``/``?exclude=``) apply. Full
+    documents come from ``get_documents(ids)``, when given, instead.
+    """
+    ids = _batch_ids(request)
+    fieldset = sparse_fieldset(request.query_params, serializer_class)
+    # The id is needed to put the rows in order, even if not requested
+    fields = fieldset if fieldset is None or 'id' in fieldset else fieldset + ['id']
+    if fieldset is None and get_documents is not None:
+        found, _ = get_documents(ids)
+    else:
+        rows = serializer_class.prepare_queryset(queryset.filter(id__in=ids), fields)
+        found = {item['id']: item for item in serializer_class(rows, many=True, fields=fields).data}
+    results, missing = [], []
+    for pk in ids:
+        item = found.get(str(pk))
+        if item is None:
+            missing.append(str(pk))
+            continue
+        if fields is not fieldset:
+            del item['id']
+        results.append(item)
+    return Response({'results': results, 'missing': missing})
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def event_batch(request):
+    """Get up to BATCH_MAX_IDS events by id, as the event detail endpoint returns them."""
+    return _batch_response(request, Event.objects.all(), FastEventSerializer, get_documents=get_event_documents)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def event_cache_stats(request):
+    """Hit rates and latency of this worker's serialized event cache."""
+    return Response(local_documents.stats())
 
 
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def ticket_batch(request):
+    """Get up to BATCH_MAX_IDS tickets by id, as the ticket detail endpoint returns them."""
+    require_ticket_admission(request, _batch_ids(request))
+    return _batch_response(request, Ticket.objects.all(), FastTicketSerializer)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def seller_earnings(request):
+    """Fees and payouts across the current user's listings, per status and in total."""
+
+    listings = TicketListing.objects.filter(ticket__seller=request.user)
+    event_id = request.query_params.get('event')
+    if event_id:
+        listings = listings.filter(ticket__event=event_id)
+
+    by_status = list(listings.earnings_by_status())
+    totals = {
+        field: sum((row[field] or 0 for row in by_status), 0)
+        for field in ('listings', 'tickets', 'gross', 'fees', 'payout')
+    }
+
+    return Response({
+        'by_status': EarningsByStatusSerializer(by_status, many=True).data,
+        'totals': EarningsSerializer(totals).data,
+    })
+
+
+@cdn_cache(max_age=60, stale_while_revalidate=60, keys=_trending_keys)
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def trending_events(request):
     """Get trending events based on popularity metrics."""
 
     limit = int(request.query_params.get('limit', 3))
-    events = Event.get_trending_events(limit=limit)
+    fieldset = sparse_fieldset(request.query_params, FastEventListSerializer)
+    events = FastEventListSerializer.prepare_queryset(Event.get_trending_events(limit=limit), fieldset)
 
-    serializer = EventListSerializer(events, many=True)
+    serializer = FastEventListSerializer(events, many=True, fields=fieldset)
     return Response({
         'trending_events': serializer.data,
         'count': len(serializer.data)
     })
 
 
+@cdn_cache(max_age=60, stale_while_revalidate=60)
 @api_view(['GET'])
 @permission_classes([AllowAny])
-def market_stats(request):
-    """Get marketplace statistics."""
+def trending_search_terms(request):
+    """Most searched event terms of the last SEARCH_TRENDS_WINDOWS windows, by estimated count."""
 
-    total_events = Event.objects.filter(status='upcoming').count()
-    total_tickets = Ticket.objects.filter(status='available').count()
+    try:
+        limit = int(request.query_params.get('limit', 10))
+    except ValueError:
+        raise ValidationError({'limit': 'Must be an integer.'})
+    terms = trending_searches()[:max(limit, 0)]
+    return Response({'trending_searches': terms, 'count': len(terms)})
 
-    # Average prices
-    avg_price = Ticket.objects.filter(status='available').aggregate(
-        avg_price=Avg('listing_price')
-    )['avg_price']
 
-    # Popular categories
-    popular_categories = Event.objects.filter(status='upcoming').values('category').annotate(
-        count=Count('category')
-    ).order_by('-count')[:5]
+# Purged by each rollup refresh rather than by writes
+@cdn_cache(max_age=30, stale_while_revalidate=30, keys=_market_stats_keys)
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def market_stats(request):
+    """Get marketplace statistics, from the rollup refreshed by refresh_market_stats."""
+
+    rows = read_market_stats()
+    total = next(row for row in rows if row.dimension == 'total')
+    categories = [row for row in rows if row.dimension == 'category']
+    cities = [row for row in rows if row.dimension == 'city']
+
+    def breakdown(row, name):
+        return {
+            name: row.key,
+            'events': row.upcoming_events,
+            'tickets': row.available_tickets,
+            'average_ticket_price': row.average_ticket_price,
+        }
 
     return Response({
-        'total_events': total_events,
-        'total_tickets': total_tickets,
-        'average_ticket_price': round(float(avg_price) if avg_price else 0, 2),
-        'popular_categories': list(popular_categories)
+        'total_events': total.upcoming_events,
+        'total_tickets': total.available_tickets,
+        'average_ticket_price': total.average_ticket_price,
+        'popular_categories': [
+            {'category': row.key, 'count': row.upcoming_events}
+            for row in categories[:5] if row.upcoming_events
+        ],
+        'categories': [breakdown(row, 'category') for row in categories],
+        'top_cities': [breakdown(row, 'city') for row in cities],
+        'refreshed_at': total.refreshed_at,
     })
 
 
+@cdn_cache(max_age=300, stale_while_revalidate=60, keys=_event_tickets_keys)
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def event_tickets(request, event_id):
     """Get all available tickets for a specific event."""
 
+    require_admission(request, event_id=event_id)
+
     try:
         event = Event.objects.get(id=event_id)
     except Event.DoesNotExist:
         return Response({'error': 'Event not found'}, status=status.HTTP_404_NOT_FOUND)
 
-    tickets = Ticket.objects.filter(
-        event=event,
-        status='available'
+    tickets = Ticket.objects.available().filter(
+        event=event
     ).order_by('listing_price')
 
     # Get price statistics
@@ -221,7 +549,7 @@ def event_tickets(request, event_id):
 
     serializer = TicketListSerializer(tickets, many=True)
 
-    return Response({
+    response = Response({
         'event': EventSerializer(event).data,
         'tickets': serializer.data,
         'stats': {
@@ -231,6 +559,10 @@ def event_tickets(request, event_id):
             'avg_price': round(float(price_stats['avg_price']) if price_stats['avg_price'] else 0, 2)
         }
     })
+    if is_active(event_id):
+        # Only admitted clients may see these; a shared cache must not
+        response['Cache-Control'] = 'private, no-store'
+    return response
 
 
 @api_view(['GET'])
@@ -239,12 +571,12 @@ def event_stats(request, event_id):
     """Get marketplace statistics for a specific event."""
 
     try:
-        event = Event.objects.get(id=event_id)
+        event = Event.objects.select_related('viewers').get(id=event_id)
     except Event.DoesNotExist:
         return Response({'error': 'Event not found'}, status=status.HTTP_404_NOT_FOUND)
 
     # Get all tickets for this event
-    tickets = Ticket.objects.filter(event=event, status='available')
+    tickets = Ticket.objects.available().filter(event=event)
 
     # Get price statistics
     price_stats = tickets.aggregate(
@@ -253,9 +585,8 @@ def event_stats(request, event_id):
         avg_price=Avg('listing_price')
     )
 
-    # Simulate interested buyers (in a real app, this would track actual user interest)
-    import random
-    interested_buyers = random.randint(10, 50) if tickets.count() > 0 else 0
+    # Estimated unique viewers of the event (see products.viewers)
+    interested_buyers = event.viewers.unique_viewers if hasattr(event, 'viewers') else 0
 
     # Get last sale price (simulate for now)
     last_sale_price = None
@@ -271,3 +602,134 @@ def event_stats(request, event_id):
         'min_price': price_stats['min_price'],
         'max_price': price_stats['max_price']
     })
+
+
+def _client_ip_key(group, request):
+    return get_client_ip(request)
+
+
+@api_view(['POST'])
+@permission_classes([AllowAny])
+@ratelimit(key=_client_ip_key, rate=lambda group, request: settings.EVENT_VIEW_RATE_LIMIT, block=False)
+def event_view(request, event_id):
+    """Record that the client viewed an event's page, for its unique viewer count."""
+
+    if request.limited:
+        return Response({'error': 'Too many views'}, status=status.HTTP_429_TOO_MANY_REQUESTS)
+    record_view(request, event_id)
+    return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+@cdn_cache(max_age=300, stale_while_revalidate=60, keys=_event_tickets_keys)
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def event_page(request, event_id):
+    """
+    Event detail, first page of available tickets and price stats in one
+    response. Tickets are null while a waiting room holds the client back.
+    """
+
+    page = get_event_page(event_id)
+    if page is None:
+        return Response({'error': 'Event not found'}, status=status.HTTP_404_NOT_FOUND)
+
+    try:
+        require_admission(request, event_id=event_id)
+    except AdmissionRequired:
+        # The event and its stats stay visible behind a waiting room
+        response = Response({**page, 'tickets': None, 'admission_required': True})
+        response['Cache-Control'] = 'private, no-store'
+        return response
+
+    tickets = page['tickets']
+    next_url = None
+    if tickets['count'] > len(tickets['results']):
+        next_url = request.build_absolute_uri(f"{reverse('products:ticket-list')}?event={event_id}&page=2")
+    response = Response({
+        **page,
+        'tickets': {'count': tickets['count'], 'next': next_url, 'results': tickets['results']},
+        'admission_required': False,
+    })
+    if is_active(event_id):
+        response['Cache-Control'] = 'private, no-store'
+    return response
+
+
+async def event_live(request, event_id):
+    """
+    Stream best-ask, count and last-sale changes for an event as Server-Sent
+    Events. Plain async Django view: needs an ASGI server to stream.
+    """
+
+    if not await Event.objects.filter(id=event_id).aexists():
+        return JsonResponse({'error': 'Event not found'}, status=status.HTTP_404_NOT_FOUND)
+
+    response = StreamingHttpResponse(event_stream(event_id), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Stop nginx-style proxies from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@api_view(['GET', 'POST'])
+@permission_classes([AllowAny])
+def waiting_room(request, event_id):
+    """Join (POST) or poll (GET ?token=...) the waiting room of an event."""
+
+    if not Event.objects.filter(id=event_id).exists():
+        return Response({'error': 'Event not found'}, status=status.HTTP_404_NOT_FOUND)
+
+    if request.method == 'POST':
+        return Response(join_queue(request, event_id), status=status.HTTP_201_CREATED)
+
+    result = queue_status(request, event_id, request.query_params.get('token', ''))
+    if result is None:
+        return Response({'error': 'Invalid queue token'}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(result)
+
+
+@api_view(['POST', 'DELETE'])
+@permission_classes([IsAuthenticated])
+def ticket_reservation(request, pk):
+    """Place (POST) or release (DELETE) a time-limited checkout hold on a ticket."""
+
+    if request.method == 'DELETE':
+        if release_ticket(pk, request.user):
+            return Response(status=status.HTTP_204_NO_CONTENT)
+        return Response({'error': 'No active hold on this ticket'}, status=status.HTTP_404_NOT_FOUND)
+
+    require_admission(request, ticket_id=pk)
+
+    held_until = reserve_ticket(pk, request.user)
+    if held_until is None:
+        if not Ticket.objects.filter(id=pk).exists():
+            return Response({'error': 'Ticket not found'}, status=status.HTTP_404_NOT_FOUND)
+        return Response({'error': 'Ticket is not available'}, status=status.HTTP_409_CONFLICT)
+
+    return Response({
+        'ticket': pk,
+        'status': 'pending',
+        'held_until': held_until,
+    }, status=status.HTTP_201_CREATED)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def purchase(request, pk):
+    """Buy tickets from a listing, atomically decrementing its quantity."""
+
+    gated_event_id = require_admission(request, ticket_id=pk)
+
+    serializer = PurchaseSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+
+    try:
+        sale = purchase_ticket(pk, request.user, serializer.validated_data['quantity'])
+    except PurchaseError as e:
+        if not Ticket.objects.filter(id=pk).exists():
+            return Response({'error': 'Ticket not found'}, status=status.HTTP_404_NOT_FOUND)
+        return Response({'error': str(e)}, status=status.HTTP_409_CONFLICT)
+
+    if gated_event_id is not None:
+        spend_admission(request, gated_event_id)
+    return Response(SaleSerializer(sale).data, status=status.HTTP_201_CREATED)
@@ -0,0 +1,247 @@
+"""
+Virtual waiting room for hot events.
+
+While a waiting room is active for an event (it is one of the
+WAITING_ROOM_TRENDING_LIMIT trending events), its ticket endpoints only
+serve clients holding a signed admission token. Clients join a FIFO queue
+and poll with their queue token; admissions are paced by a per-event token
+bucket refilling at WAITING_ROOM_RATE per second, up to WAITING_ROOM_BURST.
+
+Queue numbers come from an atomic cache counter and the bucket is a single
+cache entry refilled under a short lock, so the state lives in whichever
+cache WAITING_ROOM_CACHE names and is shared by all workers when that cache
+is. Queue and admission tokens are signed and carry their own state, so
+polling never touches the database.
+
+Tokens are bound to the client they were issued to (its user id, or its IP
+address when anonymous) and are only honoured for that client, so they
+cannot be handed on. An admission token is spent by a completed purchase
+and is not accepted again afterwards.
+"""
+import secrets
+import time
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import caches
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from users.utils import get_client_ip
+
+from .cdn import event_key, purge
+from .models import Event, Ticket
+
+ADMISSION_HEADER = 'HTTP_X_ADMISSION_TOKEN'
+QUEUE_SALT = 'products.waiting_room.queue'
+ADMISSION_SALT = 'products.waiting_room.admission'
+
+# Queue state outlives any realistic on-sale, then expires on its own
+STATE_TIMEOUT = 24 * 60 * 60
+LOCK_TIMEOUT = 1
+
+
+class AdmissionRequired(APIException):
+    status_code = status.HTTP_429_TOO_MANY_REQUESTS
+    default_detail = 'This event has a waiting room. Join the queue to get an admission token.'
+    default_code = 'admission_required'
+
+
+def _cache():
+    return caches[settings.WAITING_ROOM_CACHE]
+
+
+def _tail_key(event_id):
+    return f'waiting-room:{event_id}:tail'
+
+
+def _bucket_key(event_id):
+    return f'waiting-room:{event_id}:bucket'
+
+
+def _lock_key(event_id):
+    return f'waiting-room:{event_id}:lock'
+
+
+def _spent_key(token_id):
+    return f'waiting-room:spent:{token_id}'
+
+
+def _client_id(request):
+    """Identity tokens are bound to: the user id, or the IP address when anonymous."""
+    if request.user.is_authenticated:
+        return f'user:{request.user.pk}'
+    return f'ip:{get_client_ip(request)}'
+
+
+def _is_client(request, client_id):
+    # A client that joined anonymously keeps its place after signing in
+    # from the same address
+    return client_id in (_client_id(request), f'ip:{get_client_ip(request)}')
+
+
+def active_event_ids():
+    """Ids of events currently behind a waiting room."""
+    if not settings.WAITING_ROOM_ENABLED:
+        return set()
+    cache = _cache()
+    event_ids = cache.get('waiting-room:active')
+    if event_ids is None:
+        event_ids = {
+            str(event_id) for event_id in Event.get_trending_events(
+                limit=settings.WAITING_ROOM_TRENDING_LIMIT
+            ).values_list('id', flat=True)
+        }
+        cache.set('waiting-room:active', event_ids, timeout=settings.WAITING_ROOM_REFRESH_SECONDS)
+        # The CDN may still hold public ticket responses of events that just
+        # got a waiting room; those must not be served past the queue
+        gated_before = cache.get('waiting-room:gated', set())
+        purge(event_key(event_id) for event_id in event_ids - gated_before)
+        cache.set('waiting-room:gated', event_ids, timeout=STATE_TIMEOUT)
+    return event_ids
+
+
+def is_active(event_id):
+    return str(event_id) in active_event_ids()
+
+
+def _refill(event_id):
+    """
+    Advance the queue head by the tokens accumulated since the last refill.
+
+    Returns the number of queue entries admitted so far. Only one worker
+    refills at a time; the others read the current state.
+    """
+    cache = _cache()
+    key = _bucket_key(event_id)
+    if not cache.add(_lock_key(event_id), True, timeout=LOCK_TIMEOUT):
+        return cache.get(key, (0, 0, 0))[0]
+
+    try:
+        now = time.time()
+        served, tokens, updated = cache.get(key, (0, settings.WAITING_ROOM_BURST, now))
+        tokens = min(settings.WAITING_ROOM_BURST, tokens + (now - updated) * settings.WAITING_ROOM_RATE)
+        waiting = cache.get(_tail_key(event_id), 0) - served
+        admitted = min(int(tokens), waiting)
+        served += admitted
+        cache.set(key, (served, tokens - admitted, now), timeout=STATE_TIMEOUT)
+        return served
+    finally:
+        cache.delete(_lock_key(event_id))
+
+
+def _admission_token(event_id, number, client_id):
+    return signing.dumps(
+        {'e': str(event_id), 'n': number, 'c': client_id, 'j': secrets.token_urlsafe(12)},
+        salt=ADMISSION_SALT,
+    )
+
+
+def _queue_status(event_id, number, client_id):
+    served = _refill(event_id)
+    if number <= served:
+        return {
+            'admitted': True,
+            'admission_token': _admission_token(event_id, number, client_id),
+            'expires_in': settings.WAITING_ROOM_ADMISSION_SECONDS,
+        }
+    position = number - served
+    return {
+        'admitted': False,
+        'queue_token': signing.dumps({'e': str(event_id), 'n': number, 'c': client_id}, salt=QUEUE_SALT),
+        'position': position,
+        'eta_seconds': round(position / settings.WAITING_ROOM_RATE),
+    }
+
+
+def join_queue(request, event_id):
+    """
+    Put the requesting client at the back of an event's queue.
+
+    Returns the client's queue status, with an admission token straight away
+    if there is no waiting room or the bucket has tokens to spare.
+    """
+    client_id = _client_id(request)
+    if not is_active(event_id):
+        return {
+            'admitted': True,
+            'admission_token': _admission_token(event_id, 0, client_id),
+            'expires_in': settings.WAITING_ROOM_ADMISSION_SECONDS,
+        }
+    cache = _cache()
+    cache.add(_tail_key(event_id), 0, timeout=STATE_TIMEOUT)
+    number = cache.incr(_tail_key(event_id))
+    return _queue_status(event_id, number, client_id)
+
+
+def queue_status(request, event_id, queue_token):
+    """Return the status of a queued client, or None if the token is invalid or not theirs."""
+    try:
+        data = signing.loads(queue_token, salt=QUEUE_SALT, max_age=STATE_TIMEOUT)
+    except signing.BadSignature:
+        return None
+    if data['e'] != str(event_id) or not _is_client(request, data.get('c')):
+        return None
+    return _queue_status(event_id, data['n'], data['c'])
+
+
+def _admission(request, event_id):
+    """The request's unspent admission token data for the event, or None."""
+    token = request.META.get(ADMISSION_HEADER)
+    if not token:
+        return None
+    try:
+        data = signing.loads(token, salt=ADMISSION_SALT, max_age=settings.WAITING_ROOM_ADMISSION_SECONDS)
+    except signing.BadSignature:
+        return None
+    if data['e'] != str(event_id) or not _is_client(request, data.get('c')):
+        return None
+    if _cache().get(_spent_key(data['j'])):
+        return None
+    return data
+
+
+def has_admission(request, event_id):
+    """Whether the request carries a valid admission token for the event."""
+    return _admission(request, event_id) is not None
+
+
+def spend_admission(request, event_id):
+    """Mark the request's admission token for the event as used by a completed checkout."""
+    data = _admission(request, event_id)
+    if data is not None:
+        _cache().set(_spent_key(data['j']), True, timeout=settings.WAITING_ROOM_ADMISSION_SECONDS)
+
+
+def require_admission(request, event_id=None, ticket_id=None):
+    """
+    Raise AdmissionRequired unless the request may use this event's ticket
+    endpoints. Pass ``ticket_id`` when the event is not known yet; it is only
+    looked up while some waiting room is active.
+
+    Returns the id of the gated event, to pass to spend_admission() once a
+    checkout completes, or None when no waiting room applies.
+    """
+    active = active_event_ids()
+    if not active:
+        return None
+    if event_id is None:
+        event_id = Ticket.objects.filter(id=ticket_id).values_list('event_id', flat=True).first()
+    if str(event_id) not in active:
+        return None
+    if not has_admission(request, event_id):
+        raise AdmissionRequired()
+    return event_id
+
+
+def require_ticket_admission(request, ticket_ids):
+    """
+    Raise AdmissionRequired unless the request may see every one of these
+    tickets, i.e. holds admission to each gated event they belong to.
+    """
+    active = active_event_ids()
+    if not active:
+        return
+    event_ids = Ticket.objects.filter(id__in=ticket_ids).values_list('event_id', flat=True).distinct()
+    for event_id in event_ids:
+        require_admission(request, event_id=event_id)
@@ -0,0 +1,115 @@
+"""
+JWT authentication backed by a per-process cache of authenticated users.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .tokens import get_token_version
+
+
+class UserCache:
+    """
+    Thread-safe LRU of users with a per-entry time to live.
+
+    Entries are stored per user id together with the token version they were
+    loaded for, so a lookup only hits when the token carries that version.
+    """
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id, token_version):
+        """Return the cached user for this token version, or None."""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            version, user, expires_at = entry
+            if version != token_version or expires_at <= time.monotonic():
+                del self._entries[user_id]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return user
+
+    def set(self, user_id, token_version, user):
+        """Cache a user loaded for the given token version."""
+        if self.max_size <= 0:
+            return
+
+        with self._lock:
+            self._entries[user_id] = (token_version, user, time.monotonic() + self.ttl)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        """Drop any cached entry for the user."""
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+user_cache = UserCache(
+    max_size=getattr(settings, 'AUTH_USER_CACHE_SIZE', 10000),
+    ttl=getattr(settings, 'AUTH_USER_CACHE_TTL', 60),
+)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that resolves users from the per-process user cache.
+
+    A cache miss loads the user like simplejwt does and additionally rejects
+    tokens whose token_version no longer matches the user's. Local entries
+    are invalidated on save and delete; other processes pick up changes
+    within AUTH_USER_CACHE_TTL seconds.
+    """
+
+    cache = user_cache
+
+    def get_user(self, validated_token):
+        try:
+            user_id = str(validated_token[api_settings.USER_ID_CLAIM])
+        except KeyError as e:
+            raise InvalidToken(
+                _('Token contained no recognizable user identification')
+            ) from e
+
+        token_version = get_token_version(validated_token)
+        user = self.cache.get(user_id, token_version)
+        if user is None:
+            user = super().get_user(validated_token)
+            if user.token_version != token_version:
+                raise AuthenticationFailed(
+                    _('Token has been revoked'), code='token_revoked'
+                )
+            self.cache.set(user_id, token_version, user)
+
+        # Each request gets its own instance so views can modify it safely
+        return copy.copy(user)
@@ -0,0 +1,154 @@
+"""
+In-memory bloom filter in front of the refresh-token blacklist.
+"""
+import hashlib
+import logging
+import math
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """
+    Fixed-size bloom filter over strings.
+
+    Membership tests never return false negatives; false positives occur at
+    roughly ``error_rate`` while fewer than ``capacity`` keys were added.
+    """
+
+    def __init__(self, capacity, error_rate=0.001):
+        self.capacity = max(int(capacity), 1)
+        self.error_rate = error_rate
+        self.size = max(
+            8, math.ceil(-self.capacity * math.log(error_rate) / (math.log(2) ** 2))
+        )
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key):
+        # Kirsch-Mitzenmacher double hashing from a single 128-bit digest
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, key):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+
+    def is_saturated(self):
+        """Whether more keys were added than the filter was sized for."""
+        return self.count > self.capacity
+
+
+class BlacklistIndex:
+    """
+    Answers "is this jti blacklisted?" mostly without touching the database.
+
+    The bloom filter is built from BlacklistedToken on first use and then
+    kept current at most every ``sync_interval`` seconds. Ids are allocated
+    before their rows commit, so a row can become visible after one with a
+    higher id; each sync therefore re-scans from the last id blacklisted
+    more than ``sync_overlap`` seconds ago rather than from the highest id
+    seen. Tokens blacklisted by this process are added immediately. A
+    negative answer is final; a positive one is confirmed with a single
+    indexed query.
+    """
+
+    def __init__(self, error_rate, sync_interval, rebuild_interval, sync_overlap=60.0, min_capacity=100000):
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self.rebuild_interval = rebuild_interval
+        self.sync_overlap = sync_overlap
+        self.min_capacity = min_capacity
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forget all state; the next lookup rebuilds from the database."""
+        with self._lock:
+            self._bloom = None
+            self._settled_id = 0
+            self._synced_at = 0.0
+            self._built_at = 0.0
+
+    def _scan(self, bloom, after_id):
+        """
+        Add the rows with an id above ``after_id`` to ``bloom``. Returns the
+        id the next scan can start from: the end of the leading run of rows
+        blacklisted more than ``sync_overlap`` seconds ago.
+        """
+        settled_before = timezone.now() - timedelta(seconds=self.sync_overlap)
+        settled_id = after_id
+        settling = True
+        rows = BlacklistedToken.objects.filter(
+            id__gt=after_id
+        ).order_by('id').values_list('id', 'token__jti', 'blacklisted_at')
+        for blacklisted_id, jti, blacklisted_at in rows.iterator(chunk_size=10000):
+            # Rows of the overlap are seen again on every sync; count them once
+            if jti not in bloom:
+                bloom.add(jti)
+            if settling and blacklisted_at < settled_before:
+                settled_id = blacklisted_id
+            else:
+                settling = False
+        return settled_id
+
+    def _rebuild(self):
+        count = BlacklistedToken.objects.count()
+        bloom = BloomFilter(max(count * 2, self.min_capacity), self.error_rate)
+        self._settled_id = self._scan(bloom, 0)
+        self._bloom = bloom
+        self._synced_at = self._built_at = time.monotonic()
+        logger.info(f'Token blacklist bloom filter rebuilt with {count} entries')
+
+    def _sync(self):
+        self._settled_id = self._scan(self._bloom, self._settled_id)
+        self._synced_at = time.monotonic()
+
+    def _refresh_if_due(self):
+        now = time.monotonic()
+        with self._lock:
+            if (
+                self._bloom is None
+                or self._bloom.is_saturated()
+                or now - self._built_at >= self.rebuild_interval
+            ):
+                self._rebuild()
+            elif now - self._synced_at >= self.sync_interval:
+                self._sync()
+
+    def add(self, jti):
+        """Record a jti blacklisted by this process."""
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(jti)
+
+    def is_blacklisted(self, jti):
+        self._refresh_if_due()
+        if jti not in self._bloom:
+            return False
+        return BlacklistedToken.objects.filter(token__jti=jti).exists()
+
+
+blacklist_index = BlacklistIndex(
+    error_rate=getattr(settings, 'TOKEN_BLACKLIST_BLOOM_ERROR_RATE', 0.001),
+    sync_interval=getattr(settings, 'TOKEN_BLACKLIST_SYNC_INTERVAL', 1.0),
+    rebuild_interval=getattr(settings, 'TOKEN_BLACKLIST_REBUILD_INTERVAL', 3600.0),
+    sync_overlap=getattr(settings, 'TOKEN_BLACKLIST_SYNC_OVERLAP', 60.0),
+)
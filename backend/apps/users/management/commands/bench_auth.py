@@ -0,0 +1,64 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from users.authentication import CachedJWTAuthentication
+from users.tokens import VersionedRefreshToken
+from users.views import UserProfileView
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Benchmark authenticated request throughput with and without the user cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=5000,
+            help='Number of profile requests per authentication class (default: 5000)'
+        )
+
+    def handle(self, *args, **options):
+        # Everything runs in a transaction that is rolled back at the end
+        with transaction.atomic():
+            user = User.objects.create_user(
+                email='bench-auth@crowdbolt.com',
+                password='BenchPass123!'
+            )
+            access_token = str(VersionedRefreshToken.for_user(user).access_token)
+
+            for auth_class in (JWTAuthentication, CachedJWTAuthentication):
+                self.run_benchmark(auth_class, access_token, options['requests'])
+
+            transaction.set_rollback(True)
+
+    def run_benchmark(self, auth_class, access_token, total_requests):
+        """Issue GET /api/auth/profile/ through the view and report throughput."""
+        view = UserProfileView.as_view(authentication_classes=[auth_class])
+        factory = APIRequestFactory()
+        CachedJWTAuthentication.cache.clear()
+
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            for _ in range(total_requests):
+                request = factory.get(
+                    '/api/auth/profile/',
+                    HTTP_AUTHORIZATION=f'Bearer {access_token}'
+                )
+                response = view(request)
+                assert response.status_code == 200, response.status_code
+            elapsed = time.perf_counter() - start
+
+        self.stdout.write(
+            f'{auth_class.__name__:<26} '
+            f'{total_requests / elapsed:>9.0f} req/s  '
+            f'{elapsed / total_requests * 1e6:>7.1f} us/req  '
+            f'{len(queries) / total_requests:.3f} queries/req'
+        )
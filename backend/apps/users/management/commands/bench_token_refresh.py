@@ -0,0 +1,94 @@
+import statistics
+import time
+import uuid
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from users.blacklist import blacklist_index
+from users.serializers import VersionedTokenRefreshSerializer
+from users.tokens import VersionedRefreshToken
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark refresh latency against a large token history. '
+        'Use --tokens 10000000 for the 10M-token scenario.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tokens',
+            type=int,
+            default=1000000,
+            help='Historical outstanding tokens to create, half blacklisted (default: 1000000)'
+        )
+        parser.add_argument(
+            '--refreshes',
+            type=int,
+            default=500,
+            help='Refresh requests timed per implementation (default: 500)'
+        )
+
+    def handle(self, *args, **options):
+        # Everything runs in a transaction that is rolled back at the end
+        with transaction.atomic():
+            user = User.objects.create_user(
+                email='bench-refresh@crowdbolt.com',
+                password='BenchPass123!'
+            )
+            self.create_history(user, options['tokens'])
+
+            blacklist_index.reset()
+            start = time.perf_counter()
+            blacklist_index.is_blacklisted('warm-up')
+            self.stdout.write(f'Bloom filter build: {time.perf_counter() - start:.2f}s')
+
+            for serializer_class, token_class in (
+                (TokenRefreshSerializer, RefreshToken),
+                (VersionedTokenRefreshSerializer, VersionedRefreshToken),
+            ):
+                self.run_benchmark(serializer_class, token_class, user, options['refreshes'])
+
+            transaction.set_rollback(True)
+
+    def create_history(self, user, total, batch_size=10000):
+        """Insert history rows in bulk, blacklisting every other one."""
+        self.stdout.write(f'Creating {total} historical tokens...')
+        expires_at = timezone.now() + timedelta(days=7)
+
+        for start in range(0, total, batch_size):
+            tokens = OutstandingToken.objects.bulk_create([
+                OutstandingToken(user=user, jti=uuid.uuid4().hex, token='', expires_at=expires_at)
+                for _ in range(min(batch_size, total - start))
+            ])
+            BlacklistedToken.objects.bulk_create([
+                BlacklistedToken(token=token) for token in tokens[::2]
+            ])
+
+    def run_benchmark(self, serializer_class, token_class, user, total_refreshes):
+        """Time full refresh round trips (verify, blacklist, rotate)."""
+        refresh = str(token_class.for_user(user))
+        timings = []
+
+        for _ in range(total_refreshes):
+            start = time.perf_counter()
+            serializer = serializer_class(data={'refresh': refresh})
+            serializer.is_valid(raise_exception=True)
+            timings.append(time.perf_counter() - start)
+            refresh = serializer.validated_data['refresh']
+
+        timings.sort()
+        self.stdout.write(
+            f'{serializer_class.__name__:<32} '
+            f'p50 {statistics.median(timings) * 1000:6.2f} ms  '
+            f'p99 {timings[int(len(timings) * 0.99) - 1] * 1000:6.2f} ms'
+        )
@@ -0,0 +1,153 @@
+import csv
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+
+User = get_user_model()
+
+VALID_ROLES = {choice for choice, _ in User.ROLE_CHOICES}
+
+
+class Command(BaseCommand):
+    help = (
+        'Bulk-create users from a CSV file with columns: email, and optionally '
+        'password, password_hash, first_name, last_name, role. Rows with a '
+        'password_hash are stored as-is; plain passwords are hashed in parallel.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_path', help='Path to the CSV file to import')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of users inserted per transaction (default: 1000)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Threads used to hash plain-text passwords (default: CPU count)'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be at least 1')
+
+        try:
+            csv_file = open(options['csv_path'], newline='', encoding='utf-8')
+        except OSError as e:
+            raise CommandError(f'Cannot open {options["csv_path"]}: {e}')
+
+        created = skipped = 0
+        seen_emails = set()
+
+        with csv_file, ThreadPoolExecutor(max_workers=max(options['workers'], 1)) as pool:
+            reader = csv.DictReader(csv_file)
+            if not reader.fieldnames or 'email' not in reader.fieldnames:
+                raise CommandError('CSV file must have an "email" column')
+
+            batch = []
+            for line_number, row in enumerate(reader, start=2):
+                user_data = self.parse_row(row, line_number)
+                if user_data is None or user_data['email'] in seen_emails:
+                    skipped += 1
+                    continue
+                seen_emails.add(user_data['email'])
+                batch.append(user_data)
+
+                if len(batch) >= batch_size:
+                    batch_created = self.import_batch(batch, pool)
+                    created += batch_created
+                    skipped += len(batch) - batch_created
+                    batch = []
+
+            if batch:
+                batch_created = self.import_batch(batch, pool)
+                created += batch_created
+                skipped += len(batch) - batch_created
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Imported {created} users ({skipped} skipped)')
+        )
+
+    def parse_row(self, row, line_number):
+        """Normalize and validate a CSV row, returning None for rejected rows."""
+        email = User.objects.normalize_email((row.get('email') or '').strip())
+        try:
+            validate_email(email)
+        except ValidationError:
+            self.stderr.write(f'Line {line_number}: invalid email "{email}", skipping')
+            return None
+
+        role = (row.get('role') or '').strip() or 'buyer'
+        if role not in VALID_ROLES:
+            self.stderr.write(f'Line {line_number}: invalid role "{role}", skipping')
+            return None
+
+        password_hash = (row.get('password_hash') or '').strip()
+        if password_hash:
+            try:
+                identify_hasher(password_hash)
+            except ValueError:
+                self.stderr.write(f'Line {line_number}: unrecognized password hash, skipping')
+                return None
+
+        return {
+            'email': email,
+            'password': row.get('password') or None,
+            'password_hash': password_hash or None,
+            'first_name': (row.get('first_name') or '').strip(),
+            'last_name': (row.get('last_name') or '').strip(),
+            'role': role,
+        }
+
+    def import_batch(self, batch, pool):
+        """Insert one batch of users and return how many were created."""
+        existing = set(
+            User.objects.filter(
+                email__in=[user_data['email'] for user_data in batch]
+            ).values_list('email', flat=True)
+        )
+        batch = [user_data for user_data in batch if user_data['email'] not in existing]
+        if not batch:
+            return 0
+
+        # Hashing dominates the import; hashlib and argon2 release the GIL
+        to_hash = [user_data for user_data in batch if not user_data['password_hash']]
+        hashes = pool.map(make_password, [user_data['password'] for user_data in to_hash])
+        for user_data, password_hash in zip(to_hash, hashes):
+            user_data['password_hash'] = password_hash
+
+        usernames = User.objects.allocate_usernames(
+            user_data['email'].split('@')[0] for user_data in batch
+        )
+
+        users = [
+            User(
+                email=user_data['email'],
+                username=username,
+                password=user_data['password_hash'],
+                first_name=user_data['first_name'],
+                last_name=user_data['last_name'],
+                role=user_data['role'],
+            )
+            for user_data, username in zip(batch, usernames)
+        ]
+
+        try:
+            with transaction.atomic():
+                User.objects.bulk_create(users)
+        except IntegrityError as e:
+            raise CommandError(
+                f'Batch starting at {batch[0]["email"]} conflicts with existing users: {e}'
+            )
+
+        return len(users)
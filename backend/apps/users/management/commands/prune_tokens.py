@@ -0,0 +1,75 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete expired outstanding refresh tokens (and their blacklist rows) in '
+        'small batches. Unlike flushexpiredtokens, no single statement holds '
+        'locks for long; use --loop to keep pruning as a background worker.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Tokens deleted per transaction (default: 5000)'
+        )
+        parser.add_argument(
+            '--pause',
+            type=float,
+            default=0.1,
+            help='Seconds to sleep between batches (default: 0.1)'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running, pruning every --interval seconds'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=300,
+            help='Seconds between pruning passes with --loop (default: 300)'
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+
+        while True:
+            deleted = self.prune(options['batch_size'], options['pause'])
+            self.stdout.write(f'Pruned {deleted} expired tokens')
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+    def prune(self, batch_size, pause):
+        """Delete tokens expired before now, oldest first, one batch at a time."""
+        now = timezone.now()
+        total = 0
+
+        while True:
+            ids = list(
+                OutstandingToken.objects.filter(expires_at__lte=now)
+                .order_by('expires_at')
+                .values_list('id', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+
+            with transaction.atomic():
+                # Blacklist rows go with their token through the cascade
+                OutstandingToken.objects.filter(id__in=ids).only('id').delete()
+            total += len(ids)
+
+            if len(ids) < batch_size:
+                break
+            time.sleep(pause)
+
+        return total
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.6 on 2026-10-18 23:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0002_user_created_at_user_updated_at_alter_user_username_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="token_version",
+            field=models.PositiveIntegerField(
+                default=0,
+                help_text="Bumped when is_active, role or password changes to revoke issued tokens",
+            ),
+        ),
+    ]
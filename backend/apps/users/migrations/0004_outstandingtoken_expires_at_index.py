@@ -0,0 +1,20 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """Index the simplejwt outstanding token expiry so prune_tokens can batch by it."""
+
+    dependencies = [
+        ("users", "0003_user_token_version"),
+        ("token_blacklist", "0013_alter_blacklistedtoken_options_and_more"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=(
+                "CREATE INDEX IF NOT EXISTS outstanding_token_expires_idx "
+                "ON token_blacklist_outstandingtoken (expires_at)"
+            ),
+            reverse_sql="DROP INDEX IF EXISTS outstanding_token_expires_idx",
+        ),
+    ]
@@ -1,12 +1,22 @@
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.contrib.auth.password_validation import validate_password
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from django.core.validators import validate_email
 from django.core.exceptions import ValidationError
 import logging
+import re
 
 logger = logging.getLogger(__name__)
 
+# How many times save() re-allocates a username after losing a race for it
+USERNAME_ALLOCATION_ATTEMPTS = 3
+
+# Number of username prefixes OR-ed together in a single lookup query
+USERNAME_PREFIX_CHUNK_SIZE = 100
+
+# Fields whose change invalidates issued JWTs and cached authenticated users
+TOKEN_VERSION_FIELDS = ('is_active', 'role', 'password')
+
 
 class UserManager(BaseUserManager):
     """Custom user manager for email-based authentication."""
@@ -62,6 +72,48 @@ class UserManager(BaseUserManager):
 
         return self._create_user(email, password, **extra_fields)
 
+    def allocate_usernames(self, bases, exclude_pk=None):
+        """
+        Pick a free username for each base, in order.
+
+        Existing usernames of the form ``base`` or ``base<digits>`` are
+        fetched in one query per chunk of bases, so the cost does not grow
+        with the number of users already named e.g. ``john`` or
+        ``johnny``. The first free candidate in
+        ``base, base1, base2, ...`` wins, and duplicate bases in ``bases``
+        receive distinct suffixes.
+        """
+        bases = list(bases)
+        if not bases:
+            return []
+
+        taken = set()
+        distinct_bases = sorted(set(bases))
+        for start in range(0, len(distinct_bases), USERNAME_PREFIX_CHUNK_SIZE):
+            prefix_filter = models.Q()
+            for base in distinct_bases[start:start + USERNAME_PREFIX_CHUNK_SIZE]:
+                # The prefix lets the index narrow the scan; the pattern drops
+                # longer names such as johnny for john
+                prefix_filter |= models.Q(
+                    username__startswith=base, username__regex=rf'^{re.escape(base)}[0-9]*$'
+                )
+
+            queryset = self.get_queryset().filter(prefix_filter)
+            if exclude_pk is not None:
+                queryset = queryset.exclude(pk=exclude_pk)
+            taken.update(queryset.values_list('username', flat=True))
+
+        usernames = []
+        for base in bases:
+            username = base
+            counter = 1
+            while username in taken:
+                username = f"{base}{counter}"
+                counter += 1
+            taken.add(username)
+            usernames.append(username)
+        return usernames
+
 
 class User(AbstractUser):
     """Custom user model for CrowdBolt marketplace."""
@@ -117,6 +169,11 @@ class User(AbstractUser):
         help_text='Timestamp of last failed login attempt'
     )
 
+    token_version = models.PositiveIntegerField(
+        default=0,
+        help_text='Bumped when is_active, role or password changes to revoke issued tokens'
+    )
+
     # Timestamps for audit and ordering
     created_at = models.DateTimeField(
         auto_now_add=True,
@@ -153,22 +210,71 @@ class User(AbstractUser):
             ),
         ]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the token-relevant fields as loaded, to detect changes on save."""
+        instance = super().from_db(db, field_names, values)
+        instance._token_snapshot = instance._get_token_snapshot()
+        return instance
+
+    def _get_token_snapshot(self):
+        # Read from __dict__ so deferred fields are not loaded just for this
+        return tuple(self.__dict__.get(field) for field in TOKEN_VERSION_FIELDS)
+
+    def _bump_token_version_if_needed(self, kwargs):
+        """Increment token_version when is_active, role or password changed."""
+        snapshot = getattr(self, '_token_snapshot', None)
+        if snapshot is None or snapshot == self._get_token_snapshot():
+            return
+
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            if not set(update_fields) & set(TOKEN_VERSION_FIELDS):
+                return
+            kwargs['update_fields'] = set(update_fields) | {'token_version'}
+
+        self.token_version += 1
+
+    def _refresh_token_snapshot(self, update_fields):
+        """Record the saved values, keeping the old ones of fields update_fields left out."""
+        current = self._get_token_snapshot()
+        snapshot = getattr(self, '_token_snapshot', None)
+        if update_fields is None or snapshot is None:
+            self._token_snapshot = current
+            return
+        self._token_snapshot = tuple(
+            new if field in update_fields else old
+            for field, old, new in zip(TOKEN_VERSION_FIELDS, snapshot, current)
+        )
+
     def save(self, *args, **kwargs):
         """Override save to auto-generate username from email if not provided."""
-        if not self.username and self.email:
-            # Generate unique username from email
-            base_username = self.email.split('@')[0]
-            username = base_username
-            counter = 1
-
-            # Ensure username is unique
-            while User.objects.filter(username=username).exclude(pk=self.pk).exists():
-                username = f"{base_username}{counter}"
-                counter += 1
-
-            self.username = username
-
-        super().save(*args, **kwargs)
+        self._bump_token_version_if_needed(kwargs)
+        self._refresh_token_snapshot(kwargs.get('update_fields'))
+
+        if self.username or not self.email:
+            super().save(*args, **kwargs)
+            return
+
+        base_username = self.email.split('@')[0]
+        for attempt in range(USERNAME_ALLOCATION_ATTEMPTS):
+            self.username = User.objects.allocate_usernames(
+                [base_username], exclude_pk=self.pk
+            )[0]
+            try:
+                # Savepoint so a lost race does not poison the outer transaction
+                with transaction.atomic(using=kwargs.get('using')):
+                    super().save(*args, **kwargs)
+                return
+            except IntegrityError:
+                # Only retry when another user grabbed the same username
+                lost_race = User.objects.filter(
+                    username=self.username
+                ).exclude(pk=self.pk).exists()
+                if not lost_race or attempt == USERNAME_ALLOCATION_ATTEMPTS - 1:
+                    self.username = None
+                    raise
+                logger.info(f'Username {self.username} taken concurrently, retrying')
 
     def __str__(self):
         return self.email
@@ -2,6 +2,11 @@ from rest_framework import serializers
 from django.contrib.auth import get_user_model, authenticate
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+
+from .tokens import VersionedRefreshToken, get_token_version
 
 User = get_user_model()
 
@@ -125,4 +130,22 @@ class UserProfileSerializer(serializers.ModelSerializer):
         read_only_fields = (
             'id', 'date_joined', 'created_at', 'updated_at',
             'is_verified', 'identity_verified'
-        )
\ No newline at end of file
+        )
+
+
+class VersionedTokenRefreshSerializer(TokenRefreshSerializer):
+    """Token refresh serializer that rejects tokens issued before a token_version bump."""
+
+    token_class = VersionedRefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        user_id = refresh.payload.get(api_settings.USER_ID_CLAIM)
+
+        if user_id and not User.objects.filter(
+            **{api_settings.USER_ID_FIELD: user_id},
+            token_version=get_token_version(refresh.payload),
+        ).exists():
+            raise AuthenticationFailed('Token has been revoked', code='token_revoked')
+
+        return super().validate(attrs)
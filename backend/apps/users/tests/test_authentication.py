@@ -0,0 +1,94 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from users.authentication import CachedJWTAuthentication
+from users.tokens import VersionedRefreshToken
+
+User = get_user_model()
+
+
+class CachedJWTAuthenticationTests(APITestCase):
+    """Test suite for the cached JWT authentication class."""
+
+    def setUp(self):
+        CachedJWTAuthentication.cache.clear()
+        self.user = User.objects.create_user(
+            email='test@crowdbolt.com',
+            password='TestPass123!'
+        )
+        self.profile_url = reverse('users:profile')
+        self.refresh = VersionedRefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.refresh.access_token}')
+
+    def test_repeated_requests_skip_user_query(self):
+        """Test the user is loaded once and then served from the cache."""
+        self.client.get(self.profile_url)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.profile_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['email'], self.user.email)
+
+    def test_profile_update_refreshes_cached_user(self):
+        """Test saving the user evicts the stale cached copy."""
+        self.client.get(self.profile_url)
+        self.client.patch(self.profile_url, {'first_name': 'Updated'})
+
+        response = self.client.get(self.profile_url)
+
+        self.assertEqual(response.data['first_name'], 'Updated')
+
+    def test_role_change_revokes_tokens(self):
+        """Test changing the role bumps token_version and rejects old tokens."""
+        self.client.get(self.profile_url)
+        self.user.role = 'seller'
+        self.user.save()
+
+        response = self.client.get(self.profile_url)
+
+        self.assertEqual(self.user.token_version, 1)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_password_change_revokes_refresh_token(self):
+        """Test a password change also prevents refreshing old tokens."""
+        self.user.set_password('NewPass123!')
+        self.user.save()
+
+        response = self.client.post(
+            reverse('users:token_refresh'), {'refresh': str(self.refresh)}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivated_user_rejected(self):
+        """Test deactivating the user rejects requests with old tokens."""
+        self.client.get(self.profile_url)
+        self.user.is_active = False
+        self.user.save(update_fields=['is_active'])
+
+        response = self.client.get(self.profile_url)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_unrelated_save_keeps_tokens_valid(self):
+        """Test saves that do not touch tracked fields keep the token version."""
+        self.user.reset_failed_login_attempts()
+
+        response = self.client.get(self.profile_url)
+
+        self.assertEqual(self.user.token_version, 0)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_change_left_out_of_update_fields_still_revokes(self):
+        """Test a role change survives a save whose update_fields skip it."""
+        self.user.role = 'seller'
+        self.user.save(update_fields=['first_name'])
+        self.assertEqual(self.user.token_version, 0)
+
+        self.user.save()
+
+        self.assertEqual(self.user.token_version, 1)
+        self.assertEqual(User.objects.get(pk=self.user.pk).token_version, 1)
@@ -0,0 +1,106 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from users.blacklist import BloomFilter, blacklist_index
+from users.tokens import VersionedRefreshToken
+
+User = get_user_model()
+
+
+class BloomFilterTests(TestCase):
+    """Test suite for the bloom filter."""
+
+    def test_no_false_negatives(self):
+        """Test every added key is reported as present."""
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        keys = [f'jti-{i}' for i in range(1000)]
+        for key in keys:
+            bloom.add(key)
+
+        self.assertTrue(all(key in bloom for key in keys))
+
+    def test_false_positive_rate_close_to_target(self):
+        """Test absent keys are rarely reported as present."""
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        for i in range(1000):
+            bloom.add(f'jti-{i}')
+
+        false_positives = sum(f'other-{i}' in bloom for i in range(10000))
+
+        self.assertLess(false_positives, 300)
+
+
+class TokenBlacklistTests(APITestCase):
+    """Test suite for refresh-token blacklisting through the bloom filter index."""
+
+    def setUp(self):
+        blacklist_index.reset()
+        self.user = User.objects.create_user(
+            email='test@crowdbolt.com',
+            password='TestPass123!'
+        )
+        self.refresh_url = reverse('users:token_refresh')
+
+    def test_rotated_refresh_token_cannot_be_reused(self):
+        """Test a refresh token is blacklisted once it has been rotated."""
+        refresh = str(VersionedRefreshToken.for_user(self.user))
+
+        first = self.client.post(self.refresh_url, {'refresh': refresh})
+        second = self.client.post(self.refresh_url, {'refresh': refresh})
+
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_token_blacklisted_by_other_process_is_detected(self):
+        """Test rows written outside this process are picked up on sync."""
+        refresh = VersionedRefreshToken.for_user(self.user)
+        blacklist_index.is_blacklisted('warm-up')
+        BlacklistedToken.objects.create(
+            token=OutstandingToken.objects.get(jti=refresh['jti'])
+        )
+        self.addCleanup(setattr, blacklist_index, 'sync_interval', blacklist_index.sync_interval)
+        blacklist_index.sync_interval = 0
+
+        response = self.client.post(self.refresh_url, {'refresh': str(refresh)})
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_row_committed_out_of_id_order_is_detected(self):
+        """Test a row with a lower id than one already synced is still picked up."""
+        first, second = (VersionedRefreshToken.for_user(self.user) for _ in range(2))
+        self.addCleanup(setattr, blacklist_index, 'sync_interval', blacklist_index.sync_interval)
+        blacklist_index.sync_interval = 0
+        BlacklistedToken.objects.create(id=1000, token=OutstandingToken.objects.get(jti=second['jti']))
+        self.assertTrue(blacklist_index.is_blacklisted(second['jti']))
+
+        BlacklistedToken.objects.create(id=500, token=OutstandingToken.objects.get(jti=first['jti']))
+
+        self.assertTrue(blacklist_index.is_blacklisted(first['jti']))
+
+
+class PruneTokensCommandTests(TestCase):
+    """Test suite for the prune_tokens management command."""
+
+    def test_prune_deletes_only_expired_tokens(self):
+        """Test expired tokens and their blacklist rows are removed in batches."""
+        now = timezone.now()
+        expired = OutstandingToken.objects.bulk_create([
+            OutstandingToken(jti=f'expired-{i}', token='', expires_at=now - timedelta(days=1))
+            for i in range(5)
+        ])
+        OutstandingToken.objects.create(jti='live', token='', expires_at=now + timedelta(days=1))
+        BlacklistedToken.objects.create(token=expired[0])
+
+        call_command('prune_tokens', batch_size=2, pause=0, stdout=StringIO())
+
+        self.assertEqual(list(OutstandingToken.objects.values_list('jti', flat=True)), ['live'])
+        self.assertFalse(BlacklistedToken.objects.exists())
@@ -0,0 +1,76 @@
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.test import TestCase
+
+User = get_user_model()
+
+
+class ImportUsersCommandTests(TestCase):
+    """Test suite for the import_users management command."""
+
+    def write_csv(self, content):
+        fd, path = tempfile.mkstemp(suffix='.csv')
+        with os.fdopen(fd, 'w') as f:
+            f.write(content)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_import_users_with_plain_and_hashed_passwords(self):
+        """Test users are created with usable passwords from either column."""
+        prehashed = make_password('HashedPass123!')
+        path = self.write_csv(
+            'email,password,password_hash,first_name,role\n'
+            'alice@crowdbolt.com,PlainPass123!,,Alice,seller\n'
+            f'bob@crowdbolt.com,,{prehashed},Bob,\n'
+        )
+
+        call_command('import_users', path, workers=2, stdout=StringIO())
+
+        alice = User.objects.get(email='alice@crowdbolt.com')
+        bob = User.objects.get(email='bob@crowdbolt.com')
+        self.assertTrue(alice.check_password('PlainPass123!'))
+        self.assertEqual(alice.role, 'seller')
+        self.assertEqual(alice.first_name, 'Alice')
+        self.assertTrue(bob.check_password('HashedPass123!'))
+        self.assertEqual(bob.role, 'buyer')
+
+    def test_import_users_allocates_unique_usernames(self):
+        """Test shared local parts get distinct usernames within a batch."""
+        User.objects.create_user('john@crowdbolt.com', 'TestPass123!')
+        path = self.write_csv(
+            'email,password\n'
+            'john@example.com,TestPass123!\n'
+            'john@test.com,TestPass123!\n'
+        )
+
+        call_command('import_users', path, stdout=StringIO())
+
+        self.assertEqual(
+            set(User.objects.values_list('username', flat=True)),
+            {'john', 'john1', 'john2'}
+        )
+
+    def test_import_users_skips_existing_and_invalid_rows(self):
+        """Test duplicate emails, bad emails and bad roles are skipped."""
+        User.objects.create_user('existing@crowdbolt.com', 'TestPass123!')
+        path = self.write_csv(
+            'email,password,role\n'
+            'existing@crowdbolt.com,TestPass123!,buyer\n'
+            'not-an-email,TestPass123!,buyer\n'
+            'new@crowdbolt.com,TestPass123!,superhero\n'
+            'new@crowdbolt.com,TestPass123!,buyer\n'
+            'new@crowdbolt.com,TestPass123!,buyer\n'
+        )
+
+        call_command(
+            'import_users', path,
+            stdout=StringIO(), stderr=StringIO()
+        )
+
+        self.assertEqual(User.objects.count(), 2)
+        self.assertTrue(User.objects.filter(email='new@crowdbolt.com').exists())
@@ -73,4 +73,47 @@ class UserModelTests(TestCase):
             password='TestPass123!'
         )
         
-        self.assertEqual(str(user), 'test@crowdbolt.com')
\ No newline at end of file
+        self.assertEqual(str(user), 'test@crowdbolt.com')
+
+
+class UsernameAllocationTests(TestCase):
+    """Test suite for username generation from email."""
+
+    def test_username_generated_from_email(self):
+        """Test username defaults to the email local part."""
+        user = User.objects.create_user('john@crowdbolt.com', 'TestPass123!')
+
+        self.assertEqual(user.username, 'john')
+
+    def test_username_suffix_for_shared_local_part(self):
+        """Test users sharing a local part get increasing suffixes."""
+        first = User.objects.create_user('john@crowdbolt.com', 'TestPass123!')
+        second = User.objects.create_user('john@example.com', 'TestPass123!')
+        third = User.objects.create_user('john@test.com', 'TestPass123!')
+
+        self.assertEqual(first.username, 'john')
+        self.assertEqual(second.username, 'john1')
+        self.assertEqual(third.username, 'john2')
+
+    def test_username_allocation_query_count_is_constant(self):
+        """Test allocation uses one lookup regardless of existing suffixes."""
+        User.objects.bulk_create([
+            User(email=f'john{i}@example.com', username='john' if i == 0 else f'john{i}')
+            for i in range(30)
+        ])
+
+        with self.assertNumQueries(1):
+            usernames = User.objects.allocate_usernames(['john', 'john', 'jane'])
+
+        self.assertEqual(usernames, ['john30', 'john31', 'jane'])
+
+    def test_username_allocation_ignores_longer_names(self):
+        """Test only the base and its numeric suffixes count as taken, even with regex characters."""
+        User.objects.bulk_create([
+            User(email=f'{name}@example.com', username=name)
+            for name in ['johnny', 'john.doe', 'john1a', 'j+x', 'j+x1', 'jjx2']
+        ])
+
+        usernames = User.objects.allocate_usernames(['john', 'j+x'])
+
+        self.assertEqual(usernames, ['john', 'j+x2'])
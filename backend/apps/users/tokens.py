@@ -0,0 +1,42 @@
+"""
+JWT token classes carrying the user's token version.
+"""
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .blacklist import blacklist_index
+
+# Claim holding User.token_version at issue time; tokens without it are version 0
+TOKEN_VERSION_CLAIM = 'token_version'
+
+
+def get_token_version(token):
+    """Return the token version claim of a validated token."""
+    return token.get(TOKEN_VERSION_CLAIM, 0)
+
+
+class VersionedRefreshToken(RefreshToken):
+    """
+    Refresh token stamped with the user's token_version.
+
+    The claim is copied to access tokens derived from it, so bumping
+    User.token_version revokes every token issued before the change.
+    Blacklist checks go through the in-memory bloom filter index.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token[TOKEN_VERSION_CLAIM] = user.token_version
+        return token
+
+    def check_blacklist(self):
+        if blacklist_index.is_blacklisted(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_('Token is blacklisted'))
+
+    def blacklist(self):
+        result = super().blacklist()
+        blacklist_index.add(self.payload[api_settings.JTI_CLAIM])
+        return result
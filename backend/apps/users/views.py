@@ -2,15 +2,16 @@ from rest_framework import status
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenRefreshView as SimpleJWTTokenRefreshView
 from django.contrib.auth import get_user_model
 
 from .serializers import (
     UserRegistrationSerializer,
     UserLoginSerializer,
-    UserProfileSerializer
+    UserProfileSerializer,
+    VersionedTokenRefreshSerializer
 )
+from .tokens import VersionedRefreshToken
 
 User = get_user_model()
 
@@ -27,7 +28,7 @@ class RegisterView(APIView):
             user = serializer.save()
 
             # Generate JWT tokens
-            refresh = RefreshToken.for_user(user)
+            refresh = VersionedRefreshToken.for_user(user)
             access_token = refresh.access_token
 
             return Response({
@@ -54,7 +55,7 @@ class LoginView(APIView):
             user = serializer.validated_data['user']
 
             # Generate JWT tokens
-            refresh = RefreshToken.for_user(user)
+            refresh = VersionedRefreshToken.for_user(user)
             access_token = refresh.access_token
 
             return Response({
@@ -78,7 +79,7 @@ class LogoutView(APIView):
         refresh_token = request.data.get('refresh')
         if refresh_token:
             try:
-                token = RefreshToken(refresh_token)
+                token = VersionedRefreshToken(refresh_token)
                 token.blacklist()
                 return Response({'message': 'Successfully logged out'}, status=status.HTTP_200_OK)
             except:
@@ -113,4 +114,4 @@ class UserProfileView(APIView):
 
 class TokenRefreshView(SimpleJWTTokenRefreshView):
     """JWT token refresh endpoint."""
-    pass
+    serializer_class = VersionedTokenRefreshSerializer
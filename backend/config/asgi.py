@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+# Tells settings not to keep persistent database connections
+os.environ.setdefault("SERVING_ASGI", "True")
 
 application = get_asgi_application()
@@ -0,0 +1,89 @@
+"""
+Response compression with brotli or gzip.
+
+CompressionMiddleware compresses responses of at least
+RESPONSE_COMPRESSION_MIN_BYTES. It uses brotli when the Brotli package is
+installed and the client accepts 'br', and gzip otherwise. Smaller
+responses are sent as-is, because compressing them costs more CPU than it
+saves on the wire.
+
+Streaming responses (the Server-Sent Events price feed, static files) are
+left alone. Compressing them would buffer events that must be flushed
+straight away, and WhiteNoise already serves precompressed static files.
+
+Like Django's GZipMiddleware, gzip output carries a random-length filename
+header to make BREACH-style length attacks harder.
+"""
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.text import compress_string
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - Brotli is an optional dependency
+    brotli = None
+
+MAX_RANDOM_BYTES = 100
+
+
+def accepted_encodings(header):
+    """Content codings the client accepts, from an Accept-Encoding header."""
+    encodings = set()
+    for item in header.split(','):
+        coding, _, params = item.strip().partition(';')
+        quality = params.strip()
+        if quality.startswith('q='):
+            try:
+                if float(quality[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        if coding:
+            encodings.add(coding.strip().lower())
+    return encodings
+
+
+def choose_encoding(request):
+    """Return 'br', 'gzip' or None for the request."""
+    accepted = accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+    if brotli is not None and ('br' in accepted or '*' in accepted):
+        return 'br'
+    if 'gzip' in accepted or '*' in accepted:
+        return 'gzip'
+    return None
+
+
+def compress(content, encoding):
+    if encoding == 'br':
+        return brotli.compress(content, quality=settings.RESPONSE_BROTLI_QUALITY)
+    return compress_string(content, max_random_bytes=MAX_RANDOM_BYTES)
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """Compress large non-streaming responses with brotli or gzip."""
+
+    def process_response(self, request, response):
+        if response.streaming or response.has_header('Content-Encoding'):
+            return response
+        if len(response.content) < settings.RESPONSE_COMPRESSION_MIN_BYTES:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        encoding = choose_encoding(request)
+        if encoding is None:
+            return response
+
+        compressed = compress(response.content, encoding)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response.headers['Content-Length'] = str(len(compressed))
+
+        # The body changed, so a strong ETag no longer holds (RFC 9110 8.8.1)
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        return response
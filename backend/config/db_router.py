@@ -0,0 +1,130 @@
+"""
+Read-replica routing with read-your-writes stickiness.
+
+ReplicaRoutingMiddleware marks safe (GET/HEAD/OPTIONS) requests to the
+public views listed in settings.REPLICA_READ_VIEWS as allowed to read from a
+replica. ReplicaRouter then sends their reads to one of
+settings.DATABASE_REPLICAS, while all writes, and reads in every other
+context (unsafe requests, other views, management commands, shells), use
+the primary.
+
+A client that writes is pinned to the primary for REPLICA_PIN_SECONDS so it
+does not read its own writes from a lagging replica. Clients sending a
+valid access token are pinned by user id, so the pin follows them across
+addresses and is not shared with others behind the same one; anonymous
+clients are pinned by IP. Pins are stored in the default cache, which is
+shared between workers. Without replicas the middleware steps aside, so
+single-database deployments pay for neither.
+"""
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.urls import Resolver404, resolve
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+from users.utils import get_client_ip
+
+PRIMARY_DB = 'default'
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# Per-request routing state: {'use_replica': bool, 'wrote': bool}, or None
+# outside of a request
+_routing_state = ContextVar('db_routing_state', default=None)
+
+
+_jwt_authentication = JWTAuthentication()
+
+
+def client_id(request):
+    """``user:<id>`` for requests with a valid access token, otherwise ``ip:<address>``."""
+    header = _jwt_authentication.get_header(request)
+    if header is not None:
+        try:
+            raw_token = _jwt_authentication.get_raw_token(header)
+            if raw_token is not None:
+                token = _jwt_authentication.get_validated_token(raw_token)
+                return f'user:{token[api_settings.USER_ID_CLAIM]}'
+        except (AuthenticationFailed, KeyError):
+            pass
+    return f'ip:{get_client_ip(request)}'
+
+
+def _pin_key(client):
+    return f'db-router:primary-pin:{client}'
+
+
+def pin_to_primary(client):
+    """Route this client's reads to the primary for REPLICA_PIN_SECONDS."""
+    cache.set(_pin_key(client), True, timeout=settings.REPLICA_PIN_SECONDS)
+
+
+def is_pinned_to_primary(client):
+    return cache.get(_pin_key(client), False)
+
+
+def _reads_from_replica(request):
+    """Whether the request is a safe one to a view listed in REPLICA_READ_VIEWS."""
+    if request.method not in SAFE_METHODS:
+        return False
+    try:
+        view_name = resolve(request.path_info).view_name
+    except Resolver404:
+        return False
+    return view_name in settings.REPLICA_READ_VIEWS
+
+
+class ReplicaRouter:
+    """Send reads to a random replica when the current request allows it."""
+
+    def db_for_read(self, model, **hints):
+        state = _routing_state.get()
+        if state and state['use_replica'] and settings.DATABASE_REPLICAS:
+            return random.choice(settings.DATABASE_REPLICAS)
+        return PRIMARY_DB
+
+    def db_for_write(self, model, **hints):
+        state = _routing_state.get()
+        if state is not None:
+            # Later reads in this request must see the write
+            state['wrote'] = True
+            state['use_replica'] = False
+        return PRIMARY_DB
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        return True
+
+
+class ReplicaRoutingMiddleware:
+    """Enable replica reads for safe requests to public views from clients that have not just written."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.DATABASE_REPLICAS:
+            # Every read goes to the primary; skip the token decode and pins
+            return self.get_response(request)
+
+        client = client_id(request)
+        state = {
+            'use_replica': (
+                _reads_from_replica(request)
+                and not is_pinned_to_primary(client)
+            ),
+            'wrote': False,
+        }
+        token = _routing_state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _routing_state.reset(token)
+
+        if state['wrote']:
+            pin_to_primary(client)
+        return response
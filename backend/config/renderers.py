@@ -0,0 +1,62 @@
+"""
+Fast JSON rendering for API responses.
+
+FastJSONRenderer encodes with orjson, which is several times faster than
+the stdlib json module DRF's JSONRenderer uses. Its output is
+byte-identical to JSONRenderer in the default compact mode. Values orjson
+does not encode itself (Decimal, lazy strings, datetimes, and so on) go to
+DRF's JSONEncoder, so they are formatted exactly as before. orjson emits
+UUIDs in the same canonical form.
+
+When orjson is not installed the renderer falls back to JSONRenderer, so
+the dependency is optional.
+"""
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+# orjson formats datetimes with microseconds; DRF trims them to milliseconds
+# and writes UTC as 'Z', so leave datetimes to DRF's encoder
+ORJSON_OPTIONS = (
+    orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+    if orjson is not None else 0
+)
+
+# JSONRenderer escapes these so the output is also valid JavaScript
+LINE_SEPARATOR = '\u2028'.encode()
+PARAGRAPH_SEPARATOR = '\u2029'.encode()
+
+_default_encoder = JSONEncoder()
+
+
+def _default(obj):
+    return _default_encoder.default(obj)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer using orjson when it is installed."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context):
+            # orjson only indents by two spaces; keep the stdlib for the
+            # rare client asking for a specific indent
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=_default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            # Fall back for what orjson rejects but JSONRenderer handles or
+            # reports properly, such as integers wider than 64 bits
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if LINE_SEPARATOR in ret or PARAGRAPH_SEPARATOR in ret:
+            ret = ret.replace(LINE_SEPARATOR, b'\\u2028').replace(PARAGRAPH_SEPARATOR, b'\\u2029')
+        return ret
@@ -14,6 +14,7 @@ from pathlib import Path
 from decouple import config
 import os
 import sys
+import tempfile
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -54,6 +55,8 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "config.compression.CompressionMiddleware",
+    "config.db_router.ReplicaRoutingMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -91,13 +94,38 @@ import dj_database_url
 
 if 'DATABASE_URL' in os.environ:
     # Production database (Railway/Heroku)
+    # DB_POOL switches from one persistent connection per worker thread to a
+    # psycopg3 connection pool shared by all threads of a worker process.
+    DB_POOL = config('DB_POOL', default=False, cast=bool)
+    # config/asgi.py sets SERVING_ASGI. Under ASGI, sync ORM calls run on
+    # executor threads outside the request cycle, so persistent connections
+    # are never closed and pile up; only pooled or per-request ones are safe.
+    SERVING_ASGI = config('SERVING_ASGI', default=False, cast=bool)
+
     DATABASES = {
         'default': dj_database_url.config(
             default=config('DATABASE_URL'),
-            conn_max_age=600,
+            conn_max_age=0 if DB_POOL or SERVING_ASGI else 600,
             conn_health_checks=True,
         )
     }
+
+    if DB_POOL:
+        DATABASES['default'].setdefault('OPTIONS', {})['pool'] = {
+            'min_size': config('DB_POOL_MIN_SIZE', default=2, cast=int),
+            'max_size': config('DB_POOL_MAX_SIZE', default=10, cast=int),
+            'timeout': config('DB_POOL_TIMEOUT', default=30, cast=float),
+            'max_idle': config('DB_POOL_MAX_IDLE', default=600, cast=float),
+        }
+
+    # Server-side binding lets psycopg3 prepare statements executed at least
+    # DB_PREPARE_THRESHOLD times on a connection, i.e. the hot queries.
+    # Leave disabled behind transaction-mode PgBouncer.
+    if config('DB_PREPARED_STATEMENTS', default=False, cast=bool):
+        DATABASES['default'].setdefault('OPTIONS', {}).update({
+            'server_side_binding': True,
+            'prepare_threshold': config('DB_PREPARE_THRESHOLD', default=5, cast=int),
+        })
 else:
     # Local development database
     DATABASES = {
@@ -107,6 +135,81 @@ else:
         }
     }
 
+# Read replicas, e.g. DATABASE_REPLICA_URLS=postgres://replica1/db,postgres://replica2/db
+# (two local SQLite files work too). Reads from safe requests to the public
+# views in REPLICA_READ_VIEWS are routed to them by config.db_router;
+# clients are pinned to the primary for REPLICA_PIN_SECONDS after they write.
+DATABASE_REPLICA_URLS = config('DATABASE_REPLICA_URLS', default='', cast=lambda v: [s.strip() for s in v.split(',') if s.strip()])
+DATABASE_REPLICAS = []
+for index, replica_url in enumerate(DATABASE_REPLICA_URLS, start=1):
+    alias = f'replica_{index}'
+    DATABASES[alias] = dj_database_url.parse(
+        replica_url,
+        conn_max_age=DATABASES['default'].get('CONN_MAX_AGE', 0),
+    )
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['config.db_router.ReplicaRouter']
+REPLICA_PIN_SECONDS = config('REPLICA_PIN_SECONDS', default=5, cast=int)
+REPLICA_READ_VIEWS = [
+    'products:event-list',
+    'products:event-batch',
+    'products:event-detail',
+    'products:event-tickets',
+    'products:event-stats',
+    'products:event-page',
+    'products:ticket-list',
+    'products:ticket-batch',
+    'products:ticket-detail',
+    'products:market-stats',
+    'products:trending-events',
+    'products:trending-searches',
+]
+
+# Cache shared by every web worker and by the scheduled management commands
+# (expire_tickets, update_event_status, release_holds, ...). Event cache
+# versions (products.cache), waiting room queues and replica pins only work
+# across processes through it: a per-process cache would never see the
+# bumps made elsewhere. Redis when REDIS_URL is set, otherwise a file-based
+# cache in CACHE_DIR, shared by the processes of one host. Serialized events
+# (products.documents) get their own alias, so their volume does not evict
+# versions and queue state.
+REDIS_URL = config('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        },
+        'event_documents': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': config('EVENT_DOCUMENT_REDIS_URL', default=REDIS_URL),
+            'KEY_PREFIX': 'event-documents',
+        },
+    }
+else:
+    CACHE_DIR = config('CACHE_DIR', default=os.path.join(tempfile.gettempdir(), 'crowdbolt-cache'))
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.path.join(CACHE_DIR, 'default'),
+            'OPTIONS': {'MAX_ENTRIES': config('CACHE_MAX_ENTRIES', default=50000, cast=int)},
+        },
+        'event_documents': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.path.join(CACHE_DIR, 'event-documents'),
+            'OPTIONS': {'MAX_ENTRIES': config('EVENT_DOCUMENT_CACHE_MAX_ENTRIES', default=20000, cast=int)},
+        },
+    }
+
+# The test suite clears caches freely; keep it off the shared caches above
+# so it neither wipes a developer's cache nor depends on what is in it
+if sys.argv[1:2] == ['test']:
+    CACHES = {
+        alias: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': f'test-{alias}'}
+        for alias in CACHES
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -158,9 +261,13 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.CachedJWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'config.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
 }
@@ -182,6 +289,107 @@ SIMPLE_JWT = {
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
 }
 
+# Assumed duration of events without an event_end (see products.lifecycle)
+EVENT_DEFAULT_DURATION_HOURS = config('EVENT_DEFAULT_DURATION_HOURS', default=12, cast=int)
+
+# How long a checkout hold keeps a ticket reserved (see products.reservations)
+TICKET_HOLD_SECONDS = config('TICKET_HOLD_SECONDS', default=600, cast=int)
+
+# Virtual waiting room in front of the ticket endpoints of the top
+# WAITING_ROOM_TRENDING_LIMIT trending events (see products.waiting_room).
+# Queue state lives in the WAITING_ROOM_CACHE cache alias, which must be
+# shared between workers (e.g. Redis) when running more than one.
+WAITING_ROOM_ENABLED = config('WAITING_ROOM_ENABLED', default=False, cast=bool)
+WAITING_ROOM_TRENDING_LIMIT = config('WAITING_ROOM_TRENDING_LIMIT', default=3, cast=int)
+WAITING_ROOM_REFRESH_SECONDS = config('WAITING_ROOM_REFRESH_SECONDS', default=30, cast=int)
+WAITING_ROOM_RATE = config('WAITING_ROOM_RATE', default=50.0, cast=float)
+WAITING_ROOM_BURST = config('WAITING_ROOM_BURST', default=100, cast=int)
+WAITING_ROOM_ADMISSION_SECONDS = config('WAITING_ROOM_ADMISSION_SECONDS', default=900, cast=int)
+WAITING_ROOM_CACHE = config('WAITING_ROOM_CACHE', default='default')
+
+# Outbox dispatcher (see products.outbox): optional webhook receiving each
+# batch as JSON, and attempts before a message is marked failed
+OUTBOX_WEBHOOK_URL = config('OUTBOX_WEBHOOK_URL', default='')
+OUTBOX_WEBHOOK_TIMEOUT = config('OUTBOX_WEBHOOK_TIMEOUT', default=5.0, cast=float)
+OUTBOX_MAX_ATTEMPTS = config('OUTBOX_MAX_ATTEMPTS', default=10, cast=int)
+
+# Server-Sent Events price feed (see products.live): how often each watched
+# event's cache version is checked, every how many polls the snapshot is
+# rebuilt even though the version did not move, and the idle keepalive interval
+LIVE_PRICES_POLL_SECONDS = config('LIVE_PRICES_POLL_SECONDS', default=1.0, cast=float)
+LIVE_PRICES_REBUILD_POLLS = config('LIVE_PRICES_REBUILD_POLLS', default=30, cast=int)
+LIVE_PRICES_HEARTBEAT_SECONDS = config('LIVE_PRICES_HEARTBEAT_SECONDS', default=15.0, cast=float)
+
+# Longest the seller dashboard summary (status counts, views, saves) is
+# cached; ticket writes invalidate it sooner through the seller's cache
+# version (see products.cache)
+SELLER_DASHBOARD_SUMMARY_TTL = config('SELLER_DASHBOARD_SUMMARY_TTL', default=300, cast=int)
+
+# Longest the combined event page payload is cached; writes invalidate it
+# sooner through the event's cache version (see products.event_page)
+EVENT_PAGE_CACHE_SECONDS = config('EVENT_PAGE_CACHE_SECONDS', default=30, cast=int)
+
+# Cache-Control and Surrogate-Key headers on public read endpoints, and
+# surrogate-key purges on writes (see products.cdn). Purges are recorded in
+# the outbox and POSTed to CDN_PURGE_URL by dispatch_outbox, which retries
+# failures; they are only logged when it is empty
+CDN_CACHE_ENABLED = config('CDN_CACHE_ENABLED', default=True, cast=bool)
+CDN_PURGE_URL = config('CDN_PURGE_URL', default='')
+CDN_PURGE_TIMEOUT = config('CDN_PURGE_TIMEOUT', default=2.0, cast=float)
+
+# Responses smaller than this many bytes are not compressed (see
+# config.compression); brotli quality trades CPU for size, 4-5 suits
+# dynamic responses
+RESPONSE_COMPRESSION_MIN_BYTES = config('RESPONSE_COMPRESSION_MIN_BYTES', default=1024, cast=int)
+RESPONSE_BROTLI_QUALITY = config('RESPONSE_BROTLI_QUALITY', default=4, cast=int)
+
+# Two-tier cache of serialized events (see products.documents): a
+# per-worker LRU in front of the EVENT_DOCUMENT_CACHE cache alias, which
+# must be shared between workers (the dedicated 'event_documents' alias
+# above by default). Entries are current for
+# EVENT_DOCUMENT_FRESH_SECONDS unless the event changes; the shared tier
+# keeps them for EVENT_DOCUMENT_TTL so they can be served stale when the
+# database is down or slower than EVENT_DOCUMENT_DB_TIMEOUT_MS (PostgreSQL)
+EVENT_DOCUMENT_CACHE = config('EVENT_DOCUMENT_CACHE', default='event_documents')
+EVENT_DOCUMENT_LOCAL_SIZE = config('EVENT_DOCUMENT_LOCAL_SIZE', default=5000, cast=int)
+EVENT_DOCUMENT_FRESH_SECONDS = config('EVENT_DOCUMENT_FRESH_SECONDS', default=60, cast=int)
+EVENT_DOCUMENT_TTL = config('EVENT_DOCUMENT_TTL', default=86400, cast=int)
+EVENT_DOCUMENT_DB_TIMEOUT_MS = config('EVENT_DOCUMENT_DB_TIMEOUT_MS', default=500, cast=int)
+
+# Market stats rollup (see products.rollups): how often the
+# refresh_market_stats command recomputes it (reads refresh it too once it
+# is older than that), and how many cities the market_stats endpoint lists
+MARKET_STATS_REFRESH_SECONDS = config('MARKET_STATS_REFRESH_SECONDS', default=30, cast=int)
+MARKET_STATS_TOP_CITIES = config('MARKET_STATS_TOP_CITIES', default=10, cast=int)
+
+# Unique viewers per event (see products.viewers): each worker merges its
+# buffered views into the stored sketches after this many views or seconds
+VIEWER_FLUSH_VIEWS = config('VIEWER_FLUSH_VIEWS', default=1000, cast=int)
+VIEWER_FLUSH_SECONDS = config('VIEWER_FLUSH_SECONDS', default=10, cast=float)
+# Views each client IP may record (django-ratelimit rate, e.g. 60/m)
+EVENT_VIEW_RATE_LIMIT = config('EVENT_VIEW_RATE_LIMIT', default='60/m')
+
+# Trending searches (see products.searches): terms are counted per
+# SEARCH_TRENDS_WINDOW_SECONDS window and trending covers the last
+# SEARCH_TRENDS_WINDOWS of them. Each worker merges its counts after
+# SEARCH_FLUSH_SEARCHES searches or SEARCH_FLUSH_SECONDS
+SEARCH_TRENDS_TOP_K = config('SEARCH_TRENDS_TOP_K', default=50, cast=int)
+SEARCH_TRENDS_WINDOW_SECONDS = config('SEARCH_TRENDS_WINDOW_SECONDS', default=3600, cast=int)
+SEARCH_TRENDS_WINDOWS = config('SEARCH_TRENDS_WINDOWS', default=24, cast=int)
+SEARCH_FLUSH_SEARCHES = config('SEARCH_FLUSH_SEARCHES', default=500, cast=int)
+SEARCH_FLUSH_SECONDS = config('SEARCH_FLUSH_SECONDS', default=30, cast=float)
+
+# Per-process cache of users resolved from JWTs (see users.authentication)
+AUTH_USER_CACHE_SIZE = config('AUTH_USER_CACHE_SIZE', default=10000, cast=int)
+AUTH_USER_CACHE_TTL = config('AUTH_USER_CACHE_TTL', default=60, cast=int)
+
+# Refresh-token blacklist bloom filter (see users.blacklist)
+TOKEN_BLACKLIST_BLOOM_ERROR_RATE = config('TOKEN_BLACKLIST_BLOOM_ERROR_RATE', default=0.001, cast=float)
+TOKEN_BLACKLIST_SYNC_INTERVAL = config('TOKEN_BLACKLIST_SYNC_INTERVAL', default=1.0, cast=float)
+TOKEN_BLACKLIST_REBUILD_INTERVAL = config('TOKEN_BLACKLIST_REBUILD_INTERVAL', default=3600.0, cast=float)
+# Rows blacklisted this recently are re-read on each sync, in case they committed out of id order
+TOKEN_BLACKLIST_SYNC_OVERLAP = config('TOKEN_BLACKLIST_SYNC_OVERLAP', default=60.0, cast=float)
+
 # CORS settings
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",  # Next.js dev server
@@ -197,6 +405,10 @@ CORS_ALLOWED_ORIGINS = [
 
 CORS_ALLOW_CREDENTIALS = True
 
+# Waiting room admission tokens are sent in X-Admission-Token
+from corsheaders.defaults import default_headers
+CORS_ALLOW_HEADERS = (*default_headers, 'x-admission-token')
+
 # Allow all origins in development, specific origins in production
 if DEBUG:
     CORS_ALLOW_ALL_ORIGINS = True
@@ -36,10 +36,12 @@ export default function EventDetailsPage() {
 
   const fetchEventDetails = useCallback(async () => {
     try {
-      const response = await apiCall(API_ENDPOINTS.eventDetail(params.id as string))
+      const response = await apiCall(API_ENDPOINTS.eventPage(params.id as string))
       if (response.ok) {
         const data = await response.json()
-        setEvent(data)
+        setEvent(data.event)
+        // Counts towards the event's unique viewers; failures don't matter
+        apiCall(API_ENDPOINTS.eventView(params.id as string), { method: 'POST' }).catch(() => {})
       } else {
         router.push('/')
       }
@@ -88,6 +90,24 @@ export default function EventDetailsPage() {
     }
   }, [params.id, router, fetchEventDetails])
 
+  // Live best-ask and ticket count pushed by the server instead of re-polling
+  useEffect(() => {
+    if (!params.id || process.env.NEXT_PUBLIC_USE_MOCK_DATA === 'true') return
+
+    const source = new EventSource(API_ENDPOINTS.eventLive(params.id as string))
+    const applyPrices = (message: MessageEvent) => {
+      const data = JSON.parse(message.data)
+      setEvent(current => current && {
+        ...current,
+        ...('best_ask' in data && { lowest_price: data.best_ask === null ? null : Number(data.best_ask) }),
+        ...('count' in data && { ticket_count: data.count }),
+      })
+    }
+    source.addEventListener('snapshot', applyPrices)
+    source.addEventListener('update', applyPrices)
+    return () => source.close()
+  }, [params.id])
+
 
 
   const formatDate = (dateString: string) => {
@@ -4,9 +4,15 @@ export const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost
 export const API_ENDPOINTS = {
   events: `${API_BASE_URL}/api/events/`,
   trending: `${API_BASE_URL}/api/trending/`,
+  trendingSearches: `${API_BASE_URL}/api/trending/searches/`,
   eventDetail: (id: string) => `${API_BASE_URL}/api/events/${id}/`,
+  eventBatch: (ids: string[]) => `${API_BASE_URL}/api/events/batch/?ids=${ids.join(',')}`,
   eventStats: (id: string) => `${API_BASE_URL}/api/events/${id}/stats/`,
+  eventPage: (id: string) => `${API_BASE_URL}/api/events/${id}/page/`,
+  eventLive: (id: string) => `${API_BASE_URL}/api/events/${id}/live/`,
+  eventView: (id: string) => `${API_BASE_URL}/api/events/${id}/view/`,
   tickets: `${API_BASE_URL}/api/tickets/`,
+  ticketBatch: (ids: string[]) => `${API_BASE_URL}/api/tickets/batch/?ids=${ids.join(',')}`,
   auth: {
     login: `${API_BASE_URL}/api/auth/login/`,
     register: `${API_BASE_URL}/api/auth/register/`,